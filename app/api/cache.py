@@ -0,0 +1,43 @@
+from fastapi import APIRouter
+from typing import Any, Dict
+
+router = APIRouter()
+
+
+@router.get("/cache/dns")
+def dns_cache_stats() -> Dict[str, Any]:
+    from app.services.tools.network.resolution import resolution_cache
+    return resolution_cache.stats()
+
+
+@router.delete("/cache/dns")
+def clear_dns_cache() -> Dict[str, Any]:
+    from app.services.tools.network.resolution import resolution_cache
+    resolution_cache.clear()
+    return resolution_cache.stats()
+
+
+@router.get("/cache/whois")
+def whois_cache_stats() -> Dict[str, Any]:
+    from app.services.whois_cache import whois_cache
+    return whois_cache.stats()
+
+
+@router.delete("/cache/whois")
+def clear_whois_cache() -> Dict[str, Any]:
+    from app.services.whois_cache import whois_cache
+    whois_cache.clear()
+    return whois_cache.stats()
+
+
+@router.get("/cache/certificates")
+def certificate_cache_stats() -> Dict[str, Any]:
+    from app.services.certificate_cache import certificate_cache
+    return certificate_cache.stats()
+
+
+@router.delete("/cache/certificates")
+def clear_certificate_cache() -> Dict[str, Any]:
+    from app.services.certificate_cache import certificate_cache
+    certificate_cache.clear()
+    return certificate_cache.stats()
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+
+from app.db.session import get_db
+from app.models import Certificate
+
+router = APIRouter()
+
+
+@router.get("/certificates")
+def list_certificates(
+    expiring_within_days: Optional[int] = None,
+    subject: Optional[str] = None,
+    limit: int = 1000,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    query = db.query(Certificate)
+    if expiring_within_days is not None:
+        query = query.filter(Certificate.not_after <= datetime.utcnow() + timedelta(days=expiring_within_days))
+    if subject:
+        query = query.filter(Certificate.subject == subject)
+    certificates = query.order_by(Certificate.not_after).limit(min(max(limit, 1), 10000)).all()
+    return {
+        "certificates": [
+            {
+                "fingerprint_sha256": certificate.fingerprint_sha256,
+                "subject": certificate.subject,
+                "issuer": certificate.issuer,
+                "not_after": certificate.not_after.isoformat(),
+                "first_seen": certificate.first_seen.isoformat(),
+                "last_seen": certificate.last_seen.isoformat(),
+            }
+            for certificate in certificates
+        ]
+    }
+
+
+@router.get("/certificates/{fingerprint}")
+def get_certificate(fingerprint: str, db: Session = Depends(get_db)) -> Dict[str, Any]:
+    certificate = db.get(Certificate, fingerprint.lower().replace(':', ''))
+    if certificate is None:
+        raise HTTPException(status_code=404, detail="Certificate not found")
+    return {
+        **certificate.details,
+        "first_seen": certificate.first_seen.isoformat(),
+        "last_seen": certificate.last_seen.isoformat(),
+    }
@@ -7,6 +7,7 @@ import json
 from app.db.session import get_db
 from app.models import Execution
 from app.schemas import ExecutionResponse, ExecutionList, ProgressUpdate
+from app.services.execution_engine import execution_engine
 
 router = APIRouter()
 
@@ -33,7 +34,7 @@ def list_executions(
     executions = query.order_by(Execution.started_at.desc()).offset(offset).limit(limit).all()
     
     return ExecutionList(
-        executions=[ExecutionResponse.model_validate(execution) for execution in executions],
+        executions=[_to_response(execution) for execution in executions],
         total=total
     )
 
@@ -43,7 +44,33 @@ def get_execution(execution_id: str, db: Session = Depends(get_db)):
     execution = db.query(Execution).filter(Execution.id == execution_id).first()
     if not execution:
         raise HTTPException(status_code=404, detail="Execution not found")
-    return ExecutionResponse.model_validate(execution)
+    return _to_response(execution)
+
+
+@router.post("/executions/{execution_id}/cancel", response_model=ExecutionResponse)
+async def cancel_execution(execution_id: str, db: Session = Depends(get_db)):
+    execution = db.query(Execution).filter(Execution.id == execution_id).first()
+    if not execution:
+        raise HTTPException(status_code=404, detail="Execution not found")
+    if execution.status not in ("pending", "running"):
+        raise HTTPException(status_code=409, detail=f"Execution is already {execution.status}")
+
+    if not await execution_engine.cancel_execution(execution_id):
+        raise HTTPException(status_code=409, detail="Execution is not active")
+
+    db.refresh(execution)
+    if execution.status in ("pending", "running"):
+        execution.status = "cancelled"
+        db.commit()
+        db.refresh(execution)
+    return _to_response(execution)
+
+
+def _to_response(execution: Execution) -> ExecutionResponse:
+    response = ExecutionResponse.model_validate(execution)
+    if execution.status == "pending":
+        response.queue_position = execution_engine.queue_position(execution.id)
+    return response
 
 
 class ConnectionManager:
@@ -0,0 +1,89 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Any, Dict, Optional
+import time
+
+from app.db.session import get_db
+from app.models import LatencyWindow
+from app.services.execution_engine import execution_engine
+
+router = APIRouter()
+
+
+@router.get("/monitors")
+def list_monitors() -> Dict[str, Any]:
+    from app.services.tools.network.latency_monitor import active_monitors
+    return {
+        "monitors": [
+            state.info() for execution_id, state in list(active_monitors.items())
+            if execution_engine.is_execution_active(execution_id)
+        ]
+    }
+
+
+@router.get("/monitors/{execution_id}")
+def monitor_summary(execution_id: str) -> Dict[str, Any]:
+    state = _active_monitor(execution_id)
+    return {**state.info(), "summary": state.summary()}
+
+
+@router.get("/monitors/{execution_id}/samples")
+def monitor_samples(execution_id: str, target: Optional[str] = None, seconds: float = 300) -> Dict[str, Any]:
+    state = _active_monitor(execution_id)
+    if target is not None and target not in state.targets:
+        raise HTTPException(status_code=404, detail="Target not monitored")
+    start = time.time() - seconds if seconds > 0 else 0
+    return {
+        "execution_id": execution_id,
+        "samples": {
+            name: ring.samples(start)
+            for name, (_, ring) in state.targets.items()
+            if target is None or name == target
+        }
+    }
+
+
+@router.get("/monitors/{execution_id}/windows")
+def monitor_windows(
+    execution_id: str,
+    target: Optional[str] = None,
+    since: Optional[datetime] = None,
+    limit: int = 1000,
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    query = db.query(LatencyWindow).filter(LatencyWindow.execution_id == execution_id)
+    if target:
+        query = query.filter(LatencyWindow.target == target)
+    if since:
+        query = query.filter(LatencyWindow.window_start >= since)
+    windows = query.order_by(LatencyWindow.window_start.desc()).limit(min(max(limit, 1), 10000)).all()
+    return {
+        "execution_id": execution_id,
+        "windows": [
+            {
+                "target": window.target,
+                "address": window.address,
+                "window_start": window.window_start.isoformat(),
+                "window_end": window.window_end.isoformat(),
+                "samples": window.samples,
+                "lost": window.lost,
+                "loss_percent": window.loss_percent,
+                "min_ms": window.min_ms,
+                "avg_ms": window.avg_ms,
+                "p50_ms": window.p50_ms,
+                "p95_ms": window.p95_ms,
+                "p99_ms": window.p99_ms,
+                "max_ms": window.max_ms,
+            }
+            for window in reversed(windows)
+        ]
+    }
+
+
+def _active_monitor(execution_id: str):
+    from app.services.tools.network.latency_monitor import active_monitors
+    state = active_monitors.get(execution_id)
+    if state is None or not execution_engine.is_execution_active(execution_id):
+        raise HTTPException(status_code=404, detail="Monitor not running")
+    return state
@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+from typing import Any, Dict
+
+router = APIRouter()
+
+
+@router.get("/dns/upstreams")
+def dns_upstreams() -> Dict[str, Any]:
+    from app.services.tools.network.resolver_pool import get_resolver_pool
+    pool = get_resolver_pool()
+    return {
+        "configured": pool is not None,
+        "upstreams": pool.stats() if pool is not None else []
+    }
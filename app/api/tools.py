@@ -6,7 +6,9 @@ import uuid
 from app.db.session import get_db
 from app.models import Tool, Execution
 from app.schemas import ToolResponse, ToolList, ExecutionCreate, ExecutionResponse
+from app.services.admission import QueueFullError
 from app.services.execution_engine import execution_engine
+from app.api.executions import send_progress_update
 
 router = APIRouter()
 
@@ -54,12 +56,28 @@ async def execute_tool(
     if not tool.enabled:
         raise HTTPException(status_code=400, detail="Tool is disabled")
     
+    schema = tool.parameters_schema if isinstance(tool.parameters_schema, dict) else {}
+    runner_class_name = schema.get('runner_class') or execution_engine.runner_for_tool(tool_id)
+    
     execution_id = str(uuid.uuid4())
+    try:
+        admission = execution_engine.submit(
+            execution_id,
+            runner_class_name,
+            execution_create.user_id,
+            execution_create.priority
+        )
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     execution = Execution(
         id=execution_id,
         tool_id=tool_id,
         user_id=execution_create.user_id,
         status="pending",
+        priority=admission['priority'],
         parameters=execution_create.parameters,
         progress=0
     )
@@ -68,24 +86,17 @@ async def execute_tool(
     db.commit()
     db.refresh(execution)
     
+    response = ExecutionResponse.model_validate(execution)
+    response.queue_position = execution_engine.queue_position(execution_id)
+    db.close()
+    
     background_tasks.add_task(
         execution_engine.start_execution,
         execution_id,
-        tool.parameters_schema.get('runner_class') if isinstance(tool.parameters_schema, dict) else getattr(tool, 'runner_class', None) or _get_runner_class_from_tool(tool_id),
+        runner_class_name,
         execution_create.parameters,
-        db
+        send_progress_update
     )
     
-    return ExecutionResponse.model_validate(execution)
-
+    return response
 
-def _get_runner_class_from_tool(tool_id: str) -> str:
-    mapping = {
-        'port_scanner': 'PortScannerRunner',
-        'dns_lookup': 'DNSLookupRunner',
-        'whois_lookup': 'WhoisLookupRunner',
-        'ping': 'PingRunner',
-        'ssl_analyzer': 'SSLAnalyzerRunner',
-        'traceroute': 'TracerouteRunner',
-    }
-    return mapping.get(tool_id, '')
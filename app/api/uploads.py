@@ -0,0 +1,17 @@
+from fastapi import APIRouter, File, HTTPException, UploadFile
+
+from app.schemas import UploadResponse
+from app.services.uploads import UploadTooLargeError, store_upload
+
+router = APIRouter()
+
+
+@router.post("/uploads", response_model=UploadResponse)
+async def create_upload(file: UploadFile = File(...)):
+    try:
+        stored = await store_upload(file)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    finally:
+        await file.close()
+    return UploadResponse(filename=file.filename or "", **stored)
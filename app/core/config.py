@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -10,7 +10,44 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./cybersec_toolkit.db"
     
     MAX_EXECUTION_TIME: int = 300
+    EXECUTION_GRACE_PERIOD: float = 5.0
     MAX_CONCURRENT_EXECUTIONS: int = 10
+    MAX_QUEUED_EXECUTIONS: int = 100
+    ADMISSION_CLASS_WEIGHTS: dict[str, int] = {"interactive": 8, "standard": 4, "bulk": 1}
+    ADMISSION_USER_WEIGHTS: dict[str, int] = {}
+    ADMISSION_RESERVED_INTERACTIVE_SLOTS: int = 2
+    ADMISSION_MONITOR_SLOTS: int = 4
+    EXECUTION_BACKEND: Literal["inline", "process"] = "inline"
+    WORKER_PROCESSES: int = 4
+    
+    PROGRESS_FLUSH_INTERVAL_MS: int = 250
+    PROGRESS_MIN_STEP: int = 5
+    
+    DNS_CACHE_ENABLED: bool = True
+    DNS_CACHE_MAX_ENTRIES: int = 50000
+    DNS_CACHE_MIN_TTL: int = 0
+    DNS_CACHE_MAX_TTL: int = 86400
+    DNS_CACHE_NEGATIVE_TTL: int = 300
+    DNS_CACHE_FALLBACK_TTL: int = 60
+    DNS_UPSTREAMS: list[str] = []
+    DNS_UPSTREAM_HEDGE_PERCENTILE: float = 0.95
+    DNS_UPSTREAM_HEDGE_MIN_DELAY_MS: int = 20
+    DNS_UPSTREAM_EJECT_AFTER: int = 3
+    DNS_UPSTREAM_EJECT_SECONDS: float = 30.0
+    
+    WHOIS_BACKEND: Literal["native", "python-whois"] = "native"
+    WHOIS_TIMEOUT: float = 15.0
+    WHOIS_MAX_WORKERS: int = 4
+    WHOIS_CACHE_ENABLED: bool = True
+    WHOIS_CACHE_TTL: int = 86400
+    WHOIS_RATE_LIMIT: float = 1.0
+    WHOIS_RATE_BURST: int = 3
+    
+    CERT_CACHE_MAX_ENTRIES: int = 10000
+    CERT_CACHE_PERSIST: bool = True
+    
+    UPLOAD_DIR: str = "./uploads"
+    MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024
     
     ALLOWED_HOSTS: list[str] = ["*"]
     CORS_ORIGINS: list[str] = ["http://localhost:5173", "http://localhost:3000"]
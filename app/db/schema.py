@@ -0,0 +1,18 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from .base import Base
+
+
+def upgrade_schema(bind: Engine):
+    Base.metadata.create_all(bind=bind)
+    inspector = inspect(bind)
+    quote = bind.dialect.identifier_preparer.quote
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                connection.execute(text(f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}"))
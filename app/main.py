@@ -4,15 +4,15 @@ from contextlib import asynccontextmanager
 import json
 
 from app.core.config import settings
-from app.db.base import Base
+from app.db.schema import upgrade_schema
 from app.db.session import engine
-from app.api import tools, executions
+from app.api import tools, executions, uploads, cache, resolvers, monitors, certificates
 from app.models import Tool
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
     
     from app.db.session import SessionLocal
     db = SessionLocal()
@@ -23,6 +23,12 @@ async def lifespan(app: FastAPI):
     
     yield
 
+    from app.services.execution_engine import execution_engine
+    execution_engine.shutdown()
+
+    from app.services.whois_cache import whois_cache
+    whois_cache.shutdown()
+
 
 def _initialize_tools(db):
     with open('app/data/tool_definitions.json', 'r') as f:
@@ -63,6 +69,11 @@ app.add_middleware(
 
 app.include_router(tools.router, prefix="/api", tags=["tools"])
 app.include_router(executions.router, prefix="/api", tags=["executions"])
+app.include_router(uploads.router, prefix="/api", tags=["uploads"])
+app.include_router(cache.router, prefix="/api", tags=["cache"])
+app.include_router(resolvers.router, prefix="/api", tags=["resolvers"])
+app.include_router(monitors.router, prefix="/api", tags=["monitors"])
+app.include_router(certificates.router, prefix="/api", tags=["certificates"])
 
 
 @app.get("/")
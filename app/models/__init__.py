@@ -1,4 +1,7 @@
+from .certificate import Certificate
 from .execution import Execution
+from .latency_window import LatencyWindow
 from .tool import Tool
+from .whois_record import WhoisRecord
 
-__all__ = ["Execution", "Tool"]
+__all__ = ["Certificate", "Execution", "LatencyWindow", "Tool", "WhoisRecord"]
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from datetime import datetime
+from app.db.base import Base
+
+
+class Certificate(Base):
+    __tablename__ = "certificates"
+
+    fingerprint_sha256 = Column(String(64), primary_key=True)
+    subject = Column(String, nullable=True, index=True)
+    issuer = Column(String, nullable=True)
+    not_after = Column(DateTime, nullable=False, index=True)
+    details = Column(JSON, nullable=False)
+    first_seen = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_seen = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
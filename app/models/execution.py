@@ -11,14 +11,17 @@ class Execution(Base):
     tool_id = Column(String, ForeignKey("tools.id"), nullable=False, index=True)
     user_id = Column(String, nullable=True, index=True)
     status = Column(String, default="pending", index=True)
+    priority = Column(String, nullable=True)
     parameters = Column(JSON)
     result = Column(JSON)
     error = Column(Text)
     stdout = Column(Text)
     stderr = Column(Text)
     progress = Column(Integer, default=0)
+    queued_at = Column(DateTime, default=datetime.utcnow)
     started_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
     execution_time = Column(Integer, nullable=True)
+    wait_time_ms = Column(Integer, nullable=True)
     
     tool = relationship("Tool", back_populates="executions")
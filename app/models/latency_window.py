@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime
+from app.db.base import Base
+
+
+class LatencyWindow(Base):
+    __tablename__ = "latency_windows"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    execution_id = Column(String, nullable=False, index=True)
+    target = Column(String, nullable=False, index=True)
+    address = Column(String, nullable=False)
+    window_start = Column(DateTime, nullable=False, index=True)
+    window_end = Column(DateTime, nullable=False)
+    samples = Column(Integer, nullable=False)
+    lost = Column(Integer, nullable=False)
+    loss_percent = Column(Float, nullable=False)
+    min_ms = Column(Float, nullable=True)
+    avg_ms = Column(Float, nullable=True)
+    p50_ms = Column(Float, nullable=True)
+    p95_ms = Column(Float, nullable=True)
+    p99_ms = Column(Float, nullable=True)
+    max_ms = Column(Float, nullable=True)
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from datetime import datetime
+from app.db.base import Base
+
+
+class WhoisRecord(Base):
+    __tablename__ = "whois_cache"
+
+    domain = Column(String, primary_key=True, index=True)
+    data = Column(JSON, nullable=False)
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,5 +1,6 @@
 from .execution import ExecutionCreate, ExecutionResponse, ExecutionList, ExecutionUpdate, ProgressUpdate
 from .tool import ToolResponse, ToolList
+from .upload import UploadResponse
 
 __all__ = [
     "ExecutionCreate",
@@ -9,4 +10,5 @@ __all__ = [
     "ProgressUpdate",
     "ToolResponse",
     "ToolList",
+    "UploadResponse",
 ]
@@ -6,6 +6,7 @@ from datetime import datetime
 class ExecutionCreate(BaseModel):
     parameters: Dict[str, Any] = Field(default_factory=dict)
     user_id: Optional[str] = None
+    priority: Optional[str] = None
 
 
 class ExecutionUpdate(BaseModel):
@@ -24,15 +25,19 @@ class ExecutionResponse(BaseModel):
     tool_id: str
     user_id: Optional[str] = None
     status: str
+    priority: Optional[str] = None
     parameters: Optional[Dict[str, Any]] = None
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     stdout: Optional[str] = None
     stderr: Optional[str] = None
     progress: int
+    queued_at: Optional[datetime] = None
     started_at: datetime
     completed_at: Optional[datetime] = None
     execution_time: Optional[int] = None
+    wait_time_ms: Optional[int] = None
+    queue_position: Optional[int] = None
 
     class Config:
         from_attributes = True
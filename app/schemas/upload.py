@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class UploadResponse(BaseModel):
+    upload_id: str
+    filename: str
+    size: int
+    lines: int
@@ -0,0 +1,217 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+import asyncio
+import time
+
+
+PRIORITY_CLASSES = ('interactive', 'standard', 'bulk', 'monitor')
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class _SmoothWeightedRoundRobin:
+    def __init__(self):
+        self.current: Dict[str, int] = {}
+
+    def pick(self, weights: Dict[str, int]) -> str:
+        total = sum(weights.values())
+        best = None
+        for key, weight in weights.items():
+            self.current[key] = self.current.get(key, 0) + weight
+            if best is None or self.current[key] > self.current[best]:
+                best = key
+        self.current[best] -= total
+        return best
+
+    def forget(self, active: Iterable[str]):
+        active = set(active)
+        for key in list(self.current):
+            if key not in active:
+                del self.current[key]
+
+    def copy(self) -> '_SmoothWeightedRoundRobin':
+        clone = _SmoothWeightedRoundRobin()
+        clone.current = dict(self.current)
+        return clone
+
+
+class _Ticket:
+    __slots__ = ('execution_id', 'user_id', 'priority', 'enqueued_at', 'admitted_at', 'future')
+
+    def __init__(self, execution_id: str, user_id: str, priority: str):
+        self.execution_id = execution_id
+        self.user_id = user_id
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.admitted_at: Optional[float] = None
+        self.future: Optional[asyncio.Future] = None
+
+
+class AdmissionScheduler:
+    def __init__(
+        self,
+        max_running: int,
+        max_queued: int,
+        class_weights: Dict[str, int],
+        user_weights: Optional[Dict[str, int]] = None,
+        reserved_interactive_slots: int = 0,
+        monitor_slots: int = 0
+    ):
+        self.max_running = max_running
+        self.max_queued = max_queued
+        self.class_weights = class_weights
+        self.user_weights = user_weights or {}
+        self.reserved_interactive_slots = min(reserved_interactive_slots, max_running - 1)
+        self.monitor_slots = monitor_slots
+        self._queues: Dict[str, Dict[str, Deque[_Ticket]]] = {priority: {} for priority in PRIORITY_CLASSES}
+        self._class_rr = _SmoothWeightedRoundRobin()
+        self._user_rr = {priority: _SmoothWeightedRoundRobin() for priority in PRIORITY_CLASSES}
+        self._tickets: Dict[str, _Ticket] = {}
+        self._running: Dict[str, _Ticket] = {}
+
+    @property
+    def queued_count(self) -> int:
+        return len(self._tickets) - len(self._running)
+
+    @property
+    def running_count(self) -> int:
+        return len(self._running)
+
+    @property
+    def running_monitors(self) -> int:
+        return sum(1 for ticket in self._running.values() if ticket.priority == 'monitor')
+
+    def is_tracked(self, execution_id: str) -> bool:
+        return execution_id in self._tickets
+
+    def enqueue(self, execution_id: str, user_id: Optional[str], priority: str) -> int:
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Priority must be one of: {', '.join(PRIORITY_CLASSES)}")
+        if self.queued_count >= self.max_queued:
+            raise QueueFullError(f"Execution queue is full ({self.max_queued} queued)")
+
+        ticket = _Ticket(execution_id, user_id or '', priority)
+        self._tickets[execution_id] = ticket
+        self._queues[priority].setdefault(ticket.user_id, deque()).append(ticket)
+        self._dispatch()
+        return self.position(execution_id) or 0
+
+    async def acquire(self, execution_id: str) -> float:
+        ticket = self._tickets[execution_id]
+        if ticket.admitted_at is None:
+            ticket.future = asyncio.get_running_loop().create_future()
+            try:
+                await ticket.future
+            except asyncio.CancelledError:
+                self.remove(execution_id)
+                raise
+        return ticket.admitted_at - ticket.enqueued_at
+
+    def release(self, execution_id: str):
+        if self._running.pop(execution_id, None) is not None:
+            self._tickets.pop(execution_id, None)
+            self._dispatch()
+
+    def remove(self, execution_id: str) -> bool:
+        ticket = self._tickets.get(execution_id)
+        if ticket is None or execution_id in self._running:
+            return False
+        del self._tickets[execution_id]
+        user_queue = self._queues[ticket.priority].get(ticket.user_id)
+        if user_queue is not None:
+            user_queue.remove(ticket)
+            if not user_queue:
+                del self._queues[ticket.priority][ticket.user_id]
+        if ticket.future is not None and not ticket.future.done():
+            ticket.future.cancel()
+        return True
+
+    def position(self, execution_id: str) -> Optional[int]:
+        if execution_id not in self._tickets or execution_id in self._running:
+            return None
+        for index, ticket in enumerate(self._dispatch_order(), start=1):
+            if ticket.execution_id == execution_id:
+                return index
+        return None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            'running': self.running_count,
+            'queued': self.queued_count,
+            'max_running': self.max_running,
+            'max_queued': self.max_queued,
+            'running_monitors': self.running_monitors,
+            'max_monitors': self.monitor_slots,
+            'queued_by_priority': {
+                priority: sum(len(user_queue) for user_queue in users.values())
+                for priority, users in self._queues.items()
+            },
+        }
+
+    def _dispatch(self):
+        while self._queues_non_empty():
+            ticket = self._next_ticket(self._queues, self._class_rr, self._user_rr, self._free_slots())
+            if ticket is None:
+                return
+            user_queue = self._queues[ticket.priority][ticket.user_id]
+            user_queue.popleft()
+            if not user_queue:
+                del self._queues[ticket.priority][ticket.user_id]
+            ticket.admitted_at = time.monotonic()
+            self._running[ticket.execution_id] = ticket
+            if ticket.future is not None and not ticket.future.done():
+                ticket.future.set_result(None)
+
+    def _free_slots(self) -> Dict[str, int]:
+        monitors = self.running_monitors
+        free = self.max_running - (len(self._running) - monitors)
+        slots = {
+            priority: free if priority == 'interactive' else free - self.reserved_interactive_slots
+            for priority in PRIORITY_CLASSES
+        }
+        slots['monitor'] = self.monitor_slots - monitors
+        return slots
+
+    def _queues_non_empty(self) -> bool:
+        return any(users for users in self._queues.values())
+
+    def _next_ticket(
+        self,
+        queues: Dict[str, Dict[str, Deque[_Ticket]]],
+        class_rr: _SmoothWeightedRoundRobin,
+        user_rr: Dict[str, _SmoothWeightedRoundRobin],
+        free_slots: Optional[Dict[str, int]]
+    ) -> Optional[_Ticket]:
+        eligible = {
+            priority: self.class_weights.get(priority, 1)
+            for priority, users in queues.items()
+            if users and (free_slots is None or free_slots[priority] > 0)
+        }
+        if not eligible:
+            return None
+        class_rr.forget(priority for priority, users in queues.items() if users)
+        priority = class_rr.pick(eligible)
+
+        users = queues[priority]
+        user_rr[priority].forget(users)
+        user_id = user_rr[priority].pick({user: self.user_weights.get(user, 1) for user in users})
+        return users[user_id][0]
+
+    def _dispatch_order(self) -> List[_Ticket]:
+        queues = {
+            priority: {user: deque(user_queue) for user, user_queue in users.items()}
+            for priority, users in self._queues.items()
+        }
+        class_rr = self._class_rr.copy()
+        user_rr = {priority: rr.copy() for priority, rr in self._user_rr.items()}
+        order = []
+        while any(users for users in queues.values()):
+            ticket = self._next_ticket(queues, class_rr, user_rr, None)
+            user_queue = queues[ticket.priority][ticket.user_id]
+            user_queue.popleft()
+            if not user_queue:
+                del queues[ticket.priority][ticket.user_id]
+            order.append(ticket)
+        return order
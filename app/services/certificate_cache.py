@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import Certificate
+from app.services.tools.network.tls import certificate_summary, parse_certificate
+
+
+class CertificateCache:
+    FLUSH_BATCH = 500
+
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        max_entries: int = 10000,
+        persist: bool = True
+    ):
+        self.session_factory = session_factory
+        self.max_entries = max_entries
+        self.persist = persist
+        self._entries: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._seen: Dict[str, Tuple[datetime, Dict[str, Any]]] = {}
+        self._counters = dict.fromkeys(('hits', 'misses', 'evictions', 'stored', 'errors'), 0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def parse(self, der: bytes) -> Dict[str, Any]:
+        fingerprint = hashlib.sha256(der).hexdigest()
+        details = self._entries.get(fingerprint)
+        if details is not None:
+            self._counters['hits'] += 1
+            self._entries.move_to_end(fingerprint)
+        else:
+            self._counters['misses'] += 1
+            details = self._entries[fingerprint] = parse_certificate(der)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+        if self.persist:
+            self._seen[fingerprint] = (datetime.utcnow(), details)
+        return details
+
+    async def flush(self):
+        if not self._seen:
+            return
+        pending = [(fingerprint, last_seen, details) for fingerprint, (last_seen, details) in self._seen.items()]
+        self._seen = {}
+        await asyncio.get_running_loop().run_in_executor(None, self._store, pending)
+
+    def lookup(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        details = self._entries.get(fingerprint)
+        if details is not None or not self.persist:
+            return details
+        try:
+            with self.session_factory() as db:
+                record = db.get(Certificate, fingerprint)
+                return record.details if record is not None else None
+        except SQLAlchemyError:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._counters['hits'] + self._counters['misses']
+        return {
+            'persist': self.persist,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'pending': len(self._seen),
+            **self._counters,
+            'hit_ratio': round(self._counters['hits'] / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        for key in self._counters:
+            self._counters[key] = 0
+
+    def _store(self, pending: List[Tuple[str, datetime, Dict[str, Any]]]):
+        for offset in range(0, len(pending), self.FLUSH_BATCH):
+            batch = pending[offset:offset + self.FLUSH_BATCH]
+            try:
+                self._store_batch(batch)
+            except IntegrityError:
+                for row in batch:
+                    self._store_row(row)
+            except SQLAlchemyError:
+                self._counters['errors'] += 1
+
+    def _store_row(self, row: Tuple[str, datetime, Dict[str, Any]]):
+        for _ in range(2):
+            try:
+                self._store_batch([row])
+                return
+            except IntegrityError:
+                continue
+            except SQLAlchemyError:
+                break
+        self._counters['errors'] += 1
+
+    def _store_batch(self, batch: List[Tuple[str, datetime, Dict[str, Any]]]):
+        with self.session_factory() as db:
+            existing = {
+                record.fingerprint_sha256: record
+                for record in db.query(Certificate).filter(
+                    Certificate.fingerprint_sha256.in_([fingerprint for fingerprint, _, _ in batch])
+                )
+            }
+            added = 0
+            for fingerprint, last_seen, details in batch:
+                record = existing.get(fingerprint)
+                if record is not None:
+                    record.last_seen = max(record.last_seen, last_seen)
+                else:
+                    summary = certificate_summary(details)
+                    db.add(Certificate(
+                        fingerprint_sha256=fingerprint,
+                        subject=summary['subject'],
+                        issuer=summary['issuer'],
+                        not_after=datetime.fromisoformat(details['not_after']),
+                        details=details,
+                        first_seen=last_seen,
+                        last_seen=last_seen
+                    ))
+                    added += 1
+            db.commit()
+        self._counters['stored'] += added
+
+
+certificate_cache = CertificateCache(
+    max_entries=settings.CERT_CACHE_MAX_ENTRIES,
+    persist=settings.CERT_CACHE_PERSIST
+)
@@ -1,31 +1,75 @@
 import asyncio
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Tuple
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.db.session import SessionLocal
 from app.models import Execution
-from app.services.tools.network import (
-    PortScannerRunner,
-    DNSLookupRunner,
-    WhoisLookupRunner,
-    PingRunner,
-    SSLAnalyzerRunner,
-    TracerouteRunner,
-)
+from app.services.admission import AdmissionScheduler, QueueFullError
+from app.services.workers import WorkerPool
+from app.services.tools.registry import RunnerRegistry
 
 
 class ExecutionEngine:
-    def __init__(self):
-        self.runners = {
-            'PortScannerRunner': PortScannerRunner,
-            'DNSLookupRunner': DNSLookupRunner,
-            'WhoisLookupRunner': WhoisLookupRunner,
-            'PingRunner': PingRunner,
-            'SSLAnalyzerRunner': SSLAnalyzerRunner,
-            'TracerouteRunner': TracerouteRunner,
-        }
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+        self.runners = RunnerRegistry()
         self.active_executions: Dict[str, asyncio.Task] = {}
+        self.active_runners: Dict[str, Any] = {}
+        self._pending_cancels: set = set()
+        self.admission = AdmissionScheduler(
+            settings.MAX_CONCURRENT_EXECUTIONS,
+            settings.MAX_QUEUED_EXECUTIONS,
+            settings.ADMISSION_CLASS_WEIGHTS,
+            settings.ADMISSION_USER_WEIGHTS,
+            settings.ADMISSION_RESERVED_INTERACTIVE_SLOTS,
+            settings.ADMISSION_MONITOR_SLOTS
+        )
+        self.backend = settings.EXECUTION_BACKEND
+        self._worker_pool: Optional[WorkerPool] = None
+
+    def get_runner_class(self, runner_class_name: str):
+        return self.runners.resolve(runner_class_name)
+
+    def runner_for_tool(self, tool_id: str) -> str:
+        return self.runners.for_tool(tool_id)
+
+    @property
+    def worker_pool(self) -> WorkerPool:
+        if self._worker_pool is None:
+            self._worker_pool = WorkerPool(settings.WORKER_PROCESSES)
+        return self._worker_pool
+
+    def create_runner(self, runner_class_name: str, execution_id: str, progress_callback: Optional[Callable] = None):
+        runner_class = self.get_runner_class(runner_class_name)
+        if self.backend == "process":
+            return self.worker_pool.runner(runner_class, execution_id, progress_callback)
+        return runner_class(execution_id, progress_callback)
+
+    def shutdown(self):
+        if self._worker_pool is not None:
+            self._worker_pool.shutdown()
+            self._worker_pool = None
+
+    def submit(
+        self,
+        execution_id: str,
+        runner_class_name: str,
+        user_id: Optional[str] = None,
+        priority: Optional[str] = None
+    ) -> Dict[str, Any]:
+        default = self.get_runner_class(runner_class_name).priority_class
+        if priority is None or default == 'monitor':
+            priority = default
+        elif priority == 'monitor':
+            raise ValueError("The monitor priority class is reserved for monitoring tools")
+        position = self.admission.enqueue(execution_id, user_id, priority)
+        return {'priority': priority, 'queue_position': position or None}
+
+    def queue_position(self, execution_id: str) -> Optional[int]:
+        return self.admission.position(execution_id)
 
     async def execute_tool(
         self,
@@ -33,29 +77,36 @@ class ExecutionEngine:
         runner_class_name: str,
         parameters: Dict[str, Any],
         db: Session,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        wait_time_ms: Optional[int] = None
     ) -> Dict[str, Any]:
-        if runner_class_name not in self.runners:
-            raise ValueError(f"Unknown runner class: {runner_class_name}")
-
-        runner_class = self.runners[runner_class_name]
-        runner = runner_class(execution_id, progress_callback)
+        runner = self.create_runner(runner_class_name, execution_id, progress_callback)
 
         execution = db.query(Execution).filter(Execution.id == execution_id).first()
         if not execution:
             raise ValueError(f"Execution not found: {execution_id}")
 
         try:
+            self.active_runners[execution_id] = runner
+            if execution_id in self._pending_cancels:
+                runner.request_stop("cancelled")
+
             execution.status = "running"
+            if wait_time_ms is not None:
+                execution.started_at = datetime.utcnow()
+                execution.wait_time_ms = wait_time_ms
             db.commit()
 
-            result = await runner.execute(parameters)
+            status, result = await self._run_with_deadline(runner, parameters)
 
-            execution.status = "completed"
+            execution.status = status
             execution.result = result
             execution.completed_at = datetime.utcnow()
             execution.execution_time = int((execution.completed_at - execution.started_at).total_seconds())
-            execution.progress = 100
+            if status == "completed":
+                execution.progress = 100
+            elif status == "timed_out":
+                execution.error = f"Execution exceeded the {self._deadline(runner)}s time limit"
             db.commit()
 
             return result
@@ -68,16 +119,72 @@ class ExecutionEngine:
             db.commit()
             raise
 
+        finally:
+            self.active_runners.pop(execution_id, None)
+            await runner.flush_progress()
+
+    async def _run_with_deadline(self, runner, parameters: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        run = asyncio.ensure_future(runner.execute(parameters))
+        stop = asyncio.ensure_future(runner.stop_event.wait())
+        try:
+            await asyncio.wait({run, stop}, timeout=self._deadline(runner), return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            run.cancel()
+            raise
+        finally:
+            stop.cancel()
+
+        if run.done():
+            return runner.stop_reason or "completed", run.result()
+
+        runner.request_stop("timed_out")
+        await asyncio.wait({run}, timeout=settings.EXECUTION_GRACE_PERIOD)
+        if run.done() and not run.cancelled() and run.exception() is None:
+            result = run.result()
+        else:
+            run.cancel()
+            try:
+                await run
+            except BaseException:
+                pass
+            result = runner.partial_result()
+        return runner.stop_reason, result
+
+    def _deadline(self, runner) -> Optional[float]:
+        limit = runner.max_execution_time if runner.max_execution_time is not None else settings.MAX_EXECUTION_TIME
+        return limit or None
+
     async def start_execution(
         self,
         execution_id: str,
         runner_class_name: str,
         parameters: Dict[str, Any],
-        db: Session,
         progress_callback: Optional[Callable] = None
     ):
+        try:
+            if execution_id not in self._pending_cancels:
+                if not self.admission.is_tracked(execution_id):
+                    self.submit(execution_id, runner_class_name)
+                waited = await self.admission.acquire(execution_id)
+        except (ValueError, QueueFullError) as e:
+            self._finish_without_running(execution_id, "failed", str(e))
+            return
+        except asyncio.CancelledError:
+            if execution_id not in self._pending_cancels:
+                raise
+
+        if execution_id in self._pending_cancels:
+            self._pending_cancels.discard(execution_id)
+            self.admission.release(execution_id)
+            self._finish_without_running(execution_id, "cancelled")
+            return
+
+        db = self.session_factory()
         task = asyncio.create_task(
-            self.execute_tool(execution_id, runner_class_name, parameters, db, progress_callback)
+            self.execute_tool(
+                execution_id, runner_class_name, parameters, db, progress_callback,
+                wait_time_ms=int(waited * 1000)
+            )
         )
         self.active_executions[execution_id] = task
 
@@ -88,20 +195,43 @@ class ExecutionEngine:
         finally:
             if execution_id in self.active_executions:
                 del self.active_executions[execution_id]
+            self._pending_cancels.discard(execution_id)
+            self.admission.release(execution_id)
+            db.close()
+
+    def _finish_without_running(self, execution_id: str, status: str, error: Optional[str] = None):
+        with self.session_factory() as db:
+            execution = db.query(Execution).filter(Execution.id == execution_id).first()
+            if execution:
+                execution.status = status
+                if error:
+                    execution.error = error
+                execution.completed_at = datetime.utcnow()
+                db.commit()
 
     def is_execution_active(self, execution_id: str) -> bool:
-        return execution_id in self.active_executions
+        return execution_id in self.active_executions or self.admission.is_tracked(execution_id)
 
     async def cancel_execution(self, execution_id: str) -> bool:
-        if execution_id in self.active_executions:
-            task = self.active_executions[execution_id]
-            task.cancel()
+        if self.admission.remove(execution_id):
+            self._pending_cancels.add(execution_id)
+            return True
+
+        runner = self.active_runners.get(execution_id)
+        task = self.active_executions.get(execution_id)
+        if runner is not None:
+            runner.request_stop("cancelled")
+        elif self.admission.is_tracked(execution_id):
+            self._pending_cancels.add(execution_id)
+        else:
+            return False
+
+        if task is not None:
             try:
-                await task
-            except asyncio.CancelledError:
+                await asyncio.shield(task)
+            except Exception:
                 pass
-            return True
-        return False
+        return True
 
 
 execution_engine = ExecutionEngine()
@@ -1,17 +1,107 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, AsyncIterator, Optional, Callable, Tuple
 import asyncio
 import re
+import signal
+
+from app.core.config import settings
+from .progress import ProgressAggregator, merge_delta
 
 
 class BaseToolRunner(ABC):
+    priority_class = 'standard'
+    accumulate_partial_results = True
+    max_execution_time: Optional[int] = None
+
     def __init__(self, execution_id: str, progress_callback: Optional[Callable] = None):
         self.execution_id = execution_id
         self.progress_callback = progress_callback
         self._current_progress = 0
+        self._progress = ProgressAggregator(
+            self._emit_progress,
+            settings.PROGRESS_FLUSH_INTERVAL_MS / 1000,
+            settings.PROGRESS_MIN_STEP,
+            accumulate=self.accumulate_partial_results
+        )
+        self.stop_event = asyncio.Event()
+        self.stop_reason: Optional[str] = None
+
+    @property
+    def stop_requested(self) -> bool:
+        return self.stop_event.is_set()
+
+    def request_stop(self, reason: str):
+        if not self.stop_event.is_set():
+            self.stop_reason = reason
+            self.stop_event.set()
+
+    async def communicate_until_stopped(self, process: asyncio.subprocess.Process) -> Tuple[bytes, bytes]:
+        communicate = asyncio.ensure_future(process.communicate())
+        stop = asyncio.ensure_future(self.stop_event.wait())
+        try:
+            await asyncio.wait({communicate, stop}, return_when=asyncio.FIRST_COMPLETED)
+            if not communicate.done():
+                process.send_signal(signal.SIGINT)
+            return await communicate
+        finally:
+            stop.cancel()
+            if not communicate.done():
+                communicate.cancel()
+            if process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+
+    async def iter_lines_until_stopped(self, process: asyncio.subprocess.Process) -> AsyncIterator[str]:
+        stop = asyncio.ensure_future(self.stop_event.wait())
+        stop.add_done_callback(lambda done: None if done.cancelled() else self.interrupt_process(process))
+        try:
+            async for line in process.stdout:
+                yield line.decode(errors='replace').rstrip('\r\n')
+            await process.wait()
+        finally:
+            stop.cancel()
+            if process.returncode is None:
+                try:
+                    process.kill()
+                except ProcessLookupError:
+                    pass
+
+    def interrupt_process(self, process: asyncio.subprocess.Process):
+        if process.returncode is None:
+            try:
+                process.send_signal(signal.SIGINT)
+            except ProcessLookupError:
+                pass
+
+    def partial_result(self) -> Dict[str, Any]:
+        result = merge_delta({}, self._progress.accumulated)
+        result['partial'] = True
+        return self.redact_sensitive_data(result)
+
+    def report_progress(self, progress: int, message: Optional[str] = None, partial_result: Optional[Dict[str, Any]] = None):
+        self._current_progress = progress
+        self._progress.add(progress, message, partial_result)
+        if self.progress_callback:
+            self._progress.schedule()
+
+    def receive_progress(self, progress: int, message: Optional[str] = None, partial_result: Optional[Dict[str, Any]] = None):
+        self.report_progress(progress, message, partial_result)
 
     async def update_progress(self, progress: int, message: Optional[str] = None, partial_result: Optional[Dict[str, Any]] = None):
         self._current_progress = progress
+        if self._progress.add(progress, message, partial_result) and self.progress_callback:
+            await self._progress.flush()
+        elif self.progress_callback:
+            self._progress.schedule()
+
+    async def flush_progress(self):
+        if self.progress_callback:
+            await self._progress.flush()
+        self._progress.close()
+
+    async def _emit_progress(self, progress: int, message: Optional[str], partial_result: Optional[Dict[str, Any]]):
         if self.progress_callback:
             await self.progress_callback(self.execution_id, progress, message, partial_result)
 
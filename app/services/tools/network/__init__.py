@@ -1,15 +1,24 @@
-from .port_scanner import PortScannerRunner
-from .dns_lookup import DNSLookupRunner
-from .whois_lookup import WhoisLookupRunner
-from .ping_tool import PingRunner
-from .ssl_analyzer import SSLAnalyzerRunner
-from .traceroute import TracerouteRunner
-
-__all__ = [
-    "PortScannerRunner",
-    "DNSLookupRunner",
-    "WhoisLookupRunner",
-    "PingRunner",
-    "SSLAnalyzerRunner",
-    "TracerouteRunner",
-]
+from importlib import import_module
+
+RUNNER_MODULES = {
+    "PortScannerRunner": ".port_scanner",
+    "DNSLookupRunner": ".dns_lookup",
+    "BulkDNSLookupRunner": ".bulk_dns",
+    "SubdomainEnumRunner": ".subdomain_enum",
+    "PTRSweepRunner": ".ptr_sweep",
+    "WhoisLookupRunner": ".whois_lookup",
+    "PingRunner": ".ping_tool",
+    "PingSweepRunner": ".ping_sweep",
+    "LatencyMonitorRunner": ".latency_monitor",
+    "SSLAnalyzerRunner": ".ssl_analyzer",
+    "TLSInventoryRunner": ".tls_inventory",
+    "TracerouteRunner": ".traceroute",
+}
+
+__all__ = list(RUNNER_MODULES)
+
+
+def __getattr__(name):
+    if name in RUNNER_MODULES:
+        return getattr(import_module(RUNNER_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
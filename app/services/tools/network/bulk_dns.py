@@ -0,0 +1,185 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import time
+
+import dns.asyncresolver
+
+from app.services.uploads import iter_upload_lines, upload_path
+from ..base import BaseToolRunner
+from .dns_lookup import resolve_records
+from .resolution import ResolutionCache, resolution_cache
+from .resolver_pool import make_resolver
+from .targets import split_target_spec
+
+
+class BulkDNSLookupRunner(BaseToolRunner):
+    priority_class = 'bulk'
+    max_execution_time = 3600
+    VALID_TYPES = ('A', 'AAAA', 'MX', 'NS', 'TXT', 'CNAME', 'SOA', 'PTR', 'SRV')
+    DEFAULT_RECORD_TYPES = ['A', 'AAAA', 'MX']
+    DEFAULT_CONCURRENCY = 300
+    MAX_CONCURRENCY = 5000
+    DEFAULT_TIMEOUT = 3.0
+    MAX_TIMEOUT = 30.0
+    MAX_DOMAINS = 100000
+
+    def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        domains = parameters.get('domains')
+        upload_id = parameters.get('upload_id')
+        if not domains and not upload_id:
+            raise ValueError("Either domains or upload_id is required")
+
+        validated_domains = None
+        if domains:
+            validated_domains = [self.sanitize_hostname(domain) for domain in split_target_spec(domains)]
+            if not validated_domains:
+                raise ValueError("At least one domain is required")
+            if len(validated_domains) > self.MAX_DOMAINS:
+                raise ValueError(f"At most {self.MAX_DOMAINS} domains can be resolved per execution")
+        if upload_id:
+            upload_path(upload_id)
+
+        record_types = parameters.get('record_types', self.DEFAULT_RECORD_TYPES)
+        if isinstance(record_types, str):
+            record_types = record_types.split(',')
+        record_types = list(dict.fromkeys(rt.strip().upper() for rt in record_types if rt.strip().upper() in self.VALID_TYPES))
+        if not record_types:
+            raise ValueError(f"Record types must be chosen from: {', '.join(self.VALID_TYPES)}")
+
+        try:
+            concurrency = int(parameters.get('concurrency', self.DEFAULT_CONCURRENCY))
+            timeout = float(parameters.get('timeout', self.DEFAULT_TIMEOUT))
+        except (TypeError, ValueError):
+            raise ValueError("Concurrency and timeout must be numbers")
+        if concurrency < 1 or concurrency > self.MAX_CONCURRENCY:
+            raise ValueError(f"Concurrency must be between 1 and {self.MAX_CONCURRENCY}")
+        if timeout <= 0 or timeout > self.MAX_TIMEOUT:
+            raise ValueError(f"Timeout must be between 0 and {self.MAX_TIMEOUT:g} seconds")
+
+        return {
+            'domains': validated_domains,
+            'upload_id': upload_id,
+            'record_types': record_types,
+            'concurrency': concurrency,
+            'timeout': timeout,
+            'use_cache': bool(parameters.get('use_cache', True))
+        }
+
+    async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        validated = self.validate_parameters(parameters)
+        record_types = validated['record_types']
+        timeout = validated['timeout']
+        cache = resolution_cache if validated['use_cache'] else None
+
+        total = self._count_domains(validated)
+        await self.update_progress(5, f"Resolving {total} domain(s)")
+
+        resolver = self._make_resolver()
+        source = iter(self._iter_domains(validated))
+        seen = set()
+        columns: Dict[str, Any] = {'domains': [], 'status': [], 'records': {rt: [] for rt in record_types}}
+        counts: Counter = Counter()
+        queries = 0
+        start = time.monotonic()
+
+        async def worker():
+            nonlocal queries
+            for domain in source:
+                if self.stop_requested:
+                    return
+                domain = domain.lower().rstrip('.')
+                if domain in seen:
+                    continue
+                seen.add(domain)
+
+                status, records, sent = await self._resolve_domain(resolver, domain, record_types, timeout, cache)
+                queries += sent
+                counts[status] += 1
+                columns['domains'].append(domain)
+                columns['status'].append(status)
+                for record_type in record_types:
+                    columns['records'][record_type].append(records[record_type])
+
+                self.report_progress(
+                    5 + int(len(columns['domains']) / total * 90),
+                    f"Resolved {len(columns['domains'])}/{total} domains",
+                    {
+                        'domains': [domain],
+                        'status': [status],
+                        'records': {record_type: [records[record_type]] for record_type in record_types}
+                    }
+                )
+
+        workers = min(total, max(1, validated['concurrency'] // len(record_types)))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        elapsed = time.monotonic() - start
+
+        await self.update_progress(100, "Bulk DNS lookup stopped" if self.stop_requested else "Bulk DNS lookup complete")
+
+        result = {
+            'record_types': record_types,
+            'total_domains': len(columns['domains']),
+            'resolved': counts['ok'],
+            'nxdomain': counts['nxdomain'],
+            'failed': counts['timeout'] + counts['error'] + counts['invalid'],
+            'queries': queries,
+            'elapsed_seconds': round(elapsed, 3),
+            'queries_per_second': round(queries / elapsed, 1) if elapsed > 0 else float(queries),
+            'domains': columns['domains'],
+            'status': columns['status'],
+            'records': columns['records'],
+        }
+        if self.stop_requested:
+            result['partial'] = True
+
+        return self.redact_sensitive_data(result)
+
+    def _make_resolver(self) -> dns.asyncresolver.Resolver:
+        return make_resolver()
+
+    async def _resolve_domain(
+        self,
+        resolver: dns.asyncresolver.Resolver,
+        domain: str,
+        record_types: List[str],
+        timeout: float,
+        cache: Optional[ResolutionCache] = None
+    ) -> Tuple[str, Dict[str, Optional[List[str]]], int]:
+        try:
+            self.sanitize_hostname(domain)
+        except ValueError:
+            return 'invalid', {record_type: None for record_type in record_types}, 0
+
+        answers = await asyncio.gather(*(
+            resolve_records(resolver, domain, record_type, timeout, compact=True, cache=cache)
+            for record_type in record_types
+        ))
+        statuses = {status for status, _ in answers}
+        if 'nxdomain' in statuses:
+            return 'nxdomain', {record_type: None for record_type in record_types}, len(record_types)
+
+        records = {
+            record_type: records if status in ('ok', 'empty') else None
+            for record_type, (status, records) in zip(record_types, answers)
+        }
+        for status in ('timeout', 'error'):
+            if status in statuses:
+                return status, records, len(record_types)
+        return 'ok', records, len(record_types)
+
+    def _count_domains(self, validated: Dict[str, Any]) -> int:
+        total = len(validated['domains']) if validated['domains'] is not None else 0
+        if validated['upload_id']:
+            total += sum(1 for _ in iter_upload_lines(validated['upload_id']))
+        if total > self.MAX_DOMAINS:
+            raise ValueError(f"At most {self.MAX_DOMAINS} domains can be resolved per execution")
+        if not total:
+            raise ValueError("No domains to resolve")
+        return total
+
+    def _iter_domains(self, validated: Dict[str, Any]) -> Iterable[str]:
+        if validated['domains'] is not None:
+            yield from validated['domains']
+        if validated['upload_id']:
+            yield from iter_upload_lines(validated['upload_id'])
@@ -1,9 +1,16 @@
-from typing import Dict, Any
-import dns.resolver
+from typing import Dict, Any, Optional, Tuple
+import asyncio
+import dns.asyncresolver
 from ..base import BaseToolRunner
+from .resolution import ResolutionCache, query_records, resolution_cache
+from .resolver_pool import make_resolver
 
 
 class DNSLookupRunner(BaseToolRunner):
+    priority_class = 'interactive'
+    DEFAULT_TIMEOUT = 5.0
+    MAX_TIMEOUT = 30.0
+
     def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         domain = parameters.get('domain')
         if not domain:
@@ -20,72 +27,144 @@ class DNSLookupRunner(BaseToolRunner):
         
         if not record_types:
             record_types = ['A']
+
+        record_types = list(dict.fromkeys(record_types))
+
+        try:
+            timeout = float(parameters.get('timeout', self.DEFAULT_TIMEOUT))
+        except (TypeError, ValueError):
+            raise ValueError("Timeout must be a number")
+        if timeout <= 0 or timeout > self.MAX_TIMEOUT:
+            raise ValueError(f"Timeout must be between 0 and {self.MAX_TIMEOUT:g} seconds")
         
         return {
             'domain': domain,
-            'record_types': record_types
+            'record_types': record_types,
+            'timeout': timeout,
+            'use_cache': bool(parameters.get('use_cache', True))
         }
 
     async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         validated = self.validate_parameters(parameters)
         domain = validated['domain']
         record_types = validated['record_types']
+        timeout = validated['timeout']
 
         await self.update_progress(10, f"Looking up DNS records for {domain}")
 
+        resolver = self._make_resolver()
+        queries = {
+            asyncio.ensure_future(self._query(resolver, domain, record_type, timeout, validated['use_cache'])): record_type
+            for record_type in record_types
+        }
+        stop = asyncio.ensure_future(self.stop_event.wait())
+        pending = set(queries)
         results = {}
-        total_types = len(record_types)
-        
-        for idx, record_type in enumerate(record_types):
-            try:
-                answers = dns.resolver.resolve(domain, record_type)
-                records = []
-                
-                for rdata in answers:
-                    if record_type == 'MX':
-                        records.append({
-                            'preference': rdata.preference,
-                            'exchange': str(rdata.exchange)
-                        })
-                    elif record_type == 'SOA':
-                        records.append({
-                            'mname': str(rdata.mname),
-                            'rname': str(rdata.rname),
-                            'serial': rdata.serial,
-                            'refresh': rdata.refresh,
-                            'retry': rdata.retry,
-                            'expire': rdata.expire,
-                            'minimum': rdata.minimum
-                        })
-                    elif record_type == 'SRV':
-                        records.append({
-                            'priority': rdata.priority,
-                            'weight': rdata.weight,
-                            'port': rdata.port,
-                            'target': str(rdata.target)
-                        })
-                    else:
-                        records.append(str(rdata))
-                
-                results[record_type] = records
-                await self.update_progress(
-                    10 + int(((idx + 1) / total_types) * 80),
-                    f"Found {len(records)} {record_type} record(s)"
-                )
-                
-            except dns.resolver.NoAnswer:
-                results[record_type] = []
-            except dns.resolver.NXDOMAIN:
-                raise ValueError(f"Domain does not exist: {domain}")
-            except Exception as e:
-                results[record_type] = {'error': str(e)}
-
-        await self.update_progress(100, "DNS lookup complete")
+        timed_out = []
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending | {stop}, return_when=asyncio.FIRST_COMPLETED)
+                pending.discard(stop)
+                if stop in done:
+                    break
+
+                for query in done:
+                    record_type = queries[query]
+                    status, records = query.result()
+                    if status == 'nxdomain':
+                        raise ValueError(f"Domain does not exist: {domain}")
+                    if status == 'timeout':
+                        timed_out.append(record_type)
+                        results[record_type] = {'error': f"Query timed out after {timeout}s"}
+                        continue
+                    results[record_type] = records
+                    if status == 'ok':
+                        self.report_progress(
+                            10 + int((len(results) / len(record_types)) * 80),
+                            f"Found {len(records)} {record_type} record(s)",
+                            {'records': {record_type: records}}
+                        )
+        finally:
+            stop.cancel()
+            for query in pending:
+                query.cancel()
+
+        await self.update_progress(100, "DNS lookup stopped" if self.stop_requested else "DNS lookup complete")
 
         result = {
             'domain': domain,
-            'records': results,
+            'records': {record_type: results[record_type] for record_type in record_types if record_type in results},
             'total_record_types': len(record_types)
         }
+        if timed_out:
+            result['timed_out'] = [record_type for record_type in record_types if record_type in timed_out]
+        if timed_out or self.stop_requested:
+            result['partial'] = True
 
         return self.redact_sensitive_data(result)
+
+    def _make_resolver(self) -> dns.asyncresolver.Resolver:
+        return make_resolver()
+
+    async def _query(
+        self,
+        resolver: dns.asyncresolver.Resolver,
+        domain: str,
+        record_type: str,
+        timeout: float,
+        use_cache: bool = True
+    ) -> Tuple[str, Any]:
+        return await resolve_records(
+            resolver, domain, record_type, timeout, cache=resolution_cache if use_cache else None
+        )
+
+
+async def resolve_records(
+    resolver: dns.asyncresolver.Resolver,
+    domain: str,
+    record_type: str,
+    timeout: float,
+    compact: bool = False,
+    cache: Optional[ResolutionCache] = None
+) -> Tuple[str, Any]:
+    if cache is not None:
+        status, value = await cache.query(domain, record_type, timeout, resolver)
+    else:
+        status, value, _ = await query_records(resolver, domain, record_type, timeout)
+
+    if status == 'ok':
+        if compact:
+            return status, [rdata.to_text() for rdata in value]
+        return status, [format_rdata(record_type, rdata) for rdata in value]
+    if status == 'empty':
+        return status, []
+    if status == 'error':
+        return status, {'error': value}
+    return status, None
+
+
+def format_rdata(record_type: str, rdata: Any) -> Any:
+    if record_type == 'MX':
+        return {
+            'preference': rdata.preference,
+            'exchange': str(rdata.exchange)
+        }
+    if record_type == 'SOA':
+        return {
+            'mname': str(rdata.mname),
+            'rname': str(rdata.rname),
+            'serial': rdata.serial,
+            'refresh': rdata.refresh,
+            'retry': rdata.retry,
+            'expire': rdata.expire,
+            'minimum': rdata.minimum
+        }
+    if record_type == 'SRV':
+        return {
+            'priority': rdata.priority,
+            'weight': rdata.weight,
+            'port': rdata.port,
+            'target': str(rdata.target)
+        }
+    return str(rdata)
@@ -0,0 +1,226 @@
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import asyncio
+import itertools
+import os
+import socket
+import struct
+import time
+
+from .ratelimit import TokenBucket
+
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ECHO_PAYLOAD = b'cybersec-toolkit'
+RECEIVE_BUFFER_SIZE = 4 * 1024 * 1024
+
+
+def icmp_checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+
+def build_echo_request(ident: int, sequence: int, payload: bytes = ECHO_PAYLOAD) -> bytes:
+    header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, ident, sequence)
+    checksum = icmp_checksum(header + payload)
+    return struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, ident, sequence) + payload
+
+
+def parse_echo_reply(data: bytes) -> Optional[Tuple[int, int]]:
+    if len(data) < 8:
+        return None
+    icmp_type, code, _, ident, sequence = struct.unpack('!BBHHH', data[:8])
+    if icmp_type != ICMP_ECHO_REPLY or code != 0:
+        return None
+    return ident, sequence
+
+
+def open_icmp_socket() -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECEIVE_BUFFER_SIZE)
+    except OSError:
+        pass
+    return sock
+
+
+class _Probe:
+    __slots__ = ('address', 'attempt', 'sent', 'timer')
+
+    def __init__(self, address: str, attempt: int, sent: float, timer: asyncio.TimerHandle):
+        self.address = address
+        self.attempt = attempt
+        self.sent = sent
+        self.timer = timer
+
+
+class IcmpEchoSweeper:
+    SEND_BATCH = 64
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        timeout: float = 1.0,
+        retries: int = 1,
+        bucket: Optional[TokenBucket] = None,
+        max_in_flight: Optional[int] = None
+    ):
+        self.sock = sock
+        self.timeout = timeout
+        self.retries = retries
+        self.bucket = bucket
+        self.max_in_flight = max_in_flight
+        self.ident = os.getpid() & 0xffff
+        self.sent = 0
+        self.received = 0
+        self._sequence = itertools.count()
+
+    async def sweep(
+        self,
+        addresses: Iterable[str],
+        on_result: Callable[[str, Optional[float]], None],
+        stopped: Callable[[], bool] = lambda: False
+    ):
+        loop = asyncio.get_running_loop()
+        pending: Dict[Tuple[str, int], _Probe] = {}
+        retry: Deque[Tuple[str, int]] = deque()
+        changed = asyncio.Event()
+        targets: Iterator[str] = iter(addresses)
+        bound_ident: Optional[int] = None
+
+        def finish(address: str, rtt: Optional[float]):
+            on_result(address, rtt)
+            changed.set()
+
+        def on_readable():
+            while True:
+                try:
+                    data, source = self.sock.recvfrom(2048)
+                except (BlockingIOError, InterruptedError):
+                    return
+                except OSError:
+                    continue
+                reply = parse_echo_reply(data)
+                if reply is None:
+                    continue
+                ident, sequence = reply
+                if bound_ident and ident != bound_ident:
+                    continue
+                probe = pending.pop((source[0], sequence), None)
+                if probe is None:
+                    continue
+                probe.timer.cancel()
+                self.received += 1
+                finish(probe.address, loop.time() - probe.sent)
+
+        def on_timeout(key: Tuple[str, int]):
+            probe = pending.pop(key, None)
+            if probe is None:
+                return
+            if probe.attempt < self.retries:
+                retry.append((probe.address, probe.attempt + 1))
+                changed.set()
+            else:
+                finish(probe.address, None)
+
+        self.sock.setblocking(False)
+        loop.add_reader(self.sock.fileno(), on_readable)
+        try:
+            while not stopped():
+                if self.max_in_flight and len(pending) >= self.max_in_flight:
+                    changed.clear()
+                    await changed.wait()
+                    continue
+                if retry:
+                    address, attempt = retry.popleft()
+                else:
+                    address, attempt = next(targets, None), 0
+                if address is None:
+                    if not pending and not retry:
+                        break
+                    changed.clear()
+                    await changed.wait()
+                    continue
+
+                if self.bucket is not None:
+                    await self.bucket.acquire()
+                sequence = next(self._sequence) & 0xffff
+                try:
+                    await self._send(loop, build_echo_request(self.ident, sequence), address)
+                except OSError:
+                    finish(address, None)
+                    continue
+                self.sent += 1
+                if self.sent % self.SEND_BATCH == 0:
+                    await asyncio.sleep(0)
+                if bound_ident is None:
+                    bound_ident = self._bound_ident()
+                key = (address, sequence)
+                pending[key] = _Probe(address, attempt, loop.time(), loop.call_later(self.timeout, on_timeout, key))
+        finally:
+            loop.remove_reader(self.sock.fileno())
+            for probe in pending.values():
+                probe.timer.cancel()
+
+    def close(self):
+        self.sock.close()
+
+    async def _send(self, loop: asyncio.AbstractEventLoop, packet: bytes, address: str):
+        while True:
+            try:
+                self.sock.sendto(packet, (address, 0))
+                return
+            except (BlockingIOError, InterruptedError):
+                writable = loop.create_future()
+                loop.add_writer(self.sock.fileno(), lambda: writable.done() or writable.set_result(None))
+                try:
+                    await writable
+                finally:
+                    loop.remove_writer(self.sock.fileno())
+
+    def _bound_ident(self) -> int:
+        try:
+            return self.sock.getsockname()[1]
+        except (OSError, IndexError, TypeError):
+            return 0
+
+
+async def tcp_ping(address: str, ports: List[int], timeout: float) -> Optional[float]:
+    started = time.monotonic()
+
+    async def connect(port: int) -> Optional[float]:
+        try:
+            _, writer = await asyncio.open_connection(address, port)
+        except ConnectionRefusedError:
+            return time.monotonic() - started
+        except OSError:
+            return None
+        rtt = time.monotonic() - started
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return rtt
+
+    attempts = {asyncio.ensure_future(connect(port)) for port in ports}
+    deadline = started + timeout
+    try:
+        while attempts:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            done, attempts = await asyncio.wait(attempts, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                rtt = task.result()
+                if rtt is not None:
+                    return rtt
+        return None
+    finally:
+        for task in attempts:
+            task.cancel()
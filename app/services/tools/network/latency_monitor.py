@@ -0,0 +1,373 @@
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import math
+import time
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db.session import SessionLocal
+from app.models import LatencyWindow
+from ..base import BaseToolRunner
+from .echo import IcmpEchoSweeper, open_icmp_socket, tcp_ping
+from .port_spec import parse_port_spec
+from .resolution import resolve_host
+from .targets import parse_targets
+
+
+LOST = math.nan
+
+
+class SampleRing:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.rtts = array('d', bytes(8 * capacity))
+        self.count = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def append(self, timestamp: float, rtt_ms: Optional[float]):
+        index = self.count % self.capacity
+        self.timestamps[index] = timestamp
+        self.rtts[index] = LOST if rtt_ms is None else rtt_ms
+        self.count += 1
+
+    def last(self) -> Optional[float]:
+        if not self.count:
+            return None
+        rtt = self.rtts[(self.count - 1) % self.capacity]
+        return None if math.isnan(rtt) else rtt
+
+    def newest(self, start: float, end: float = math.inf) -> Iterator[Tuple[float, float]]:
+        for offset in range(1, len(self) + 1):
+            index = (self.count - offset) % self.capacity
+            timestamp = self.timestamps[index]
+            if timestamp <= start:
+                return
+            if timestamp <= end:
+                yield timestamp, self.rtts[index]
+
+    def window(self, start: float, end: float = math.inf) -> Tuple[List[float], int]:
+        values: List[float] = []
+        lost = 0
+        for _, rtt in self.newest(start, end):
+            if math.isnan(rtt):
+                lost += 1
+            else:
+                values.append(rtt)
+        return values, lost
+
+    def samples(self, start: float) -> List[List[Optional[float]]]:
+        return [
+            [timestamp, None if math.isnan(rtt) else rtt]
+            for timestamp, rtt in reversed(list(self.newest(start)))
+        ]
+
+
+def percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def summarize(values: List[float], lost: int) -> Dict[str, Any]:
+    total = len(values) + lost
+    values.sort()
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value, 3) if value is not None else None
+
+    return {
+        'samples': total,
+        'lost': lost,
+        'loss_percent': round(lost / total * 100, 2) if total else 0.0,
+        'min_ms': ms(values[0] if values else None),
+        'avg_ms': ms(sum(values) / len(values) if values else None),
+        'p50_ms': ms(percentile(values, 0.50)),
+        'p95_ms': ms(percentile(values, 0.95)),
+        'p99_ms': ms(percentile(values, 0.99)),
+        'max_ms': ms(values[-1] if values else None)
+    }
+
+
+class MonitorState:
+    def __init__(self, execution_id: str, method: str, interval: float, windows: List[int], targets: Dict[str, Tuple[str, SampleRing]]):
+        self.execution_id = execution_id
+        self.method = method
+        self.interval = interval
+        self.windows = windows
+        self.targets = targets
+        self.started_at = time.time()
+        self.rounds = 0
+
+    @classmethod
+    def from_snapshot(cls, execution_id: str, snapshot: Dict[str, Any]) -> 'MonitorState':
+        targets = {
+            target: (address, SampleRing(snapshot['capacity']))
+            for target, address in snapshot['targets'].items()
+        }
+        state = cls(execution_id, snapshot['method'], snapshot['interval'], snapshot['windows'], targets)
+        state.started_at = snapshot['started_at']
+        return state
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'method': self.method,
+            'interval': self.interval,
+            'windows': self.windows,
+            'capacity': next(iter(self.targets.values()))[1].capacity,
+            'targets': {target: address for target, (address, _) in self.targets.items()},
+            'started_at': self.started_at
+        }
+
+    def record(self, timestamp: float, rtts: Dict[str, Optional[float]]):
+        for target, (_, ring) in self.targets.items():
+            ring.append(timestamp, rtts.get(target))
+        self.rounds += 1
+
+    def summary(self, now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.time() if now is None else now
+        return {
+            target: {
+                'address': address,
+                'last_rtt_ms': ring.last(),
+                'windows': {f"{window}s": summarize(*ring.window(now - window)) for window in self.windows}
+            }
+            for target, (address, ring) in self.targets.items()
+        }
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            'execution_id': self.execution_id,
+            'method': self.method,
+            'interval': self.interval,
+            'windows': self.windows,
+            'targets': {target: address for target, (address, _) in self.targets.items()},
+            'started_at': datetime.utcfromtimestamp(self.started_at).isoformat(),
+            'rounds': self.rounds
+        }
+
+
+active_monitors: Dict[str, MonitorState] = {}
+
+
+class LatencyMonitorRunner(BaseToolRunner):
+    priority_class = 'monitor'
+    accumulate_partial_results = False
+    max_execution_time = 0
+    session_factory = SessionLocal
+    METHODS = ('auto', 'icmp', 'tcp')
+    DEFAULT_TCP_PORTS = '80,443'
+    MAX_TCP_PORTS = 16
+    MAX_TARGETS = 64
+    DEFAULT_INTERVAL = 1.0
+    MIN_INTERVAL = 0.2
+    MAX_INTERVAL = 300.0
+    DEFAULT_WINDOWS = (60, 300, 900)
+    MAX_WINDOWS = 5
+    DEFAULT_FLUSH_INTERVAL = 60
+    MIN_FLUSH_INTERVAL = 5
+    MAX_FLUSH_INTERVAL = 3600
+    MAX_RING_SAMPLES = 65536
+
+    def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        targets = parse_targets(parameters.get('targets') or parameters.get('target') or [], self.sanitize_hostname, self.MAX_TARGETS)
+
+        method = parameters.get('method', 'auto')
+        if method not in self.METHODS:
+            raise ValueError(f"Method must be one of: {', '.join(self.METHODS)}")
+
+        ports = parse_port_spec(parameters.get('ports', self.DEFAULT_TCP_PORTS), self.sanitize_port)
+        if not ports or len(ports) > self.MAX_TCP_PORTS:
+            raise ValueError(f"Between 1 and {self.MAX_TCP_PORTS} TCP ports can be probed per host")
+
+        windows = parameters.get('windows', list(self.DEFAULT_WINDOWS))
+        if isinstance(windows, (int, str)):
+            windows = str(windows).split(',')
+        try:
+            interval = float(parameters.get('interval', self.DEFAULT_INTERVAL))
+            timeout = float(parameters.get('timeout', min(1.0, interval)))
+            flush_interval = int(parameters.get('flush_interval', self.DEFAULT_FLUSH_INTERVAL))
+            duration = float(parameters.get('duration', 0))
+            windows = sorted({int(window) for window in windows})
+        except (TypeError, ValueError):
+            raise ValueError("Interval, timeout, flush interval, duration and windows must be numbers")
+
+        if interval < self.MIN_INTERVAL or interval > self.MAX_INTERVAL:
+            raise ValueError(f"Interval must be between {self.MIN_INTERVAL:g} and {self.MAX_INTERVAL:g} seconds")
+        if timeout <= 0 or timeout > interval:
+            raise ValueError("Timeout must be greater than 0 and no longer than the interval")
+        if flush_interval < self.MIN_FLUSH_INTERVAL or flush_interval > self.MAX_FLUSH_INTERVAL:
+            raise ValueError(f"Flush interval must be between {self.MIN_FLUSH_INTERVAL} and {self.MAX_FLUSH_INTERVAL} seconds")
+        if duration < 0:
+            raise ValueError("Duration must be 0 (run until cancelled) or a positive number of seconds")
+        if not windows or len(windows) > self.MAX_WINDOWS or windows[0] < interval:
+            raise ValueError(f"Between 1 and {self.MAX_WINDOWS} windows, each at least one interval long, are required")
+
+        capacity = math.ceil(max(windows[-1], flush_interval) / interval) + 1
+        if capacity > self.MAX_RING_SAMPLES:
+            raise ValueError(f"The longest window or flush interval may hold at most {self.MAX_RING_SAMPLES} samples per target")
+
+        return {
+            'targets': list(targets),
+            'method': method,
+            'ports': list(ports),
+            'interval': interval,
+            'timeout': timeout,
+            'windows': windows,
+            'flush_interval': flush_interval,
+            'duration': duration,
+            'capacity': capacity
+        }
+
+    async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        validated = self.validate_parameters(parameters)
+        interval = validated['interval']
+
+        await self.update_progress(5, f"Resolving {len(validated['targets'])} target(s)")
+
+        resolved = await asyncio.gather(*(resolve_host(target) for target in validated['targets']))
+        unresolved = [target for target, addresses in zip(validated['targets'], resolved) if not addresses]
+        targets = {
+            target: (addresses[0], SampleRing(validated['capacity']))
+            for target, addresses in zip(validated['targets'], resolved) if addresses
+        }
+        if not targets:
+            raise ValueError(f"Could not resolve any target: {', '.join(unresolved)}")
+
+        sweeper = None
+        method = validated['method']
+        if method != 'tcp':
+            try:
+                sweeper = IcmpEchoSweeper(self._open_icmp_socket(), validated['timeout'], retries=0)
+                method = 'icmp'
+            except OSError as e:
+                if method == 'icmp':
+                    raise ValueError(f"ICMP echo sockets are unavailable ({e}); check net.ipv4.ping_group_range or use the tcp method")
+                method = 'tcp'
+
+        state = MonitorState(self.execution_id, method, interval, validated['windows'], targets)
+        active_monitors[self.execution_id] = state
+        addresses = list(dict.fromkeys(address for address, _ in targets.values()))
+        flushed = {'windows': 0, 'errors': 0}
+        started = time.monotonic()
+        last_flush = time.time()
+        next_flush = last_flush + validated['flush_interval']
+
+        await self.update_progress(
+            10,
+            f"Monitoring {len(targets)} target(s) every {interval:g}s with {method.upper()} echo",
+            {'monitor': state.snapshot()}
+        )
+
+        try:
+            tick = 0
+            while not self.stop_requested:
+                elapsed = time.monotonic() - started
+                if validated['duration'] and elapsed >= validated['duration']:
+                    break
+
+                now = time.time()
+                results = await self._probe_round(sweeper, addresses, validated)
+                if self.stop_requested:
+                    break
+                rtts = {
+                    target: results[address] * 1000 if results.get(address) is not None else None
+                    for target, (address, _) in targets.items()
+                }
+                state.record(now, rtts)
+
+                if now >= next_flush:
+                    await self._flush(state, last_flush, now, flushed)
+                    last_flush, next_flush = now, now + validated['flush_interval']
+
+                progress = min(99, 10 + int(elapsed / validated['duration'] * 89)) if validated['duration'] else 50
+                self.report_progress(progress, f"Completed {state.rounds} probe round(s)", {
+                    'rounds': state.rounds,
+                    'targets': state.summary(now),
+                    'samples': [[now, rtts]]
+                })
+
+                tick = max(tick + 1, math.ceil((time.monotonic() - started) / interval))
+                try:
+                    await asyncio.wait_for(self.stop_event.wait(), max(0.0, started + tick * interval - time.monotonic()))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            active_monitors.pop(self.execution_id, None)
+            if sweeper is not None:
+                sweeper.close()
+            await self._flush(state, last_flush, math.inf, flushed)
+
+        await self.update_progress(100, "Monitor stopped" if self.stop_requested else "Monitor complete")
+
+        summary = state.summary()
+        for target, (_, ring) in targets.items():
+            summary[target]['total_samples'] = ring.count
+        result = {
+            'method': method,
+            'interval': interval,
+            'windows': validated['windows'],
+            'rounds': state.rounds,
+            'targets': summary,
+            'unresolved': unresolved,
+            'windows_flushed': flushed['windows'],
+            'flush_errors': flushed['errors'],
+            'elapsed_seconds': round(time.monotonic() - started, 3)
+        }
+        if self.stop_requested:
+            result['partial'] = True
+
+        return self.redact_sensitive_data(result)
+
+    def receive_progress(self, progress: int, message: Optional[str] = None, partial_result: Optional[Dict[str, Any]] = None):
+        partial_result = partial_result or {}
+        if 'monitor' in partial_result:
+            active_monitors[self.execution_id] = MonitorState.from_snapshot(self.execution_id, partial_result['monitor'])
+        state = active_monitors.get(self.execution_id)
+        if state is not None:
+            for timestamp, rtts in partial_result.get('samples', ()):
+                state.record(timestamp, rtts)
+        if progress >= 100:
+            active_monitors.pop(self.execution_id, None)
+
+    def _open_icmp_socket(self):
+        return open_icmp_socket()
+
+    async def _probe_round(self, sweeper: Optional[IcmpEchoSweeper], addresses: List[str], validated: Dict[str, Any]) -> Dict[str, Optional[float]]:
+        if sweeper is not None:
+            results: Dict[str, Optional[float]] = {}
+            await sweeper.sweep(addresses, results.__setitem__, lambda: self.stop_requested)
+            return results
+        rtts = await asyncio.gather(*(tcp_ping(address, validated['ports'], validated['timeout']) for address in addresses))
+        return dict(zip(addresses, rtts))
+
+    async def _flush(self, state: MonitorState, start: float, end: float, flushed: Dict[str, int]):
+        rows = []
+        for target, (address, ring) in state.targets.items():
+            timestamps = [timestamp for timestamp, _ in ring.newest(start, end)]
+            if not timestamps:
+                continue
+            rows.append({
+                'execution_id': state.execution_id,
+                'target': target,
+                'address': address,
+                'window_start': datetime.utcfromtimestamp(timestamps[-1]),
+                'window_end': datetime.utcfromtimestamp(timestamps[0]),
+                **summarize(*ring.window(start, end))
+            })
+        if not rows:
+            return
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._store_windows, rows)
+            flushed['windows'] += len(rows)
+        except SQLAlchemyError:
+            flushed['errors'] += 1
+
+    def _store_windows(self, rows: List[Dict[str, Any]]):
+        with self.session_factory() as db:
+            db.add_all(LatencyWindow(**row) for row in rows)
+            db.commit()
@@ -0,0 +1,161 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import asyncio
+import socket
+import time
+
+from ..base import BaseToolRunner
+from .echo import IcmpEchoSweeper, open_icmp_socket, tcp_ping
+from .port_spec import parse_port_spec
+from .ratelimit import TokenBucket
+from .targets import TargetSet, is_address_spec, split_target_spec
+
+
+class PingSweepRunner(BaseToolRunner):
+    priority_class = 'bulk'
+    max_execution_time = 3600
+    METHODS = ('auto', 'icmp', 'tcp')
+    DEFAULT_TCP_PORTS = '80,443,22'
+    MAX_TCP_PORTS = 16
+    DEFAULT_RATE_LIMIT = 5000
+    MAX_RATE_LIMIT = 50000
+    DEFAULT_CONCURRENCY = 1000
+    MAX_CONCURRENCY = 5000
+    DEFAULT_TIMEOUT = 1.0
+    MAX_TIMEOUT = 10.0
+    MAX_RETRIES = 5
+    MAX_ADDRESSES = 262144
+
+    def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        entries = split_target_spec(parameters.get('targets') or [])
+        if not entries:
+            raise ValueError("At least one address block is required")
+
+        targets = TargetSet(self.MAX_ADDRESSES)
+        for entry in entries:
+            if not is_address_spec(entry):
+                raise ValueError(f"Invalid address specification: {entry}")
+            targets.add_address_spec(entry)
+
+        method = parameters.get('method', 'auto')
+        if method not in self.METHODS:
+            raise ValueError(f"Method must be one of: {', '.join(self.METHODS)}")
+
+        ports = parse_port_spec(parameters.get('ports', self.DEFAULT_TCP_PORTS), self.sanitize_port)
+        if not ports or len(ports) > self.MAX_TCP_PORTS:
+            raise ValueError(f"Between 1 and {self.MAX_TCP_PORTS} TCP ports can be probed per host")
+
+        try:
+            rate_limit = float(parameters.get('rate_limit', self.DEFAULT_RATE_LIMIT))
+            concurrency = int(parameters.get('concurrency', self.DEFAULT_CONCURRENCY))
+            timeout = float(parameters.get('timeout', self.DEFAULT_TIMEOUT))
+            retries = int(parameters.get('retries', 1))
+        except (TypeError, ValueError):
+            raise ValueError("Rate limit, concurrency, timeout and retries must be numbers")
+        if rate_limit <= 0 or rate_limit > self.MAX_RATE_LIMIT:
+            raise ValueError(f"Rate limit must be between 0 and {self.MAX_RATE_LIMIT} probes per second")
+        if concurrency < 1 or concurrency > self.MAX_CONCURRENCY:
+            raise ValueError(f"Concurrency must be between 1 and {self.MAX_CONCURRENCY}")
+        if timeout <= 0 or timeout > self.MAX_TIMEOUT:
+            raise ValueError(f"Timeout must be between 0 and {self.MAX_TIMEOUT:g} seconds")
+        if retries < 0 or retries > self.MAX_RETRIES:
+            raise ValueError(f"Retries must be between 0 and {self.MAX_RETRIES}")
+
+        return {
+            'targets': targets,
+            'specs': entries,
+            'method': method,
+            'ports': list(ports),
+            'rate_limit': rate_limit,
+            'concurrency': concurrency,
+            'timeout': timeout,
+            'retries': retries
+        }
+
+    async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        validated = self.validate_parameters(parameters)
+        targets = validated['targets']
+        total = len(targets)
+
+        sock = None
+        method = validated['method']
+        if method != 'tcp':
+            try:
+                sock = self._open_icmp_socket()
+                method = 'icmp'
+            except OSError as e:
+                if method == 'icmp':
+                    raise ValueError(f"ICMP echo sockets are unavailable ({e}); check net.ipv4.ping_group_range or use the tcp method")
+                method = 'tcp'
+
+        await self.update_progress(5, f"Sweeping {total} address(es) with {method.upper()} echo")
+
+        alive: Dict[str, float] = {}
+        counts: Counter = Counter()
+        bucket = TokenBucket(validated['rate_limit'], max(validated['rate_limit'] / 10, len(validated['ports'])))
+        start = time.monotonic()
+
+        def on_result(address: str, rtt: Optional[float]):
+            counts['scanned'] += 1
+            delta = None
+            if rtt is not None:
+                alive[address] = round(rtt * 1000, 3)
+                delta = {'alive': {address: alive[address]}}
+            self.report_progress(
+                5 + int(counts['scanned'] / total * 90),
+                f"Swept {counts['scanned']}/{total} addresses, {len(alive)} alive",
+                delta
+            )
+
+        if sock is not None:
+            sweeper = IcmpEchoSweeper(sock, validated['timeout'], validated['retries'], bucket, validated['concurrency'])
+            try:
+                await sweeper.sweep(targets, on_result, lambda: self.stop_requested)
+            finally:
+                sweeper.close()
+            counts['probes'] = sweeper.sent
+        else:
+            await self._tcp_sweep(targets, validated, bucket, counts, on_result)
+        elapsed = time.monotonic() - start
+
+        await self.update_progress(100, "Ping sweep stopped" if self.stop_requested else "Ping sweep complete")
+
+        result = {
+            'targets': validated['specs'],
+            'method': method,
+            'addresses_scanned': counts['scanned'],
+            'hosts_alive': len(alive),
+            'alive': dict(sorted(alive.items(), key=lambda item: socket.inet_aton(item[0]))),
+            'probes_sent': counts['probes'],
+            'elapsed_seconds': round(elapsed, 3),
+            'probes_per_second': round(counts['probes'] / elapsed, 1) if elapsed > 0 else float(counts['probes'])
+        }
+        if method == 'tcp':
+            result['ports'] = validated['ports']
+        if self.stop_requested:
+            result['partial'] = True
+
+        return self.redact_sensitive_data(result)
+
+    def _open_icmp_socket(self) -> socket.socket:
+        return open_icmp_socket()
+
+    async def _tcp_sweep(self, targets: TargetSet, validated: Dict[str, Any], bucket: TokenBucket, counts: Counter, on_result):
+        addresses = iter(targets)
+        ports: List[int] = validated['ports']
+
+        async def worker():
+            for address in addresses:
+                rtt = None
+                for _ in range(validated['retries'] + 1):
+                    await bucket.acquire(len(ports))
+                    if self.stop_requested:
+                        return
+                    counts['probes'] += len(ports)
+                    rtt = await tcp_ping(address, ports, validated['timeout'])
+                    if rtt is not None:
+                        break
+                on_result(address, rtt)
+
+        workers = min(len(targets), max(1, validated['concurrency'] // len(ports)))
+        await asyncio.gather(*(worker() for _ in range(workers)))
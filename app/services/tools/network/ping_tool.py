@@ -1,24 +1,101 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import asyncio
+import math
 import re
 from ..base import BaseToolRunner
+from .resolution import resolve_host
+
+
+REPLY_PATTERN = re.compile(r'bytes from .*?icmp_seq=(\d+)(?:.*?ttl=(\d+))?.*?time[=<]([\d.]+)')
+NO_ANSWER_PATTERN = re.compile(r'no answer yet for icmp_seq=(\d+)')
+SUMMARY_PATTERN = re.compile(r'(\d+) packets transmitted, (\d+) (?:packets )?received')
+
+
+class PingStats:
+    def __init__(self):
+        self.transmitted = 0
+        self.received = 0
+        self.min_rtt: Optional[float] = None
+        self.max_rtt: Optional[float] = None
+        self.mean_rtt = 0.0
+        self._m2 = 0.0
+
+    def sent(self, sequence: int):
+        self.transmitted = max(self.transmitted, sequence)
+
+    def add_reply(self, sequence: int, rtt: float):
+        self.sent(sequence)
+        self.received += 1
+        self.min_rtt = rtt if self.min_rtt is None else min(self.min_rtt, rtt)
+        self.max_rtt = rtt if self.max_rtt is None else max(self.max_rtt, rtt)
+        delta = rtt - self.mean_rtt
+        self.mean_rtt += delta / self.received
+        self._m2 += delta * (rtt - self.mean_rtt)
+
+    @property
+    def loss_percent(self) -> float:
+        if not self.transmitted:
+            return 0.0
+        return round(max(0, self.transmitted - self.received) / self.transmitted * 100, 1)
+
+    @property
+    def mdev_rtt(self) -> Optional[float]:
+        if not self.received:
+            return None
+        return math.sqrt(self._m2 / self.received)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'packets_sent': self.transmitted,
+            'packets_received': self.received,
+            'packet_loss_percent': self.loss_percent,
+            'min_rtt_ms': self._round(self.min_rtt),
+            'avg_rtt_ms': self._round(self.mean_rtt if self.received else None),
+            'max_rtt_ms': self._round(self.max_rtt),
+            'mdev_rtt_ms': self._round(self.mdev_rtt)
+        }
+
+    def _round(self, value: Optional[float]) -> Optional[float]:
+        return round(value, 3) if value is not None else None
 
 
 class PingRunner(BaseToolRunner):
+    priority_class = 'interactive'
+    MIN_PROBES_FOR_TERMINATION = 3
+
     def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         target = parameters.get('target')
         if not target:
             raise ValueError("Target host is required")
-        
+
         target = self.sanitize_hostname(target) if not self._is_ip(target) else self.sanitize_ip(target)
-        
+
         count = parameters.get('count', 4)
         if not isinstance(count, int) or count < 1 or count > 100:
             raise ValueError("Count must be between 1 and 100")
-        
+
+        stop_after_replies = parameters.get('stop_after_replies')
+        if stop_after_replies is not None and (not isinstance(stop_after_replies, int) or stop_after_replies < 1 or stop_after_replies > count):
+            raise ValueError("Stop after replies must be between 1 and the packet count")
+
+        try:
+            max_loss_percent = parameters.get('max_loss_percent')
+            max_loss_percent = float(max_loss_percent) if max_loss_percent is not None else None
+            max_rtt_ms = parameters.get('max_rtt_ms')
+            max_rtt_ms = float(max_rtt_ms) if max_rtt_ms is not None else None
+        except (TypeError, ValueError):
+            raise ValueError("Loss and latency limits must be numbers")
+        if max_loss_percent is not None and not 0 <= max_loss_percent <= 100:
+            raise ValueError("Max loss percent must be between 0 and 100")
+        if max_rtt_ms is not None and max_rtt_ms <= 0:
+            raise ValueError("Max RTT must be greater than 0 milliseconds")
+
         return {
             'target': target,
-            'count': count
+            'count': count,
+            'stop_after_replies': stop_after_replies,
+            'max_loss_percent': max_loss_percent,
+            'max_rtt_ms': max_rtt_ms
         }
 
     async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -29,74 +106,92 @@ class PingRunner(BaseToolRunner):
         await self.update_progress(10, f"Pinging {target}")
 
         try:
+            addresses = await resolve_host(target)
+            if not addresses:
+                raise ValueError(f"Could not resolve host: {target}")
+
             process = await asyncio.create_subprocess_exec(
-                'ping', '-c', str(count), target,
+                *self._ping_command(addresses[0], count),
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
+                stderr=asyncio.subprocess.STDOUT
             )
 
-            stdout, stderr = await process.communicate()
-
-            if process.returncode != 0:
-                raise ValueError(f"Ping failed: {stderr.decode()}")
-
-            output = stdout.decode()
-            
-            await self.update_progress(80, "Parsing ping results")
-
-            result = self._parse_ping_output(output, target, count)
-            
-            await self.update_progress(100, "Ping complete")
+            stats = PingStats()
+            packets: List[Dict[str, Any]] = []
+            unparsed: List[str] = []
+            terminated_early = None
+
+            async for line in self.iter_lines_until_stopped(process):
+                packet = self._parse_line(line, stats)
+                if packet is None:
+                    if line.strip():
+                        unparsed.append(line)
+                    continue
+                if packet:
+                    packets.append(packet)
+                    self.report_progress(
+                        10 + int(min(stats.transmitted, count) / count * 85),
+                        f"Reply {stats.received} from {addresses[0]}: {packet['time']} ms",
+                        {'packets': [packet], **stats.summary()}
+                    )
+                if terminated_early is None:
+                    terminated_early = self._termination_reason(stats, validated)
+                    if terminated_early:
+                        self.interrupt_process(process)
+
+            if not self.stop_requested and not terminated_early and process.returncode != 0:
+                raise ValueError(f"Ping failed: {' '.join(unparsed[-3:])}")
+
+            result = {'target': target, **stats.summary(), 'packets': packets}
+            result['ip'] = addresses[0]
+            if terminated_early:
+                result['terminated_early'] = terminated_early
+            if self.stop_requested:
+                result['partial'] = True
+
+            await self.update_progress(100, "Ping stopped" if self.stop_requested else "Ping complete")
 
             return self.redact_sensitive_data(result)
 
         except Exception as e:
             raise ValueError(f"Ping execution failed: {str(e)}")
 
-    def _parse_ping_output(self, output: str, target: str, count: int) -> Dict[str, Any]:
-        packets_sent = count
-        packets_received = 0
-        packet_loss = 0
-        
-        loss_match = re.search(r'(\d+)% packet loss', output)
-        if loss_match:
-            packet_loss = int(loss_match.group(1))
-            packets_received = packets_sent - (packets_sent * packet_loss // 100)
-
-        min_rtt = max_rtt = avg_rtt = mdev_rtt = None
-        rtt_match = re.search(r'rtt min/avg/max/mdev = ([\d.]+)/([\d.]+)/([\d.]+)/([\d.]+)', output)
-        if rtt_match:
-            min_rtt = float(rtt_match.group(1))
-            avg_rtt = float(rtt_match.group(2))
-            max_rtt = float(rtt_match.group(3))
-            mdev_rtt = float(rtt_match.group(4))
-
-        packets = []
-        for line in output.split('\n'):
-            if 'bytes from' in line:
-                seq_match = re.search(r'icmp_seq=(\d+)', line)
-                ttl_match = re.search(r'ttl=(\d+)', line)
-                time_match = re.search(r'time=([\d.]+)', line)
-                
-                if seq_match and time_match:
-                    packets.append({
-                        'sequence': int(seq_match.group(1)),
-                        'ttl': int(ttl_match.group(1)) if ttl_match else None,
-                        'time': float(time_match.group(1))
-                    })
-
-        return {
-            'target': target,
-            'packets_sent': packets_sent,
-            'packets_received': packets_received,
-            'packet_loss_percent': packet_loss,
-            'min_rtt_ms': min_rtt,
-            'avg_rtt_ms': avg_rtt,
-            'max_rtt_ms': max_rtt,
-            'mdev_rtt_ms': mdev_rtt,
-            'packets': packets
-        }
+    def _ping_command(self, address: str, count: int) -> List[str]:
+        return ['ping', '-O', '-c', str(count), address]
+
+    def _parse_line(self, line: str, stats: PingStats) -> Optional[Dict[str, Any]]:
+        match = REPLY_PATTERN.search(line)
+        if match:
+            packet = {
+                'sequence': int(match.group(1)),
+                'ttl': int(match.group(2)) if match.group(2) else None,
+                'time': float(match.group(3))
+            }
+            stats.add_reply(packet['sequence'], packet['time'])
+            return packet
+
+        match = NO_ANSWER_PATTERN.search(line)
+        if match:
+            stats.sent(int(match.group(1)))
+            return {}
+
+        match = SUMMARY_PATTERN.search(line)
+        if match:
+            stats.transmitted = int(match.group(1))
+            return {}
+
+        return None
+
+    def _termination_reason(self, stats: PingStats, validated: Dict[str, Any]) -> Optional[str]:
+        if validated['stop_after_replies'] and stats.received >= validated['stop_after_replies']:
+            return 'replies'
+        if stats.transmitted < self.MIN_PROBES_FOR_TERMINATION:
+            return None
+        if validated['max_loss_percent'] is not None and stats.loss_percent > validated['max_loss_percent']:
+            return 'loss'
+        if validated['max_rtt_ms'] is not None and stats.received and stats.mean_rtt > validated['max_rtt_ms']:
+            return 'latency'
+        return None
 
     def _is_ip(self, value: str) -> bool:
-        import re
         return bool(re.match(r'^(\d{1,3}\.){3}\d{1,3}$', value))
@@ -1,129 +1,322 @@
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 import asyncio
 import socket
+import time
+from collections import defaultdict
 from ..base import BaseToolRunner
+from .port_spec import parse_port_spec
+from .resolution import resolve_host
+from .rtt import RttEstimator
+from .scan_scheduler import ProbeScheduler
+from .service_detection import ServiceDetector
+from .targets import TargetSet, parse_targets, split_target_spec
+
+
+COMMON_SERVICES = {
+    21: 'ftp', 22: 'ssh', 23: 'telnet', 25: 'smtp',
+    53: 'dns', 80: 'http', 110: 'pop3', 143: 'imap',
+    443: 'https', 465: 'smtps', 587: 'smtp', 993: 'imaps',
+    995: 'pop3s', 3306: 'mysql', 5432: 'postgresql', 6379: 'redis',
+    8080: 'http-proxy', 8443: 'https-alt', 27017: 'mongodb'
+}
 
 
 class PortScannerRunner(BaseToolRunner):
+    priority_class = 'bulk'
+    DEFAULT_CONCURRENCY = 500
+    MAX_CONCURRENCY = 5000
+    DEFAULT_PER_HOST_CONCURRENCY = 100
+    MAX_HOSTS = 65536
+    TIMING_MODES = ('fixed', 'adaptive')
+    DEFAULT_MIN_TIMEOUT = 0.05
+    DEFAULT_MAX_TIMEOUT = 10.0
+    MAX_RETRIES = 5
+    DEFAULT_DETECTION_CONCURRENCY = 50
+    DEFAULT_DETECTION_TIMEOUT = 2.0
+
     def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         target = parameters.get('target')
         if not target:
             raise ValueError("Target host is required")
         
-        target = self.sanitize_hostname(target) if not self._is_ip(target) else self.sanitize_ip(target)
+        entries = split_target_spec(target)
+        targets = parse_targets(entries, self.sanitize_hostname, self.MAX_HOSTS)
+        target = targets.hostnames[0] if len(entries) == 1 and targets.hostnames else ','.join(entries)
         
-        ports = parameters.get('ports', '1-1000')
-        start_port, end_port = self._parse_port_range(ports)
+        ports = parse_port_spec(parameters.get('ports', '1-1000'), self.sanitize_port)
         
         timeout = parameters.get('timeout', 1)
         if not isinstance(timeout, (int, float)) or timeout <= 0:
             raise ValueError("Timeout must be a positive number")
         
+        timing = parameters.get('timing', 'fixed')
+        if timing not in self.TIMING_MODES:
+            raise ValueError(f"Timing must be one of: {', '.join(self.TIMING_MODES)}")
+        
+        min_timeout = parameters.get('min_timeout', self.DEFAULT_MIN_TIMEOUT)
+        max_timeout = parameters.get('max_timeout', max(self.DEFAULT_MAX_TIMEOUT, timeout))
+        if not isinstance(min_timeout, (int, float)) or not isinstance(max_timeout, (int, float)) \
+                or min_timeout <= 0 or max_timeout < min_timeout:
+            raise ValueError("Adaptive timeout bounds must satisfy 0 < min_timeout <= max_timeout")
+        
+        max_retries = parameters.get('max_retries', 1 if timing == 'adaptive' else 0)
+        if not isinstance(max_retries, int) or max_retries < 0 or max_retries > self.MAX_RETRIES:
+            raise ValueError(f"Max retries must be between 0 and {self.MAX_RETRIES}")
+        
+        concurrency = parameters.get('concurrency', self.DEFAULT_CONCURRENCY)
+        if not isinstance(concurrency, int) or concurrency < 1 or concurrency > self.MAX_CONCURRENCY:
+            raise ValueError(f"Concurrency must be between 1 and {self.MAX_CONCURRENCY}")
+        
+        per_host_concurrency = parameters.get('per_host_concurrency', self.DEFAULT_PER_HOST_CONCURRENCY)
+        if not isinstance(per_host_concurrency, int) or per_host_concurrency < 1 or per_host_concurrency > self.MAX_CONCURRENCY:
+            raise ValueError(f"Per-host concurrency must be between 1 and {self.MAX_CONCURRENCY}")
+        
+        service_detection = bool(parameters.get('service_detection', False))
+        
+        detection_concurrency = parameters.get('detection_concurrency', self.DEFAULT_DETECTION_CONCURRENCY)
+        if not isinstance(detection_concurrency, int) or detection_concurrency < 1 or detection_concurrency > self.MAX_CONCURRENCY:
+            raise ValueError(f"Detection concurrency must be between 1 and {self.MAX_CONCURRENCY}")
+        
+        detection_timeout = parameters.get('detection_timeout', self.DEFAULT_DETECTION_TIMEOUT)
+        if not isinstance(detection_timeout, (int, float)) or detection_timeout <= 0:
+            raise ValueError("Detection timeout must be a positive number")
+        
         return {
             'target': target,
-            'start_port': start_port,
-            'end_port': end_port,
-            'timeout': float(timeout)
+            'targets': targets,
+            'ports': ports,
+            'start_port': ports.min(),
+            'end_port': ports.max(),
+            'timeout': float(timeout),
+            'timing': timing,
+            'min_timeout': float(min_timeout),
+            'max_timeout': float(max_timeout),
+            'max_retries': max_retries,
+            'concurrency': concurrency,
+            'per_host_concurrency': min(per_host_concurrency, concurrency),
+            'service_detection': service_detection,
+            'detection_concurrency': detection_concurrency,
+            'detection_timeout': float(detection_timeout)
         }
 
     async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         validated = self.validate_parameters(parameters)
         target = validated['target']
-        start_port = validated['start_port']
-        end_port = validated['end_port']
-        timeout = validated['timeout']
+        targets = validated['targets']
+        ports = validated['ports']
 
         await self.update_progress(10, f"Starting port scan on {target}")
 
-        try:
-            ip = socket.gethostbyname(target)
-        except socket.gaierror as e:
+        hosts, unresolved = await self._resolve_targets(targets)
+        if not hosts:
             raise ValueError(f"Could not resolve hostname: {target}")
 
-        open_ports = []
-        total_ports = end_port - start_port + 1
+        ports_per_host = len(ports)
+        total_probes = ports_per_host * len(hosts)
+        open_ports: Dict[str, list] = defaultdict(list)
+        open_count = 0
         scanned = 0
 
-        for port in range(start_port, end_port + 1):
-            try:
-                result = await self._scan_port(ip, port, timeout)
-                if result:
+        scheduler = ProbeScheduler(
+            self._make_probe(validated),
+            list(hosts),
+            ports,
+            validated['concurrency'],
+            validated['per_host_concurrency']
+        )
+        detector = ServiceDetector(validated['detection_timeout']) if validated['service_detection'] else None
+        detection_slots = asyncio.Semaphore(validated['detection_concurrency'])
+        detection_tasks = []
+        detection = None
+        stop = None
+
+        probes = scheduler.run()
+        try:
+            async for ip, port, is_open in probes:
+                scanned += 1
+                if is_open:
                     service = self._get_service_name(port)
-                    open_ports.append({
+                    entry = {
                         'port': port,
                         'state': 'open',
                         'service': service
-                    })
-                    await self.update_progress(
-                        10 + int((scanned / total_ports) * 80),
-                        f"Found open port: {port}/{service}",
-                        {'open_ports_count': len(open_ports)}
+                    }
+                    open_ports[ip].append(entry)
+                    open_count += 1
+                    if detector:
+                        detection_tasks.append(asyncio.ensure_future(
+                            self._detect_service(detector, detection_slots, ip, entry)
+                        ))
+                    self.report_progress(
+                        10 + int((scanned / total_probes) * 80),
+                        f"Found open port: {ip}:{port}/{service}" if len(hosts) > 1 else f"Found open port: {port}/{service}",
+                        {'open_ports': [dict(entry, ip=ip)], 'open_ports_count': open_count}
+                    )
+                else:
+                    self.report_progress(
+                        10 + int((scanned / total_probes) * 80),
+                        f"Scanned {scanned}/{total_probes} ports"
                     )
-            except Exception as e:
-                pass
+                if self.stop_requested:
+                    break
 
-            scanned += 1
-            if scanned % 10 == 0:
-                await self.update_progress(
-                    10 + int((scanned / total_ports) * 80),
-                    f"Scanned {scanned}/{total_ports} ports"
-                )
+            if detection_tasks and not self.stop_requested:
+                await self.update_progress(90, f"Detecting services on {len(detection_tasks)} open port(s)")
+                detection = asyncio.gather(*detection_tasks)
+                stop = asyncio.ensure_future(self.stop_event.wait())
+                await asyncio.wait({detection, stop}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            await probes.aclose()
+            for task in detection_tasks:
+                task.cancel()
+            if stop is not None:
+                stop.cancel()
+            if detection is not None:
+                detection.cancel()
+            if detection_tasks:
+                await asyncio.gather(*detection_tasks, return_exceptions=True)
+            if detection is not None:
+                await asyncio.gather(detection, stop, return_exceptions=True)
 
-        await self.update_progress(100, "Scan complete")
+        for entries in open_ports.values():
+            entries.sort(key=lambda entry: entry['port'])
 
-        result = {
-            'target': target,
-            'ip': ip,
-            'ports_scanned': total_ports,
-            'open_ports_count': len(open_ports),
-            'open_ports': open_ports,
-            'scan_type': 'TCP Connect',
-        }
+        partial = self.stop_requested
+        await self.update_progress(100, "Scan stopped" if partial else "Scan complete")
+
+        if len(targets) == 1:
+            ip = next(iter(hosts))
+            result = {
+                'target': target,
+                'ip': ip,
+                'ports_scanned': ports_per_host,
+                'open_ports_count': open_count,
+                'open_ports': open_ports[ip],
+                'scan_type': 'TCP Connect',
+            }
+        else:
+            result = {
+                'target': target,
+                'hosts_scanned': len(hosts),
+                'hosts_with_open_ports': len(open_ports),
+                'ports_per_host': ports_per_host,
+                'ports_scanned': total_probes,
+                'open_ports_count': open_count,
+                'hosts': [
+                    {
+                        'target': hosts[ip],
+                        'ip': ip,
+                        'open_ports_count': len(entries),
+                        'open_ports': entries,
+                    }
+                    for ip, entries in sorted(open_ports.items(), key=lambda item: socket.inet_aton(item[0]))
+                ],
+                'unresolved': unresolved,
+                'scan_type': 'TCP Connect',
+            }
+
+        if partial:
+            result['partial'] = True
+            result['probes_completed'] = scanned
+
+        if validated['timing'] == 'adaptive':
+            result['timing'] = {
+                'mode': 'adaptive',
+                'retransmissions': self._retransmissions,
+                'smoothed_rtt_ms': {
+                    ip: round(estimator.srtt * 1000, 3)
+                    for ip, estimator in self._estimators.items()
+                    if estimator.srtt is not None
+                },
+            }
 
         return self.redact_sensitive_data(result)
 
+    async def _detect_service(self, detector: ServiceDetector, slots: asyncio.Semaphore, ip: str, entry: Dict[str, Any]):
+        async with slots:
+            detected = await detector.detect(ip, entry['port'])
+        entry['version'] = None
+        entry['banner'] = None
+        if detected:
+            if detected['service']:
+                entry['service'] = detected['service']
+            entry['version'] = detected['version']
+            entry['banner'] = detected['banner']
+
+    def _make_probe(self, validated: Dict[str, Any]):
+        timeout = validated['timeout']
+        max_retries = validated['max_retries']
+        if validated['timing'] == 'adaptive':
+            min_timeout, max_timeout = validated['min_timeout'], validated['max_timeout']
+        else:
+            min_timeout = max_timeout = timeout
+
+        self._retransmissions = 0
+        self._estimators: Dict[str, RttEstimator] = {}
+
+        def probe(ip: str, port: int):
+            estimator = self._estimators.get(ip)
+            if estimator is None:
+                estimator = self._estimators[ip] = RttEstimator(timeout, min_timeout, max_timeout)
+            return self._scan_port_with_retries(ip, port, estimator, max_retries)
+        return probe
+
+    async def _resolve_targets(self, targets: TargetSet) -> Tuple[Dict[str, str], List[str]]:
+        hosts: Dict[str, str] = {}
+        unresolved: List[str] = []
+
+        async def resolve(hostname: str):
+            addresses = await resolve_host(hostname)
+            return hostname, addresses[0] if addresses else None
+
+        for hostname, ip in await asyncio.gather(*(resolve(name) for name in targets.hostnames)):
+            if ip is None:
+                unresolved.append(hostname)
+            else:
+                hosts.setdefault(ip, hostname)
+
+        for start, end in targets.ranges:
+            for value in range(start, end + 1):
+                ip = socket.inet_ntoa(value.to_bytes(4, 'big'))
+                hosts.setdefault(ip, ip)
+
+        return hosts, unresolved
+
     async def _scan_port(self, ip: str, port: int, timeout: float) -> bool:
+        state, _ = await self._probe_port(ip, port, timeout)
+        return state == 'open'
+
+    async def _scan_port_with_retries(self, ip: str, port: int, estimator: RttEstimator, max_retries: int) -> bool:
+        for attempt in range(max_retries + 1):
+            if attempt:
+                self._retransmissions += 1
+            state, rtt = await self._probe_port(ip, port, estimator.timeout_for(attempt))
+            if state != 'filtered':
+                if attempt == 0 and rtt is not None:
+                    estimator.observe(rtt)
+                return state == 'open'
+        return False
+
+    async def _probe_port(self, ip: str, port: int, timeout: float) -> Tuple[str, Optional[float]]:
+        started = time.monotonic()
         try:
             reader, writer = await asyncio.wait_for(
                 asyncio.open_connection(ip, port),
                 timeout=timeout
             )
-            writer.close()
+        except asyncio.TimeoutError:
+            return 'filtered', None
+        except ConnectionRefusedError:
+            return 'closed', time.monotonic() - started
+        except OSError:
+            return 'closed', None
+        rtt = time.monotonic() - started
+        writer.close()
+        try:
             await writer.wait_closed()
-            return True
-        except (asyncio.TimeoutError, ConnectionRefusedError, OSError):
-            return False
-
-    def _parse_port_range(self, ports: str) -> tuple[int, int]:
-        if isinstance(ports, int):
-            return ports, ports
-        
-        ports = str(ports).strip()
-        if '-' in ports:
-            parts = ports.split('-')
-            if len(parts) != 2:
-                raise ValueError("Invalid port range format")
-            start = self.sanitize_port(parts[0])
-            end = self.sanitize_port(parts[1])
-            if start > end:
-                raise ValueError("Start port must be less than end port")
-            if end - start > 10000:
-                raise ValueError("Port range too large (max 10000 ports)")
-            return start, end
-        else:
-            port = self.sanitize_port(ports)
-            return port, port
-
-    def _is_ip(self, value: str) -> bool:
-        import re
-        return bool(re.match(r'^(\d{1,3}\.){3}\d{1,3}$', value))
+        except OSError:
+            pass
+        return 'open', rtt
 
     def _get_service_name(self, port: int) -> str:
-        common_ports = {
-            21: 'ftp', 22: 'ssh', 23: 'telnet', 25: 'smtp',
-            53: 'dns', 80: 'http', 110: 'pop3', 143: 'imap',
-            443: 'https', 465: 'smtps', 587: 'smtp', 993: 'imaps',
-            995: 'pop3s', 3306: 'mysql', 5432: 'postgresql', 6379: 'redis',
-            8080: 'http-proxy', 8443: 'https-alt', 27017: 'mongodb'
-        }
-        return common_ports.get(port, 'unknown')
+        return COMMON_SERVICES.get(port, 'unknown')
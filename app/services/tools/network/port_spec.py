@@ -0,0 +1,130 @@
+from typing import Any, Callable, Iterator, Optional
+import re
+
+
+TOP_PORTS = (
+    80, 23, 443, 21, 22, 25, 3389, 110, 445, 139,
+    143, 53, 135, 3306, 8080, 1723, 111, 995, 993, 5900,
+    1025, 587, 8888, 199, 1720, 465, 548, 113, 81, 6001,
+    10000, 514, 5060, 179, 1026, 2000, 8443, 8000, 32768, 554,
+    26, 1433, 49152, 2001, 515, 8008, 49154, 1027, 5666, 646,
+    5000, 5631, 631, 49153, 8081, 2049, 88, 79, 5800, 106,
+    2121, 1110, 49155, 6000, 513, 990, 5357, 427, 49156, 543,
+    544, 5101, 144, 7, 389, 8009, 3128, 444, 9999, 5009,
+    7070, 5190, 3000, 5432, 1900, 3986, 13, 1029, 9, 5051,
+    6646, 49157, 1028, 873, 1755, 2717, 4899, 9100, 119, 37,
+)
+
+TOP_PATTERN = re.compile(r'^top-?(\d+)$', re.IGNORECASE)
+
+
+class PortSet:
+    SIZE = 65536
+
+    def __init__(self):
+        self._bits = bytearray(self.SIZE // 8)
+        self._count: Optional[int] = 0
+
+    def __len__(self) -> int:
+        if self._count is None:
+            self._count = int.from_bytes(self._bits, 'little').bit_count()
+        return self._count
+
+    def __contains__(self, port: int) -> bool:
+        return 0 <= port < self.SIZE and bool(self._bits[port >> 3] & (1 << (port & 7)))
+
+    def __iter__(self) -> Iterator[int]:
+        for index, byte in enumerate(self._bits):
+            if byte:
+                base = index << 3
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield base + bit
+
+    def add(self, port: int):
+        self.add_range(port, port)
+
+    def add_range(self, start: int, end: int):
+        self._set_range(start, end, True)
+
+    def discard_range(self, start: int, end: int):
+        self._set_range(start, end, False)
+
+    def min(self) -> Optional[int]:
+        return next(iter(self), None)
+
+    def max(self) -> Optional[int]:
+        for index in range(len(self._bits) - 1, -1, -1):
+            byte = self._bits[index]
+            if byte:
+                return (index << 3) + byte.bit_length() - 1
+        return None
+
+    def _set_range(self, start: int, end: int, value: bool):
+        self._count = None
+        first_full, last_full = (start + 7) >> 3, ((end + 1) >> 3) - 1
+        if first_full > last_full:
+            for port in range(start, end + 1):
+                self._set(port, value)
+            return
+        for port in range(start, first_full << 3):
+            self._set(port, value)
+        self._bits[first_full:last_full + 1] = (b'\xff' if value else b'\x00') * (last_full - first_full + 1)
+        for port in range((last_full + 1) << 3, end + 1):
+            self._set(port, value)
+
+    def _set(self, port: int, value: bool):
+        if value:
+            self._bits[port >> 3] |= 1 << (port & 7)
+        else:
+            self._bits[port >> 3] &= ~(1 << (port & 7)) & 0xff
+
+
+def parse_port_spec(spec: Any, sanitize_port: Callable[[Any], int]) -> PortSet:
+    if isinstance(spec, int):
+        tokens = [str(spec)]
+    elif isinstance(spec, (list, tuple)):
+        tokens = [str(token) for token in spec]
+    else:
+        tokens = str(spec).split(',')
+
+    ports = PortSet()
+    exclusions = []
+    for token in tokens:
+        token = token.strip()
+        if not token:
+            continue
+        if token.startswith('-') or token.startswith('!'):
+            exclusions.append(_parse_range(token[1:], sanitize_port))
+            continue
+        top_match = TOP_PATTERN.match(token)
+        if top_match:
+            count = int(top_match.group(1))
+            if count < 1 or count > len(TOP_PORTS):
+                raise ValueError(f"Top ports must be between 1 and {len(TOP_PORTS)}")
+            for port in TOP_PORTS[:count]:
+                ports.add(port)
+            continue
+        ports.add_range(*_parse_range(token, sanitize_port))
+
+    for start, end in exclusions:
+        ports.discard_range(start, end)
+
+    if not len(ports):
+        raise ValueError("Port specification selects no ports")
+    return ports
+
+
+def _parse_range(token: str, sanitize_port: Callable[[Any], int]) -> tuple[int, int]:
+    token = token.strip()
+    if '-' in token:
+        parts = token.split('-')
+        if len(parts) != 2:
+            raise ValueError("Invalid port range format")
+        start = sanitize_port(parts[0])
+        end = sanitize_port(parts[1])
+        if start > end:
+            raise ValueError("Start port must be less than end port")
+        return start, end
+    port = sanitize_port(token)
+    return port, port
@@ -0,0 +1,194 @@
+from collections import Counter
+from typing import Any, Dict, List, Optional
+import asyncio
+import itertools
+import math
+import time
+
+import dns.asyncresolver
+import dns.resolver
+
+from ..base import BaseToolRunner
+from .dns_lookup import resolve_records
+from .ratelimit import TokenBucket
+from .resolution import ResolutionCache, resolution_cache
+from .resolver_pool import ResolverPool, make_resolver
+from .targets import IPV4_PATTERN, TargetSet, is_address_spec, split_target_spec
+
+
+def reverse_name(address: str) -> str:
+    return '.'.join(reversed(address.split('.'))) + '.in-addr.arpa'
+
+
+class _Upstream:
+    def __init__(self, address: str, resolver: dns.asyncresolver.Resolver, bucket: TokenBucket):
+        self.address = address
+        self.resolver = resolver
+        self.bucket = bucket
+        self.counts: Counter = Counter()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'queries': self.counts['queries'],
+            'found': self.counts['ok'],
+            'nxdomain': self.counts['nxdomain'],
+            'errors': self.counts['timeout'] + self.counts['error'],
+            'throttled_seconds': round(self.bucket.waited, 3)
+        }
+
+
+class PTRSweepRunner(BaseToolRunner):
+    priority_class = 'bulk'
+    max_execution_time = 3600
+    DEFAULT_RATE_LIMIT = 200
+    MAX_RATE_LIMIT = 5000
+    DEFAULT_CONCURRENCY = 256
+    MAX_CONCURRENCY = 5000
+    DEFAULT_TIMEOUT = 2.0
+    MAX_TIMEOUT = 30.0
+    MAX_ADDRESSES = 262144
+    MAX_NAMESERVERS = 16
+
+    def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        entries = split_target_spec(parameters.get('targets') or [])
+        if not entries:
+            raise ValueError("At least one address block is required")
+
+        targets = TargetSet(self.MAX_ADDRESSES)
+        for entry in entries:
+            if not is_address_spec(entry):
+                raise ValueError(f"Invalid address specification: {entry}")
+            targets.add_address_spec(entry)
+
+        nameservers = split_target_spec(parameters.get('nameservers') or [])
+        if len(nameservers) > self.MAX_NAMESERVERS:
+            raise ValueError(f"At most {self.MAX_NAMESERVERS} nameservers can be used")
+        for nameserver in nameservers:
+            if not IPV4_PATTERN.match(nameserver):
+                raise ValueError(f"Invalid nameserver address: {nameserver}")
+            self.sanitize_ip(nameserver)
+
+        try:
+            rate_limit = float(parameters.get('rate_limit', self.DEFAULT_RATE_LIMIT))
+            concurrency = int(parameters.get('concurrency', self.DEFAULT_CONCURRENCY))
+            timeout = float(parameters.get('timeout', self.DEFAULT_TIMEOUT))
+        except (TypeError, ValueError):
+            raise ValueError("Rate limit, concurrency and timeout must be numbers")
+        if rate_limit <= 0 or rate_limit > self.MAX_RATE_LIMIT:
+            raise ValueError(f"Rate limit must be between 0 and {self.MAX_RATE_LIMIT} queries per second")
+        if concurrency < 1 or concurrency > self.MAX_CONCURRENCY:
+            raise ValueError(f"Concurrency must be between 1 and {self.MAX_CONCURRENCY}")
+        if timeout <= 0 or timeout > self.MAX_TIMEOUT:
+            raise ValueError(f"Timeout must be between 0 and {self.MAX_TIMEOUT:g} seconds")
+
+        return {
+            'targets': targets,
+            'specs': entries,
+            'nameservers': list(dict.fromkeys(nameservers)),
+            'rate_limit': rate_limit,
+            'concurrency': concurrency,
+            'timeout': timeout,
+            'use_cache': bool(parameters.get('use_cache', False))
+        }
+
+    async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        validated = self.validate_parameters(parameters)
+        targets = validated['targets']
+        timeout = validated['timeout']
+        cache = resolution_cache if validated['use_cache'] else None
+        total = len(targets)
+
+        upstreams = self._make_upstreams(validated['nameservers'], validated['rate_limit'])
+        if not upstreams:
+            raise ValueError("No DNS nameservers configured")
+
+        await self.update_progress(5, f"Resolving PTR records for {total} address(es) via {len(upstreams)} nameserver(s)")
+
+        addresses = iter(targets)
+        rotation = itertools.cycle(upstreams)
+        found: Dict[str, Any] = {}
+        counts: Counter = Counter()
+        start = time.monotonic()
+
+        async def worker():
+            for address in addresses:
+                if self.stop_requested:
+                    return
+                upstream = next(rotation)
+                status, name = await self._lookup(upstream, address, timeout, cache)
+                if status == 'stopped':
+                    return
+                counts['scanned'] += 1
+                counts[status] += 1
+                delta = None
+                if name is not None:
+                    found[address] = name
+                    delta = {'ptr': {address: name}}
+                self.report_progress(
+                    5 + int(counts['scanned'] / total * 90),
+                    f"Swept {counts['scanned']}/{total} addresses, found {len(found)} name(s)",
+                    delta
+                )
+
+        in_flight = math.ceil(validated['rate_limit'] * len(upstreams) * (timeout + 1))
+        workers = min(total, validated['concurrency'], in_flight)
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        elapsed = time.monotonic() - start
+
+        await self.update_progress(100, "PTR sweep stopped" if self.stop_requested else "PTR sweep complete")
+
+        queries = sum(upstream.counts['queries'] for upstream in upstreams)
+        result = {
+            'targets': validated['specs'],
+            'addresses_scanned': counts['scanned'],
+            'names_found': len(found),
+            'ptr': dict(sorted(found.items(), key=lambda item: tuple(int(part) for part in item[0].split('.')))),
+            'nxdomain': counts['nxdomain'],
+            'errors': counts['timeout'] + counts['error'],
+            'queries': queries,
+            'elapsed_seconds': round(elapsed, 3),
+            'queries_per_second': round(queries / elapsed, 1) if elapsed > 0 else float(queries),
+            'nameservers': {upstream.address: upstream.stats() for upstream in upstreams}
+        }
+        if self.stop_requested:
+            result['partial'] = True
+
+        return self.redact_sensitive_data(result)
+
+    def _make_resolver(self) -> dns.asyncresolver.Resolver:
+        return make_resolver()
+
+    def _make_upstreams(self, nameservers: List[str], rate_limit: float) -> List[_Upstream]:
+        try:
+            base = self._make_resolver()
+        except dns.resolver.NoResolverConfiguration:
+            if not nameservers:
+                raise ValueError("No DNS nameservers configured")
+            base = dns.asyncresolver.Resolver(configure=False)
+
+        if isinstance(base, ResolverPool) and not nameservers:
+            return [
+                _Upstream(upstream.label, upstream.resolver, TokenBucket(rate_limit))
+                for upstream in base.upstreams
+            ]
+
+        upstreams = []
+        for nameserver in nameservers or list(base.nameservers):
+            resolver = dns.asyncresolver.Resolver(configure=False)
+            resolver.nameservers = [nameserver]
+            resolver.port = base.port
+            address = getattr(nameserver, 'address', nameserver)
+            upstreams.append(_Upstream(str(address), resolver, TokenBucket(rate_limit)))
+        return upstreams
+
+    async def _lookup(self, upstream: _Upstream, address: str, timeout: float, cache: Optional[ResolutionCache]):
+        await upstream.bucket.acquire()
+        if self.stop_requested:
+            return 'stopped', None
+        status, records = await resolve_records(upstream.resolver, reverse_name(address), 'PTR', timeout, compact=True, cache=cache)
+        upstream.counts['queries'] += 1
+        upstream.counts[status] += 1
+        if status != 'ok' or not records:
+            return status, None
+        names = [record.rstrip('.') for record in records]
+        return status, names[0] if len(names) == 1 else sorted(names)
@@ -0,0 +1,203 @@
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import socket
+import time
+
+import dns.asyncresolver
+import dns.exception
+import dns.rdatatype
+import dns.resolver
+
+from app.core.config import settings
+from .resolver_pool import make_resolver
+from .targets import IPV4_PATTERN
+
+
+def _negative_ttl(response: Any, default: float) -> float:
+    for rrset in getattr(response, 'authority', None) or ():
+        if rrset.rdtype == dns.rdatatype.SOA and len(rrset):
+            return min(rrset.ttl, rrset[0].minimum)
+    return default
+
+
+async def query_records(
+    resolver: dns.asyncresolver.Resolver,
+    name: str,
+    record_type: str,
+    timeout: float,
+    negative_ttl: float = 0
+) -> Tuple[str, Any, float]:
+    try:
+        answer = await resolver.resolve(name, record_type, lifetime=timeout)
+    except dns.resolver.NXDOMAIN as e:
+        response = next(iter(e.responses().values()), None)
+        return 'nxdomain', None, _negative_ttl(response, negative_ttl)
+    except dns.resolver.NoAnswer as e:
+        return 'empty', (), _negative_ttl(e.response(), negative_ttl)
+    except dns.exception.Timeout:
+        return 'timeout', None, 0
+    except Exception as e:
+        return 'error', str(e), 0
+    return 'ok', tuple(answer), answer.rrset.ttl
+
+
+class _Entry:
+    __slots__ = ('status', 'value', 'expires_at')
+
+    def __init__(self, status: str, value: Any, expires_at: float):
+        self.status = status
+        self.value = value
+        self.expires_at = expires_at
+
+
+class ResolutionCache:
+    LOCAL_SUFFIXES = ('.localhost', '.local', '.localdomain')
+
+    def __init__(
+        self,
+        max_entries: int,
+        min_ttl: float = 0,
+        max_ttl: float = 86400,
+        negative_ttl: float = 300,
+        fallback_ttl: float = 60,
+        enabled: bool = True,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.max_entries = max_entries
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.fallback_ttl = fallback_ttl
+        self.enabled = enabled
+        self.clock = clock
+        self._entries: 'OrderedDict[Hashable, _Entry]' = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._resolver: Optional[dns.asyncresolver.Resolver] = None
+        self._counters = dict.fromkeys(
+            ('hits', 'negative_hits', 'misses', 'coalesced', 'expirations', 'evictions'), 0
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def query(
+        self,
+        name: str,
+        record_type: str,
+        timeout: float,
+        resolver: Optional[dns.asyncresolver.Resolver] = None
+    ) -> Tuple[str, Any]:
+        resolver = resolver or self._default_resolver()
+        if resolver is None:
+            return 'error', "No DNS resolver configured"
+        key = (name.lower().rstrip('.'), record_type.upper(), tuple(resolver.nameservers), resolver.port)
+        return await self._cached(key, lambda: self._fetch_records(resolver, name, record_type, timeout))
+
+    async def resolve_host(self, hostname: str, timeout: float = 5.0) -> List[str]:
+        if IPV4_PATTERN.match(hostname):
+            return [hostname]
+
+        name = hostname.lower().rstrip('.')
+        if '.' in name and not name.endswith(self.LOCAL_SUFFIXES):
+            status, value = await self.query(name, 'A', timeout)
+            if status == 'ok':
+                return [rdata.address for rdata in value]
+            if status == 'nxdomain':
+                return []
+
+        status, value = await self._cached((name, 'getaddrinfo'), lambda: self._fetch_addrinfo(name))
+        return list(value) if status == 'ok' else []
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._counters['hits'] + self._counters['misses'] + self._counters['coalesced']
+        return {
+            'enabled': self.enabled,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'in_flight': len(self._inflight),
+            **self._counters,
+            'hit_ratio': round((self._counters['hits'] + self._counters['coalesced']) / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        self._entries.clear()
+        for key in self._counters:
+            self._counters[key] = 0
+
+    async def _cached(self, key: Hashable, fetch: Callable) -> Tuple[str, Any]:
+        if not self.enabled:
+            status, value, _ = await fetch()
+            return status, value
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.expires_at > self.clock():
+                self._entries.move_to_end(key)
+                self._counters['hits'] += 1
+                if entry.status != 'ok':
+                    self._counters['negative_hits'] += 1
+                return entry.status, entry.value
+            del self._entries[key]
+            self._counters['expirations'] += 1
+
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self._counters['coalesced'] += 1
+        else:
+            self._counters['misses'] += 1
+            task = asyncio.ensure_future(self._fetch_and_store(key, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key, None) if self._inflight.get(key) is done else None)
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(self, key: Hashable, fetch: Callable) -> Tuple[str, Any]:
+        status, value, ttl = await fetch()
+        ttl = min(self.max_ttl, max(self.min_ttl, ttl))
+        if ttl > 0 and status in ('ok', 'empty', 'nxdomain') and self.max_entries > 0:
+            self._entries[key] = _Entry(status, value, self.clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters['evictions'] += 1
+        return status, value
+
+    async def _fetch_records(
+        self,
+        resolver: dns.asyncresolver.Resolver,
+        name: str,
+        record_type: str,
+        timeout: float
+    ) -> Tuple[str, Any, float]:
+        return await query_records(resolver, name, record_type, timeout, self.negative_ttl)
+
+    async def _fetch_addrinfo(self, hostname: str) -> Tuple[str, Any, float]:
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(hostname, None, family=socket.AF_INET, type=socket.SOCK_STREAM)
+        except socket.gaierror:
+            return 'nxdomain', None, self.fallback_ttl
+        addresses = tuple(dict.fromkeys(info[4][0] for info in infos))
+        return 'ok', addresses, self.fallback_ttl
+
+    def _default_resolver(self) -> Optional[dns.asyncresolver.Resolver]:
+        if self._resolver is None:
+            try:
+                self._resolver = make_resolver()
+            except dns.resolver.NoResolverConfiguration:
+                return None
+        return self._resolver
+
+
+resolution_cache = ResolutionCache(
+    settings.DNS_CACHE_MAX_ENTRIES,
+    min_ttl=settings.DNS_CACHE_MIN_TTL,
+    max_ttl=settings.DNS_CACHE_MAX_TTL,
+    negative_ttl=settings.DNS_CACHE_NEGATIVE_TTL,
+    fallback_ttl=settings.DNS_CACHE_FALLBACK_TTL,
+    enabled=settings.DNS_CACHE_ENABLED
+)
+
+
+async def resolve_host(hostname: str, timeout: float = 5.0) -> List[str]:
+    return await resolution_cache.resolve_host(hostname, timeout)
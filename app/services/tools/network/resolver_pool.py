@@ -0,0 +1,240 @@
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+import asyncio
+import ipaddress
+import time
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+
+from app.core.config import settings
+
+
+DEFINITIVE_ERRORS = (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.YXDOMAIN)
+
+
+def parse_upstream(spec: str) -> Tuple[str, int]:
+    spec = spec.strip()
+    address, port = spec, 53
+    if spec.startswith('['):
+        address, _, rest = spec[1:].partition(']')
+        if rest:
+            port = rest.lstrip(':')
+    elif spec.count(':') == 1:
+        address, port = spec.split(':')
+    try:
+        address = str(ipaddress.ip_address(address))
+        port = int(port)
+    except ValueError:
+        raise ValueError(f"Invalid DNS upstream: {spec}")
+    if not 1 <= port <= 65535:
+        raise ValueError(f"Invalid DNS upstream port: {spec}")
+    return address, port
+
+
+class Upstream:
+    def __init__(self, address: str, port: int = 53, window: int = 64):
+        self.address = address
+        self.port = port
+        self.resolver = dns.asyncresolver.Resolver(configure=False)
+        self.resolver.nameservers = [address]
+        self.resolver.port = port
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.samples: Deque[float] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.counters: Counter = Counter()
+
+    @property
+    def label(self) -> str:
+        host = f"[{self.address}]" if ':' in self.address else self.address
+        return f"{host}:{self.port}"
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ResolverPool:
+    ALPHA = 0.2
+    MIN_HEDGE_SAMPLES = 5
+
+    def __init__(
+        self,
+        upstreams: List[str],
+        hedge_percentile: float = 0.95,
+        hedge_min_delay: float = 0.02,
+        hedge_initial_delay: float = 0.25,
+        eject_after: int = 3,
+        eject_seconds: float = 30.0,
+        lifetime: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if not upstreams:
+            raise ValueError("A resolver pool needs at least one upstream")
+        self.upstreams = [Upstream(*parse_upstream(spec)) for spec in upstreams]
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_initial_delay = hedge_initial_delay
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.lifetime = lifetime
+        self.clock = clock
+        self.nameservers = [upstream.label for upstream in self.upstreams]
+        self.port = 53
+        self._detached: Set[asyncio.Task] = set()
+
+    def ranked(self) -> List[Upstream]:
+        now = self.clock()
+        available = [upstream for upstream in self.upstreams if upstream.ejected_until <= now]
+        ejected = sorted(
+            (upstream for upstream in self.upstreams if upstream.ejected_until > now),
+            key=lambda upstream: upstream.ejected_until
+        )
+        return sorted(available, key=self._score) + ejected
+
+    def hedge_delay(self, upstream: Upstream) -> float:
+        if len(upstream.samples) < self.MIN_HEDGE_SAMPLES:
+            return self.hedge_initial_delay
+        return max(self.hedge_min_delay, upstream.percentile(self.hedge_percentile))
+
+    async def resolve(self, qname: Any, rdtype: Any = 'A', lifetime: Optional[float] = None, **kwargs) -> dns.resolver.Answer:
+        lifetime = self.lifetime if lifetime is None else lifetime
+        deadline = self.clock() + lifetime
+        candidates = self.ranked()
+        pending: Dict[asyncio.Task, Upstream] = {}
+        error: Optional[Exception] = None
+        hedge: Optional[Upstream] = None
+
+        def launch(upstream: Upstream):
+            upstream.counters['queries'] += 1
+            task = asyncio.ensure_future(self._attempt(upstream, qname, rdtype, deadline - self.clock(), kwargs))
+            pending[task] = upstream
+
+        try:
+            while True:
+                remaining = deadline - self.clock()
+                if not pending:
+                    if not candidates or remaining <= 0:
+                        raise error or dns.exception.Timeout(timeout=lifetime)
+                    launch(candidates.pop(0))
+
+                wait = remaining
+                if candidates and hedge is None:
+                    wait = min(wait, self.hedge_delay(next(iter(pending.values()))))
+                done, _ = await asyncio.wait(pending, timeout=max(wait, 0), return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    if self.clock() >= deadline:
+                        for task, upstream in pending.items():
+                            task.cancel()
+                            self._record(upstream, None)
+                        pending.clear()
+                        raise error or dns.exception.Timeout(timeout=lifetime)
+                    if candidates and hedge is None:
+                        hedge = candidates.pop(0)
+                        hedge.counters['hedged'] += 1
+                        launch(hedge)
+                    continue
+
+                for task in done:
+                    upstream = pending.pop(task)
+                    outcome, value = task.result()
+                    if outcome == 'failed':
+                        error = error or value
+                        continue
+                    if upstream is hedge:
+                        upstream.counters['hedge_wins'] += 1
+                    if outcome == 'answer':
+                        return value
+                    raise value
+        except asyncio.CancelledError:
+            for task in pending:
+                task.cancel()
+            raise
+        finally:
+            for task in pending:
+                if not task.done():
+                    self._detached.add(task)
+                    task.add_done_callback(self._detached.discard)
+
+    def stats(self) -> List[Dict[str, Any]]:
+        now = self.clock()
+        return [
+            {
+                'upstream': upstream.label,
+                'latency_ms': round(upstream.latency * 1000, 3) if upstream.latency is not None else None,
+                'p50_ms': self._ms(upstream.percentile(0.5)),
+                'p95_ms': self._ms(upstream.percentile(0.95)),
+                'error_rate': round(upstream.error_rate, 4),
+                'ejected': upstream.ejected_until > now,
+                'ejected_for_seconds': round(max(0.0, upstream.ejected_until - now), 3),
+                'queries': upstream.counters['queries'],
+                'failures': upstream.counters['failures'],
+                'hedged': upstream.counters['hedged'],
+                'hedge_wins': upstream.counters['hedge_wins'],
+                'ejections': upstream.counters['ejections'],
+            }
+            for upstream in self.upstreams
+        ]
+
+    async def _attempt(self, upstream: Upstream, qname: Any, rdtype: Any, lifetime: float, kwargs: Dict[str, Any]) -> Tuple[str, Any]:
+        started = self.clock()
+        try:
+            answer = await upstream.resolver.resolve(qname, rdtype, lifetime=max(lifetime, 0.001), **kwargs)
+        except DEFINITIVE_ERRORS as e:
+            self._record(upstream, self.clock() - started)
+            return 'definitive', e
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._record(upstream, None)
+            return 'failed', e
+        self._record(upstream, self.clock() - started)
+        return 'answer', answer
+
+    def _record(self, upstream: Upstream, latency: Optional[float]):
+        failed = latency is None
+        upstream.error_rate = (1 - self.ALPHA) * upstream.error_rate + self.ALPHA * failed
+        if not failed:
+            upstream.samples.append(latency)
+            upstream.latency = latency if upstream.latency is None else (1 - self.ALPHA) * upstream.latency + self.ALPHA * latency
+            upstream.consecutive_failures = 0
+            return
+
+        upstream.counters['failures'] += 1
+        upstream.consecutive_failures += 1
+        if upstream.consecutive_failures >= self.eject_after:
+            upstream.ejected_until = self.clock() + self.eject_seconds
+            upstream.counters['ejections'] += 1
+            upstream.consecutive_failures = self.eject_after - 1
+
+    def _score(self, upstream: Upstream) -> float:
+        return (upstream.latency or 0.0) + upstream.error_rate * self.lifetime
+
+    def _ms(self, value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 3) if value is not None else None
+
+
+_pool: Optional[ResolverPool] = None
+
+
+def get_resolver_pool() -> Optional[ResolverPool]:
+    global _pool
+    if _pool is None and settings.DNS_UPSTREAMS:
+        _pool = ResolverPool(
+            settings.DNS_UPSTREAMS,
+            hedge_percentile=settings.DNS_UPSTREAM_HEDGE_PERCENTILE,
+            hedge_min_delay=settings.DNS_UPSTREAM_HEDGE_MIN_DELAY_MS / 1000,
+            eject_after=settings.DNS_UPSTREAM_EJECT_AFTER,
+            eject_seconds=settings.DNS_UPSTREAM_EJECT_SECONDS
+        )
+    return _pool
+
+
+def make_resolver() -> Union[dns.asyncresolver.Resolver, ResolverPool]:
+    return get_resolver_pool() or dns.asyncresolver.Resolver()
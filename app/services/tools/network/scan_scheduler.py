@@ -0,0 +1,68 @@
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Sequence, Tuple
+import asyncio
+
+
+class _HostState:
+    __slots__ = ('host', 'ports', 'in_flight', 'exhausted', 'queued')
+
+    def __init__(self, host: str, ports: Iterable[int]):
+        self.host = host
+        self.ports = iter(ports)
+        self.in_flight = 0
+        self.exhausted = False
+        self.queued = True
+
+
+class ProbeScheduler:
+    def __init__(
+        self,
+        probe: Callable[[str, int], Awaitable[Any]],
+        hosts: Sequence[str],
+        ports: Iterable[int],
+        concurrency: int,
+        per_host_concurrency: int
+    ):
+        self.probe = probe
+        self.hosts = hosts
+        self.ports = ports
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+
+    async def run(self) -> AsyncIterator[Tuple[str, int, Any]]:
+        ready = deque(_HostState(host, self.ports) for host in self.hosts)
+        in_flight: Dict[asyncio.Future, Tuple[_HostState, int]] = {}
+
+        def fill():
+            while len(in_flight) < self.concurrency and ready:
+                state = ready.popleft()
+                port = next(state.ports, None)
+                if port is None:
+                    state.exhausted = True
+                    state.queued = False
+                    continue
+                state.in_flight += 1
+                in_flight[asyncio.ensure_future(self.probe(state.host, port))] = (state, port)
+                if state.in_flight < self.per_host_concurrency:
+                    ready.append(state)
+                else:
+                    state.queued = False
+
+        fill()
+        try:
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                completed = []
+                for task in done:
+                    state, port = in_flight.pop(task)
+                    state.in_flight -= 1
+                    if not state.queued and not state.exhausted:
+                        state.queued = True
+                        ready.append(state)
+                    completed.append((state.host, port, task.result()))
+                fill()
+                for host, port, outcome in completed:
+                    yield host, port, outcome
+        finally:
+            for task in in_flight:
+                task.cancel()
@@ -0,0 +1,130 @@
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import re
+import ssl
+
+
+SIGNATURES: Tuple[Tuple[str, str], ...] = (
+    ('ssh', r'\ASSH-[\d.]+-(?P<version>[^\r\n]+)'),
+    ('http', r'\AHTTP/[\d.]+ \d{3}[^\r\n]*\r?\n(?:[^\r\n]+\r?\n)*?Server: *(?P<version>[^\r\n]+)'),
+    ('http', r'\AHTTP/[\d.]+ \d{3}'),
+    ('ftp', r'\A220[- ][^\r\n]*?(?P<version>(?:vsFTPd|ProFTPD|FileZilla Server|Pure-FTPd|Microsoft FTP Service)[^\r\n)]*)'),
+    ('smtp', r'\A220[- ][^\r\n]*?\bE?SMTP\b *(?P<version>[^\r\n]*)'),
+    ('ftp', r'\A220[- ][^\r\n]*\bFTP\b'),
+    ('pop3', r'\A\+OK *(?P<version>[^\r\n]*)'),
+    ('imap', r'\A\* OK(?: \[[^\]\r\n]*\])? *(?P<version>[^\r\n]*)'),
+    ('mysql', r'\A[\s\S]{4}\n(?P<version>\d[\w.\-]*)\x00'),
+    ('redis', r'\A-ERR (?:unknown command|wrong number of arguments)'),
+    ('vnc', r'\ARFB (?P<version>\d{3}\.\d{3})'),
+    ('telnet', r'\A\xff[\xfb-\xfe]'),
+    ('amqp', r'\AAMQP'),
+)
+
+
+def compile_signatures(signatures: Tuple[Tuple[str, str], ...]) -> Tuple['re.Pattern', Tuple[str, ...]]:
+    alternatives = []
+    for index, (_, pattern) in enumerate(signatures):
+        pattern = pattern.replace('(?P<version>', f'(?P<v{index}>')
+        alternatives.append(f'(?P<s{index}>{pattern})')
+    return re.compile('|'.join(alternatives), re.MULTILINE), tuple(name for name, _ in signatures)
+
+
+SIGNATURE_MATCHER, SIGNATURE_SERVICES = compile_signatures(SIGNATURES)
+
+
+def match_banner(banner: bytes) -> Optional[Dict[str, Optional[str]]]:
+    match = SIGNATURE_MATCHER.search(banner.decode('latin-1'))
+    if not match:
+        return None
+    index = int(match.lastgroup[1:])
+    version = match.groupdict().get(f'v{index}')
+    return {
+        'service': SIGNATURE_SERVICES[index],
+        'version': (version.strip() or None) if version else None,
+    }
+
+
+class ServiceDetector:
+    HTTP_PROBE = b'HEAD / HTTP/1.0\r\n\r\n'
+    SMTP_PROBE = b'EHLO scanner.local\r\n'
+    READ_SIZE = 4096
+
+    def __init__(self, timeout: float, send_probes: bool = True):
+        self.timeout = timeout
+        self.send_probes = send_probes
+        self._tls_context = ssl.create_default_context()
+        self._tls_context.check_hostname = False
+        self._tls_context.verify_mode = ssl.CERT_NONE
+
+    async def detect(self, ip: str, port: int) -> Optional[Dict[str, Any]]:
+        banner = await self._exchange(ip, port, None)
+        if banner is None:
+            return None
+
+        if not banner and self.send_probes:
+            banner = await self._exchange(ip, port, self.HTTP_PROBE) or b''
+
+        detected = match_banner(banner) if banner else None
+        if detected and detected['service'] == 'smtp' and self.send_probes:
+            extended = await self._exchange(ip, port, self.SMTP_PROBE, wait_for_banner=True)
+            if extended:
+                banner = banner + extended
+
+        if detected is None and self.send_probes and (not banner or banner.startswith(b'\x15\x03')):
+            tls_banner = await self._exchange(ip, port, self.HTTP_PROBE, use_tls=True)
+            if tls_banner is not None:
+                inner = match_banner(tls_banner) if tls_banner else None
+                service = 'https' if inner and inner['service'] == 'http' else f"ssl/{inner['service'] if inner else 'unknown'}"
+                detected = {'service': service, 'version': inner['version'] if inner else None}
+                banner = tls_banner or banner
+
+        if detected is None and not banner:
+            return None
+
+        result = dict(detected or {'service': None, 'version': None})
+        result['banner'] = self._printable(banner)
+        return result
+
+    async def _exchange(
+        self,
+        ip: str,
+        port: int,
+        probe: Optional[bytes],
+        wait_for_banner: bool = False,
+        use_tls: bool = False
+    ) -> Optional[bytes]:
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(ip, port, ssl=self._tls_context if use_tls else None),
+                timeout=self.timeout
+            )
+        except (asyncio.TimeoutError, OSError, ssl.SSLError):
+            return None
+
+        try:
+            if probe is None or wait_for_banner:
+                data = await self._read(reader)
+                if probe is None:
+                    return data
+            writer.write(probe)
+            await writer.drain()
+            return await self._read(reader)
+        except (OSError, ssl.SSLError):
+            return b''
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+    async def _read(self, reader: asyncio.StreamReader) -> bytes:
+        try:
+            return await asyncio.wait_for(reader.read(self.READ_SIZE), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return b''
+
+    def _printable(self, banner: bytes) -> str:
+        text = banner.decode('utf-8', errors='replace')
+        first_line = text.strip().splitlines()[0] if text.strip() else ''
+        return ''.join(char if char.isprintable() else '.' for char in first_line)[:256]
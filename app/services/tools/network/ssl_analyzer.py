@@ -1,25 +1,57 @@
 from typing import Dict, Any
+import asyncio
 import ssl
-import socket
-from datetime import datetime
-from OpenSSL import crypto
+import time
+from app.services.certificate_cache import certificate_cache
 from ..base import BaseToolRunner
+from .resolution import resolve_host
+from .tls import (
+    TLSHandshakeTimeout,
+    certificate_status,
+    certificate_summary,
+    client_context,
+    enumerate_tls,
+    tls_handshake,
+)
 
 
 class SSLAnalyzerRunner(BaseToolRunner):
+    priority_class = 'interactive'
+    DEFAULT_CONNECT_TIMEOUT = 5.0
+    DEFAULT_HANDSHAKE_TIMEOUT = 10.0
+    MAX_TIMEOUT = 60.0
+    DEFAULT_MAX_CONNECTIONS = 8
+    MAX_CONNECTIONS = 32
+
     def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         hostname = parameters.get('hostname')
         if not hostname:
             raise ValueError("Hostname is required")
-        
+
         hostname = self.sanitize_hostname(hostname)
-        
+
         port = parameters.get('port', 443)
         port = self.sanitize_port(port)
-        
+
+        try:
+            connect_timeout = float(parameters.get('connect_timeout', self.DEFAULT_CONNECT_TIMEOUT))
+            handshake_timeout = float(parameters.get('handshake_timeout', self.DEFAULT_HANDSHAKE_TIMEOUT))
+            max_connections = int(parameters.get('max_connections', self.DEFAULT_MAX_CONNECTIONS))
+        except (TypeError, ValueError):
+            raise ValueError("Timeouts and max_connections must be numbers")
+        if not 0 < connect_timeout <= self.MAX_TIMEOUT or not 0 < handshake_timeout <= self.MAX_TIMEOUT:
+            raise ValueError(f"Timeouts must be between 0 and {self.MAX_TIMEOUT:g} seconds")
+        if max_connections < 1 or max_connections > self.MAX_CONNECTIONS:
+            raise ValueError(f"max_connections must be between 1 and {self.MAX_CONNECTIONS}")
+
         return {
             'hostname': hostname,
-            'port': port
+            'port': port,
+            'connect_timeout': connect_timeout,
+            'handshake_timeout': handshake_timeout,
+            'enumerate_ciphers': bool(parameters.get('enumerate_ciphers', False)),
+            'include_certificates': bool(parameters.get('include_certificates', not certificate_cache.persist)),
+            'max_connections': max_connections
         }
 
     async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
@@ -30,50 +62,76 @@ class SSLAnalyzerRunner(BaseToolRunner):
         await self.update_progress(10, f"Connecting to {hostname}:{port}")
 
         try:
-            context = ssl.create_default_context()
-            
-            with socket.create_connection((hostname, port), timeout=10) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    await self.update_progress(30, "Retrieving certificate")
-                    
-                    cert_bin = ssock.getpeercert(binary_form=True)
-                    cert_dict = ssock.getpeercert()
-                    
-                    x509 = crypto.load_certificate(crypto.FILETYPE_ASN1, cert_bin)
-                    
-                    await self.update_progress(60, "Analyzing certificate")
-                    
-                    result = {
-                        'hostname': hostname,
-                        'port': port,
-                        'version': ssock.version(),
-                        'cipher': ssock.cipher(),
-                        'certificate': {
-                            'subject': dict(x[0] for x in cert_dict.get('subject', ())),
-                            'issuer': dict(x[0] for x in cert_dict.get('issuer', ())),
-                            'version': cert_dict.get('version'),
-                            'serial_number': x509.get_serial_number(),
-                            'not_before': datetime.strptime(cert_dict['notBefore'], '%b %d %H:%M:%S %Y %Z').isoformat(),
-                            'not_after': datetime.strptime(cert_dict['notAfter'], '%b %d %H:%M:%S %Y %Z').isoformat(),
-                            'signature_algorithm': x509.get_signature_algorithm().decode(),
-                            'san': cert_dict.get('subjectAltName', []),
-                            'expired': x509.has_expired(),
-                        }
-                    }
-                    
-                    not_after = datetime.strptime(cert_dict['notAfter'], '%b %d %H:%M:%S %Y %Z')
-                    days_until_expiry = (not_after - datetime.now()).days
-                    result['certificate']['days_until_expiry'] = days_until_expiry
-                    
-                    await self.update_progress(100, "SSL analysis complete")
-                    
-                    return self.redact_sensitive_data(result)
-
-        except socket.gaierror:
-            raise ValueError(f"Could not resolve hostname: {hostname}")
-        except socket.timeout:
+            addresses = await resolve_host(hostname)
+            if not addresses:
+                raise ValueError(f"Could not resolve host: {hostname}")
+
+            verification_error = None
+            try:
+                session = await self._handshake(addresses[0], hostname, validated, verify=True)
+            except ssl.SSLCertVerificationError as e:
+                verification_error = e.verify_message or str(e)
+                await self.update_progress(30, "Certificate not trusted, retrying without verification")
+                session = await self._handshake(addresses[0], hostname, validated, verify=False)
+
+            await self.update_progress(60, "Analyzing certificate")
+
+            chain = [certificate_cache.parse(der) for der in session['chain']]
+            if not chain:
+                raise ValueError("Server did not present a certificate")
+            await certificate_cache.flush()
+
+            result = {
+                'hostname': hostname,
+                'port': port,
+                'ip': addresses[0],
+                'version': session['version'],
+                'cipher': session['cipher'],
+                'verified': verification_error is None,
+                'certificate': self._reference(chain[0]),
+                'chain': [self._reference(details) for details in chain[1:]]
+            }
+            if validated['include_certificates']:
+                result['certificate_details'] = {details['fingerprint_sha256']: details for details in chain}
+            if verification_error:
+                result['verification_error'] = verification_error
+
+            if validated['enumerate_ciphers']:
+                await self.update_progress(70, "Enumerating protocol versions and cipher suites")
+                start = time.monotonic()
+                enumeration = await enumerate_tls(
+                    addresses[0], port, hostname, validated['max_connections'],
+                    validated['connect_timeout'], validated['handshake_timeout']
+                )
+                result['protocols'] = enumeration['protocols']
+                result['enumeration'] = {
+                    'handshakes': enumeration['handshakes'],
+                    'elapsed_seconds': round(time.monotonic() - start, 3)
+                }
+
+            await self.update_progress(100, "SSL analysis complete")
+
+            return self.redact_sensitive_data(result)
+
+        except TLSHandshakeTimeout as e:
+            raise ValueError(str(e))
+        except asyncio.TimeoutError:
             raise ValueError(f"Connection timeout to {hostname}:{port}")
         except ssl.SSLError as e:
             raise ValueError(f"SSL error: {str(e)}")
         except Exception as e:
             raise ValueError(f"SSL analysis failed: {str(e)}")
+
+    def _reference(self, details: Dict[str, Any]) -> Dict[str, Any]:
+        status = certificate_status(details)
+        return {
+            'fingerprint_sha256': status['fingerprint_sha256'],
+            **certificate_summary(details),
+            **{key: status[key] for key in ('expired', 'not_yet_valid', 'days_until_expiry')}
+        }
+
+    async def _handshake(self, address: str, hostname: str, validated: Dict[str, Any], verify: bool) -> Dict[str, Any]:
+        return await tls_handshake(
+            address, validated['port'], hostname, client_context(verify),
+            validated['connect_timeout'], validated['handshake_timeout']
+        )
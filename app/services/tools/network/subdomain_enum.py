@@ -0,0 +1,243 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import asyncio
+import re
+import secrets
+import time
+
+import dns.asyncresolver
+
+from app.services.uploads import iter_upload_lines, upload_path
+from ..base import BaseToolRunner
+from .dns_lookup import resolve_records
+from .resolution import ResolutionCache, resolution_cache
+from .resolver_pool import make_resolver
+from .targets import split_target_spec
+
+
+COMMON_SUBDOMAINS = (
+    'www', 'mail', 'ftp', 'localhost', 'webmail', 'smtp', 'pop', 'ns1', 'webdisk', 'ns2',
+    'cpanel', 'whm', 'autodiscover', 'autoconfig', 'm', 'imap', 'test', 'ns', 'blog', 'pop3',
+    'dev', 'www2', 'admin', 'forum', 'news', 'vpn', 'ns3', 'mail2', 'new', 'mysql',
+    'old', 'lists', 'support', 'mobile', 'mx', 'static', 'docs', 'beta', 'shop', 'sql',
+    'secure', 'demo', 'cp', 'calendar', 'wiki', 'web', 'media', 'email', 'images', 'img',
+    'www1', 'intranet', 'portal', 'video', 'sip', 'dns2', 'api', 'cdn', 'stats', 'dns1',
+    'ns4', 'www3', 'dns', 'search', 'staging', 'server', 'mx1', 'chat', 'wap', 'my',
+    'svn', 'mail1', 'sites', 'proxy', 'ads', 'host', 'crm', 'cms', 'backup', 'mx2',
+    'lyncdiscover', 'info', 'apps', 'download', 'remote', 'db', 'forums', 'store', 'relay', 'files',
+    'newsletter', 'app', 'live', 'owa', 'en', 'start', 'sms', 'office', 'exchange', 'ipv4',
+    'git', 'gitlab', 'jenkins', 'jira', 'grafana', 'status', 'auth', 'sso', 'login', 'internal',
+)
+
+LABEL_PATTERN = re.compile(r'^[a-z0-9_](?:[a-z0-9_-]{0,61}[a-z0-9_])?(?:\.[a-z0-9_](?:[a-z0-9_-]{0,61}[a-z0-9_])?)*$')
+
+
+class SubdomainEnumRunner(BaseToolRunner):
+    priority_class = 'bulk'
+    max_execution_time = 3600
+    VALID_TYPES = ('A', 'AAAA', 'CNAME')
+    DEFAULT_CONCURRENCY = 500
+    MAX_CONCURRENCY = 5000
+    DEFAULT_TIMEOUT = 2.0
+    MAX_TIMEOUT = 30.0
+    MAX_WORDS = 1000000
+    WILDCARD_PROBES = 3
+
+    def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        domain = parameters.get('domain')
+        if not domain:
+            raise ValueError("Domain is required")
+        domain = self.sanitize_hostname(domain).lower().rstrip('.')
+
+        words = parameters.get('words')
+        upload_id = parameters.get('upload_id')
+        if words:
+            words = split_target_spec(words)
+            if len(words) > self.MAX_WORDS:
+                raise ValueError(f"At most {self.MAX_WORDS} words can be tested per execution")
+        if upload_id:
+            upload_path(upload_id)
+
+        record_types = parameters.get('record_types', ['A'])
+        if isinstance(record_types, str):
+            record_types = record_types.split(',')
+        record_types = list(dict.fromkeys(rt.strip().upper() for rt in record_types if rt.strip().upper() in self.VALID_TYPES))
+        if not record_types:
+            raise ValueError(f"Record types must be chosen from: {', '.join(self.VALID_TYPES)}")
+
+        try:
+            concurrency = int(parameters.get('concurrency', self.DEFAULT_CONCURRENCY))
+            timeout = float(parameters.get('timeout', self.DEFAULT_TIMEOUT))
+        except (TypeError, ValueError):
+            raise ValueError("Concurrency and timeout must be numbers")
+        if concurrency < 1 or concurrency > self.MAX_CONCURRENCY:
+            raise ValueError(f"Concurrency must be between 1 and {self.MAX_CONCURRENCY}")
+        if timeout <= 0 or timeout > self.MAX_TIMEOUT:
+            raise ValueError(f"Timeout must be between 0 and {self.MAX_TIMEOUT:g} seconds")
+
+        return {
+            'domain': domain,
+            'words': words or None,
+            'upload_id': upload_id,
+            'record_types': record_types,
+            'concurrency': concurrency,
+            'timeout': timeout,
+            'detect_wildcard': bool(parameters.get('detect_wildcard', True)),
+            'use_cache': bool(parameters.get('use_cache', False))
+        }
+
+    async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        validated = self.validate_parameters(parameters)
+        domain = validated['domain']
+        record_types = validated['record_types']
+        timeout = validated['timeout']
+        cache = resolution_cache if validated['use_cache'] else None
+
+        total = self._count_words(validated)
+        resolver = self._make_resolver()
+
+        wildcard: Dict[str, Set[str]] = {}
+        if validated['detect_wildcard']:
+            await self.update_progress(2, f"Checking {domain} for wildcard DNS")
+            wildcard = await self._detect_wildcard(resolver, domain, record_types, timeout)
+
+        await self.update_progress(5, f"Testing {total} candidate(s) under {domain}")
+
+        candidates = self._candidates(validated)
+        found: List[Dict[str, Any]] = []
+        counts = {'tested': 0, 'wildcard': 0, 'errors': 0, 'queries': 0}
+        start = time.monotonic()
+
+        async def worker():
+            for candidate in candidates:
+                if self.stop_requested:
+                    return
+                records, status, sent = await self._resolve_candidate(resolver, candidate, record_types, timeout, cache)
+                counts['tested'] += 1
+                counts['queries'] += sent
+                delta = None
+                if status in ('timeout', 'error'):
+                    counts['errors'] += 1
+                elif records and self._is_wildcard(records, wildcard):
+                    counts['wildcard'] += 1
+                elif records:
+                    entry = {'subdomain': candidate, 'records': records}
+                    found.append(entry)
+                    delta = {'subdomains': [entry]}
+                self.report_progress(
+                    5 + int(counts['tested'] / total * 90),
+                    f"Tested {counts['tested']}/{total}, found {len(found)}",
+                    delta
+                )
+
+        workers = min(total, max(1, validated['concurrency']))
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        elapsed = time.monotonic() - start
+
+        await self.update_progress(100, "Enumeration stopped" if self.stop_requested else "Enumeration complete")
+
+        result = {
+            'domain': domain,
+            'record_types': record_types,
+            'wildcard': {
+                'detected': bool(wildcard),
+                'answers': {record_type: sorted(answers) for record_type, answers in wildcard.items()},
+                'filtered': counts['wildcard']
+            },
+            'candidates_tested': counts['tested'],
+            'subdomains_found': len(found),
+            'subdomains': sorted(found, key=lambda entry: entry['subdomain']),
+            'errors': counts['errors'],
+            'queries': counts['queries'],
+            'elapsed_seconds': round(elapsed, 3),
+            'queries_per_second': round(counts['queries'] / elapsed, 1) if elapsed > 0 else float(counts['queries'])
+        }
+        if self.stop_requested:
+            result['partial'] = True
+
+        return self.redact_sensitive_data(result)
+
+    def _make_resolver(self) -> dns.asyncresolver.Resolver:
+        return make_resolver()
+
+    async def _detect_wildcard(
+        self,
+        resolver: dns.asyncresolver.Resolver,
+        domain: str,
+        record_types: List[str],
+        timeout: float
+    ) -> Dict[str, Set[str]]:
+        probes = [f"{secrets.token_hex(8)}.{domain}" for _ in range(self.WILDCARD_PROBES)]
+        answers = await asyncio.gather(*(
+            resolve_records(resolver, probe, record_type, timeout, compact=True)
+            for probe in probes for record_type in record_types
+        ))
+        wildcard: Dict[str, Set[str]] = {}
+        for index, (status, records) in enumerate(answers):
+            if status == 'ok' and records:
+                wildcard.setdefault(record_types[index % len(record_types)], set()).update(records)
+        return wildcard
+
+    def _is_wildcard(self, records: Dict[str, List[str]], wildcard: Dict[str, Set[str]]) -> bool:
+        if not wildcard:
+            return False
+        return all(set(values) <= wildcard.get(record_type, set()) for record_type, values in records.items())
+
+    async def _resolve_candidate(
+        self,
+        resolver: dns.asyncresolver.Resolver,
+        name: str,
+        record_types: List[str],
+        timeout: float,
+        cache: Optional[ResolutionCache]
+    ) -> Tuple[Dict[str, List[str]], str, int]:
+        status, records = await resolve_records(resolver, name, record_types[0], timeout, compact=True, cache=cache)
+        if status == 'nxdomain' or len(record_types) == 1:
+            return ({record_types[0]: records} if status == 'ok' else {}), status, 1
+
+        answers = [(status, records)] + list(await asyncio.gather(*(
+            resolve_records(resolver, name, record_type, timeout, compact=True, cache=cache)
+            for record_type in record_types[1:]
+        )))
+        found = {
+            record_type: records
+            for record_type, (status, records) in zip(record_types, answers)
+            if status == 'ok' and records
+        }
+        statuses = {status for status, _ in answers}
+        if not found and statuses & {'timeout', 'error'}:
+            return {}, 'timeout' if 'timeout' in statuses else 'error', len(record_types)
+        return found, 'ok', len(record_types)
+
+    def _count_words(self, validated: Dict[str, Any]) -> int:
+        total = 0
+        if validated['words']:
+            total += len(validated['words'])
+        if validated['upload_id']:
+            total += sum(1 for _ in iter_upload_lines(validated['upload_id']))
+        if not validated['words'] and not validated['upload_id']:
+            total = len(COMMON_SUBDOMAINS)
+        if total > self.MAX_WORDS:
+            raise ValueError(f"At most {self.MAX_WORDS} words can be tested per execution")
+        return max(total, 1)
+
+    def _words(self, validated: Dict[str, Any]) -> Iterable[str]:
+        if validated['words']:
+            yield from validated['words']
+        if validated['upload_id']:
+            yield from iter_upload_lines(validated['upload_id'])
+        if not validated['words'] and not validated['upload_id']:
+            yield from COMMON_SUBDOMAINS
+
+    def _candidates(self, validated: Dict[str, Any]) -> Iterator[str]:
+        domain = validated['domain']
+        seen: Set[str] = set()
+        for word in self._words(validated):
+            label = word.strip().lower().rstrip('.')
+            if label.endswith('.' + domain):
+                label = label[:-len(domain) - 1]
+            if not LABEL_PATTERN.match(label) or label in seen:
+                continue
+            seen.add(label)
+            candidate = f"{label}.{domain}"
+            if len(candidate) <= 253:
+                yield candidate
@@ -0,0 +1,93 @@
+from typing import Any, Callable, Iterator, List, Tuple
+import ipaddress
+import re
+
+
+IPV4_PATTERN = re.compile(r'^(\d{1,3}\.){3}\d{1,3}$')
+IPV4_CIDR_PATTERN = re.compile(r'^(\d{1,3}\.){3}\d{1,3}/\d{1,2}$')
+IPV4_RANGE_PATTERN = re.compile(r'^((?:\d{1,3}\.){3}\d{1,3})-((?:\d{1,3}\.){3}\d{1,3}|\d{1,3})$')
+
+
+def is_address_spec(value: str) -> bool:
+    return bool(
+        IPV4_PATTERN.match(value)
+        or IPV4_CIDR_PATTERN.match(value)
+        or IPV4_RANGE_PATTERN.match(value)
+    )
+
+
+def split_target_spec(value: Any) -> List[str]:
+    if isinstance(value, (list, tuple)):
+        entries = []
+        for item in value:
+            entries.extend(split_target_spec(item))
+        return entries
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid target: {value}")
+    return [entry.strip() for entry in re.split(r'[,\n]+', value) if entry.strip()]
+
+
+class TargetSet:
+    def __init__(self, max_hosts: int):
+        self.max_hosts = max_hosts
+        self.hostnames: List[str] = []
+        self.ranges: List[Tuple[int, int]] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.hostnames
+        for start, end in self.ranges:
+            for value in range(start, end + 1):
+                yield str(ipaddress.IPv4Address(value))
+
+    def add_hostname(self, hostname: str):
+        self._reserve(1)
+        self.hostnames.append(hostname)
+
+    def add_address_spec(self, spec: str):
+        try:
+            if IPV4_CIDR_PATTERN.match(spec):
+                network = ipaddress.IPv4Network(spec, strict=False)
+                start, end = int(network.network_address), int(network.broadcast_address)
+                if network.prefixlen < 31:
+                    start, end = start + 1, end - 1
+            elif IPV4_RANGE_PATTERN.match(spec):
+                first, last = IPV4_RANGE_PATTERN.match(spec).groups()
+                if '.' not in last:
+                    last = first.rsplit('.', 1)[0] + '.' + last
+                start = int(ipaddress.IPv4Address(first))
+                end = int(ipaddress.IPv4Address(last))
+            elif IPV4_PATTERN.match(spec):
+                start = end = int(ipaddress.IPv4Address(spec))
+            else:
+                raise ValueError(spec)
+        except ValueError:
+            raise ValueError(f"Invalid address specification: {spec}")
+
+        if start > end:
+            raise ValueError(f"Invalid address range: {spec}")
+
+        self._reserve(end - start + 1)
+        self.ranges.append((start, end))
+
+    def _reserve(self, count: int):
+        if self._count + count > self.max_hosts:
+            raise ValueError(f"Too many targets (max {self.max_hosts} hosts)")
+        self._count += count
+
+
+def parse_targets(value: Any, sanitize_hostname: Callable[[str], str], max_hosts: int) -> TargetSet:
+    entries = split_target_spec(value)
+    if not entries:
+        raise ValueError("Target host is required")
+
+    targets = TargetSet(max_hosts)
+    for entry in entries:
+        if is_address_spec(entry):
+            targets.add_address_spec(entry)
+        else:
+            targets.add_hostname(sanitize_hostname(entry))
+    return targets
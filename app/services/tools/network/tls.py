@@ -0,0 +1,263 @@
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import ssl
+import sys
+import warnings
+
+from cryptography import x509
+from cryptography.hazmat.primitives.asymmetric import dsa, ec, ed448, ed25519, rsa
+
+
+SAN_TYPES: Tuple[Tuple[type, str], ...] = (
+    (x509.DNSName, 'DNS'),
+    (x509.IPAddress, 'IP Address'),
+    (x509.RFC822Name, 'email'),
+    (x509.UniformResourceIdentifier, 'URI'),
+)
+
+COMPACT_SAN_TYPES = ('DNS', 'IP Address')
+
+PUBLIC_UNVERIFIED_CHAIN = sys.version_info >= (3, 13)
+
+TLS_VERSIONS: Dict[str, ssl.TLSVersion] = {
+    'TLSv1': ssl.TLSVersion.TLSv1,
+    'TLSv1.1': ssl.TLSVersion.TLSv1_1,
+    'TLSv1.2': ssl.TLSVersion.TLSv1_2,
+    'TLSv1.3': ssl.TLSVersion.TLSv1_3,
+}
+ENUMERATION_CIPHERS = 'ALL:COMPLEMENTOFALL:!PSK:!SRP:@SECLEVEL=0'
+MAX_PINNED_CONTEXTS = 512
+
+_contexts: Dict[bool, ssl.SSLContext] = {}
+_pinned_contexts: 'OrderedDict[Tuple[str, Tuple[str, ...]], ssl.SSLContext]' = OrderedDict()
+_cipher_groups: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}
+
+
+class TLSHandshakeTimeout(asyncio.TimeoutError):
+    pass
+
+
+def client_context(verify: bool = True) -> ssl.SSLContext:
+    context = _contexts.get(verify)
+    if context is None:
+        context = ssl.create_default_context()
+        if not verify:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        _contexts[verify] = context
+    return context
+
+
+def pinned_context(version: str, ciphers: Tuple[str, ...] = ()) -> ssl.SSLContext:
+    key = (version, ciphers)
+    context = _pinned_contexts.get(key)
+    if context is not None:
+        _pinned_contexts.move_to_end(key)
+        return context
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.check_hostname = False
+    context.verify_mode = ssl.CERT_NONE
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        context.minimum_version = TLS_VERSIONS[version]
+        context.maximum_version = TLS_VERSIONS[version]
+    context.set_ciphers(':'.join(ciphers) + ':@SECLEVEL=0' if ciphers else ENUMERATION_CIPHERS)
+    _pinned_contexts[key] = context
+    if len(_pinned_contexts) > MAX_PINNED_CONTEXTS:
+        _pinned_contexts.popitem(last=False)
+    return context
+
+
+def cipher_groups(version: str) -> List[Tuple[str, Tuple[str, ...]]]:
+    groups = _cipher_groups.get(version)
+    if groups is None:
+        excluded = {'TLSv1.3'} if version == 'TLSv1.2' else {'TLSv1.2', 'TLSv1.3'}
+        grouped: Dict[str, List[str]] = {}
+        if version != 'TLSv1.3':
+            for cipher in pinned_context(version).get_ciphers():
+                if cipher['protocol'] in excluded:
+                    continue
+                label = f"{cipher['kea'].replace('kx-', '')}-{cipher['auth'].replace('auth-', '')}"
+                grouped.setdefault(label, []).append(cipher['name'])
+        groups = _cipher_groups[version] = [(label, tuple(names)) for label, names in grouped.items()]
+    return groups
+
+
+def _name(name: x509.Name) -> Dict[str, str]:
+    return {attribute.oid._name: attribute.value for attribute in name}
+
+
+def _key(public_key: Any) -> Tuple[str, Optional[int]]:
+    if isinstance(public_key, rsa.RSAPublicKey):
+        return 'RSA', public_key.key_size
+    if isinstance(public_key, ec.EllipticCurvePublicKey):
+        return f"EC {public_key.curve.name}", public_key.key_size
+    if isinstance(public_key, ed25519.Ed25519PublicKey):
+        return 'Ed25519', 256
+    if isinstance(public_key, ed448.Ed448PublicKey):
+        return 'Ed448', 456
+    if isinstance(public_key, dsa.DSAPublicKey):
+        return 'DSA', public_key.key_size
+    return type(public_key).__name__, None
+
+
+def parse_certificate(der: bytes) -> Dict[str, Any]:
+    certificate = x509.load_der_x509_certificate(der)
+    try:
+        extension = certificate.extensions.get_extension_for_class(x509.SubjectAlternativeName)
+        san = [
+            [label, str(value)]
+            for general_name_type, label in SAN_TYPES
+            for value in extension.value.get_values_for_type(general_name_type)
+        ]
+    except x509.ExtensionNotFound:
+        san = []
+    key_type, key_bits = _key(certificate.public_key())
+    signature_algorithm = certificate.signature_algorithm_oid
+    return {
+        'subject': _name(certificate.subject),
+        'issuer': _name(certificate.issuer),
+        'version': certificate.version.value + 1,
+        'serial_number': certificate.serial_number,
+        'not_before': certificate.not_valid_before.isoformat(),
+        'not_after': certificate.not_valid_after.isoformat(),
+        'signature_algorithm': getattr(signature_algorithm, '_name', None) or signature_algorithm.dotted_string,
+        'san': san,
+        'key_type': key_type,
+        'key_bits': key_bits,
+        'self_signed': certificate.subject == certificate.issuer,
+        'fingerprint_sha256': hashlib.sha256(der).hexdigest(),
+    }
+
+
+def certificate_summary(details: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'subject': details['subject'].get('commonName'),
+        'issuer': details['issuer'].get('commonName') or details['issuer'].get('organizationName'),
+        'san': [value for label, value in details['san'] if label in COMPACT_SAN_TYPES],
+    }
+
+
+def certificate_status(details: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    now = now or datetime.utcnow()
+    not_before = datetime.fromisoformat(details['not_before'])
+    not_after = datetime.fromisoformat(details['not_after'])
+    return {
+        **details,
+        'expired': now > not_after,
+        'not_yet_valid': now < not_before,
+        'days_until_expiry': (not_after - now).days,
+    }
+
+
+def presented_chain(ssl_object: Any) -> List[bytes]:
+    if PUBLIC_UNVERIFIED_CHAIN:
+        chain = ssl_object.get_unverified_chain()
+    else:
+        # Before 3.13 the chain is only reachable through the C-level object (3.10+), as PEM.
+        get_chain = getattr(getattr(ssl_object, '_sslobj', None), 'get_unverified_chain', None)
+        chain = [ssl.PEM_cert_to_DER_cert(certificate.public_bytes()) for certificate in get_chain() or ()] if get_chain else None
+    if not chain:
+        leaf = ssl_object.getpeercert(binary_form=True)
+        return [leaf] if leaf else []
+    return list(chain)
+
+
+async def tls_handshake(
+    address: str,
+    port: int,
+    server_hostname: Optional[str],
+    context: ssl.SSLContext,
+    connect_timeout: float,
+    handshake_timeout: float
+) -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    transport, protocol = await asyncio.wait_for(loop.create_connection(asyncio.Protocol, address, port), connect_timeout)
+    tls_transport = None
+    try:
+        try:
+            tls_transport = await asyncio.wait_for(
+                loop.start_tls(
+                    transport, protocol, context,
+                    server_hostname=server_hostname,
+                    ssl_handshake_timeout=handshake_timeout
+                ),
+                handshake_timeout + 1
+            )
+        except (asyncio.TimeoutError, ConnectionAbortedError) as e:
+            if isinstance(e, ConnectionAbortedError) and 'handshake' not in str(e):
+                raise
+            raise TLSHandshakeTimeout(f"TLS handshake with {address}:{port} timed out after {handshake_timeout:g}s")
+        if tls_transport is None:
+            raise ConnectionResetError(f"{address}:{port} closed the connection during the TLS handshake")
+        ssl_object = tls_transport.get_extra_info('ssl_object')
+        return {
+            'version': ssl_object.version(),
+            'cipher': list(ssl_object.cipher()),
+            'chain': presented_chain(ssl_object),
+        }
+    finally:
+        (tls_transport or transport).abort()
+
+
+async def enumerate_tls(
+    address: str,
+    port: int,
+    server_hostname: Optional[str],
+    max_connections: int,
+    connect_timeout: float,
+    handshake_timeout: float
+) -> Dict[str, Any]:
+    semaphore = asyncio.Semaphore(max_connections)
+    handshakes = 0
+
+    async def attempt(version: str, ciphers: Tuple[str, ...] = ()) -> Optional[str]:
+        nonlocal handshakes
+        async with semaphore:
+            handshakes += 1
+            try:
+                session = await tls_handshake(
+                    address, port, server_hostname, pinned_context(version, ciphers),
+                    connect_timeout, handshake_timeout
+                )
+            except (ssl.SSLError, ConnectionResetError, ConnectionAbortedError, TLSHandshakeTimeout):
+                return None
+        return session['cipher'][0] if session['version'] == version else None
+
+    async def eliminate(version: str, ciphers: Tuple[str, ...], first: Optional[str] = None) -> List[str]:
+        chosen, remaining = [], list(ciphers)
+        while remaining:
+            cipher = first if first is not None else await attempt(version, tuple(remaining))
+            first = None
+            if cipher not in remaining:
+                break
+            chosen.append(cipher)
+            remaining.remove(cipher)
+        return chosen
+
+    async def probe(version: str) -> Dict[str, Any]:
+        negotiated = await attempt(version)
+        if negotiated is None:
+            return {'supported': False}
+        if version == 'TLSv1.3':
+            return {'supported': True, 'ciphers': [negotiated], 'server_preference': None}
+
+        groups = [ciphers for _, ciphers in cipher_groups(version)]
+        found = await asyncio.gather(*(eliminate(version, ciphers) for ciphers in groups))
+        accepted = [cipher for ciphers in found for cipher in ciphers]
+        if len(accepted) < 2:
+            return {'supported': True, 'ciphers': accepted, 'server_preference': None}
+
+        forward, backward = await asyncio.gather(
+            attempt(version, tuple(accepted)),
+            attempt(version, tuple(reversed(accepted)))
+        )
+        if forward is None or forward != backward:
+            return {'supported': True, 'ciphers': accepted, 'server_preference': False}
+        return {'supported': True, 'ciphers': await eliminate(version, tuple(accepted), forward), 'server_preference': True}
+
+    results = await asyncio.gather(*(probe(version) for version in TLS_VERSIONS))
+    return {'protocols': dict(zip(TLS_VERSIONS, results)), 'handshakes': handshakes}
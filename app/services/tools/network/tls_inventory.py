@@ -0,0 +1,218 @@
+from collections import Counter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import ssl
+import time
+
+from app.services.certificate_cache import certificate_cache
+from ..base import BaseToolRunner
+from .port_spec import parse_port_spec
+from .resolution import resolve_host
+from .targets import IPV4_PATTERN, TargetSet, is_address_spec, split_target_spec
+from .tls import TLSHandshakeTimeout, certificate_status, certificate_summary, client_context, tls_handshake
+
+
+class TLSInventoryRunner(BaseToolRunner):
+    priority_class = 'bulk'
+    max_execution_time = 3600
+    SORT_ORDERS = ('expiry', 'endpoint')
+    DEFAULT_PORTS = '443'
+    MAX_PORTS = 64
+    DEFAULT_CONCURRENCY = 256
+    MAX_CONCURRENCY = 5000
+    DEFAULT_CONNECT_TIMEOUT = 3.0
+    DEFAULT_HANDSHAKE_TIMEOUT = 5.0
+    MAX_TIMEOUT = 30.0
+    MAX_ENDPOINTS = 262144
+    MAX_LISTED_ERRORS = 1000
+
+    def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        entries = split_target_spec(parameters.get('targets') or [])
+        if not entries:
+            raise ValueError("At least one endpoint or address block is required")
+
+        ports = list(parse_port_spec(parameters.get('ports', self.DEFAULT_PORTS), self.sanitize_port))
+        if not ports or len(ports) > self.MAX_PORTS:
+            raise ValueError(f"Between 1 and {self.MAX_PORTS} ports can be scanned per host")
+
+        endpoints: List[Tuple[str, int]] = []
+        hosts = TargetSet(self.MAX_ENDPOINTS // len(ports))
+        for entry in entries:
+            if is_address_spec(entry):
+                hosts.add_address_spec(entry)
+                continue
+            host, separator, port = entry.rpartition(':')
+            if separator:
+                endpoints.append((self._sanitize_host(host), self.sanitize_port(port)))
+            else:
+                hosts.add_hostname(self.sanitize_hostname(entry))
+        endpoints = list(dict.fromkeys(endpoints))
+        total = len(endpoints) + len(hosts) * len(ports)
+        if total > self.MAX_ENDPOINTS:
+            raise ValueError(f"Too many endpoints (max {self.MAX_ENDPOINTS})")
+
+        sort = parameters.get('sort', 'expiry')
+        if sort not in self.SORT_ORDERS:
+            raise ValueError(f"Sort must be one of: {', '.join(self.SORT_ORDERS)}")
+
+        try:
+            concurrency = int(parameters.get('concurrency', self.DEFAULT_CONCURRENCY))
+            connect_timeout = float(parameters.get('connect_timeout', self.DEFAULT_CONNECT_TIMEOUT))
+            handshake_timeout = float(parameters.get('handshake_timeout', self.DEFAULT_HANDSHAKE_TIMEOUT))
+            expiring_within = parameters.get('expiring_within_days')
+            expiring_within = int(expiring_within) if expiring_within is not None else None
+        except (TypeError, ValueError):
+            raise ValueError("Concurrency, timeouts and expiring_within_days must be numbers")
+        if concurrency < 1 or concurrency > self.MAX_CONCURRENCY:
+            raise ValueError(f"Concurrency must be between 1 and {self.MAX_CONCURRENCY}")
+        if not 0 < connect_timeout <= self.MAX_TIMEOUT or not 0 < handshake_timeout <= self.MAX_TIMEOUT:
+            raise ValueError(f"Timeouts must be between 0 and {self.MAX_TIMEOUT:g} seconds")
+
+        return {
+            'specs': entries,
+            'endpoints': endpoints,
+            'hosts': hosts,
+            'ports': ports,
+            'total': total,
+            'sort': sort,
+            'concurrency': concurrency,
+            'connect_timeout': connect_timeout,
+            'handshake_timeout': handshake_timeout,
+            'expiring_within_days': expiring_within,
+            'include_certificates': bool(parameters.get('include_certificates', not certificate_cache.persist))
+        }
+
+    async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        validated = self.validate_parameters(parameters)
+        total = validated['total']
+
+        await self.update_progress(5, f"Collecting certificates from {total} endpoint(s)")
+
+        endpoints = self._iter_endpoints(validated)
+        certificates: List[Dict[str, Any]] = []
+        details_by_fingerprint: Dict[str, Dict[str, Any]] = {}
+        errors: Dict[str, str] = {}
+        counts: Counter = Counter()
+        start = time.monotonic()
+
+        async def worker():
+            for host, port in endpoints:
+                if self.stop_requested:
+                    return
+                endpoint = f"{host}:{port}"
+                row, details, status, error = await self._inventory(host, port, validated)
+                counts['scanned'] += 1
+                counts[status] += 1
+                delta = None
+                if row is not None:
+                    certificates.append(row)
+                    limit = validated['expiring_within_days']
+                    if limit is None or row['days_until_expiry'] <= limit:
+                        delta = {'certificates': [row]}
+                        fingerprint = row['fingerprint_sha256']
+                        if validated['include_certificates'] and fingerprint not in details_by_fingerprint:
+                            details_by_fingerprint[fingerprint] = details
+                            delta['certificate_details'] = {fingerprint: details}
+                elif error and status not in ('refused', 'timeout') and len(errors) < self.MAX_LISTED_ERRORS:
+                    errors[endpoint] = error
+                    delta = {'errors': {endpoint: error}}
+                self.report_progress(
+                    5 + int(counts['scanned'] / total * 90),
+                    f"Scanned {counts['scanned']}/{total} endpoints, {len(certificates)} certificate(s)",
+                    delta
+                )
+
+        workers = min(total, validated['concurrency'])
+        try:
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        finally:
+            await certificate_cache.flush()
+        elapsed = time.monotonic() - start
+
+        await self.update_progress(100, "TLS inventory stopped" if self.stop_requested else "TLS inventory complete")
+
+        limit = validated['expiring_within_days']
+        listed = [row for row in certificates if limit is None or row['days_until_expiry'] <= limit]
+        if validated['sort'] == 'expiry':
+            listed.sort(key=lambda row: (row['days_until_expiry'], row['endpoint']))
+        else:
+            listed.sort(key=lambda row: row['endpoint'])
+
+        result = {
+            'targets': validated['specs'],
+            'ports': validated['ports'],
+            'endpoints_scanned': counts['scanned'],
+            'certificates_found': len(certificates),
+            'unique_certificates': len({row['fingerprint_sha256'] for row in certificates}),
+            'expired': sum(1 for row in certificates if row['expired']),
+            'certificates': listed,
+            'errors': errors,
+            'error_counts': {
+                status: counts[status]
+                for status in ('refused', 'timeout', 'handshake_timeout', 'tls_error', 'unreachable', 'unresolved')
+                if counts[status]
+            },
+            'elapsed_seconds': round(elapsed, 3),
+            'handshakes_per_second': round(counts['ok'] / elapsed, 1) if elapsed > 0 else float(counts['ok'])
+        }
+        if validated['include_certificates']:
+            result['certificate_details'] = {
+                row['fingerprint_sha256']: details_by_fingerprint[row['fingerprint_sha256']] for row in listed
+            }
+        if self.stop_requested:
+            result['partial'] = True
+
+        return self.redact_sensitive_data(result)
+
+    def _sanitize_host(self, host: str) -> str:
+        return self.sanitize_ip(host) if IPV4_PATTERN.match(host) else self.sanitize_hostname(host)
+
+    def _iter_endpoints(self, validated: Dict[str, Any]) -> Iterator[Tuple[str, int]]:
+        yield from validated['endpoints']
+        for host in validated['hosts']:
+            for port in validated['ports']:
+                yield host, port
+
+    async def _inventory(
+        self, host: str, port: int, validated: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], str, Optional[str]]:
+        is_ip = bool(IPV4_PATTERN.match(host))
+        if is_ip:
+            address = host
+        else:
+            addresses = await resolve_host(host)
+            if not addresses:
+                return None, None, 'unresolved', f"Could not resolve host: {host}"
+            address = addresses[0]
+
+        try:
+            session = await tls_handshake(
+                address, port, None if is_ip else host, client_context(verify=False),
+                validated['connect_timeout'], validated['handshake_timeout']
+            )
+        except TLSHandshakeTimeout as e:
+            return None, None, 'handshake_timeout', str(e)
+        except asyncio.TimeoutError:
+            return None, None, 'timeout', "Connection timed out"
+        except ConnectionRefusedError:
+            return None, None, 'refused', "Connection refused"
+        except (ssl.SSLError, ConnectionError) as e:
+            return None, None, 'tls_error', str(e) or type(e).__name__
+        except OSError as e:
+            return None, None, 'unreachable', str(e) or type(e).__name__
+        if not session['chain']:
+            return None, None, 'tls_error', "No certificate presented"
+
+        details = certificate_cache.parse(session['chain'][0])
+        validity = certificate_status(details)
+        return {
+            'endpoint': f"{host}:{port}",
+            'ip': address,
+            **certificate_summary(details),
+            'not_after': validity['not_after'],
+            'days_until_expiry': validity['days_until_expiry'],
+            'expired': validity['expired'],
+            'key_type': validity['key_type'],
+            'version': session['version'],
+            'fingerprint_sha256': validity['fingerprint_sha256']
+        }, details, 'ok', None
@@ -2,6 +2,7 @@ from typing import Dict, Any
 import asyncio
 import re
 from ..base import BaseToolRunner
+from .resolution import resolve_host
 
 
 class TracerouteRunner(BaseToolRunner):
@@ -29,15 +30,19 @@ class TracerouteRunner(BaseToolRunner):
         await self.update_progress(10, f"Starting traceroute to {target}")
 
         try:
+            addresses = await resolve_host(target)
+            if not addresses:
+                raise ValueError(f"Could not resolve host: {target}")
+
             process = await asyncio.create_subprocess_exec(
-                'traceroute', '-m', str(max_hops), '-w', '2', target,
+                'traceroute', '-m', str(max_hops), '-w', '2', addresses[0],
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
 
-            stdout, stderr = await process.communicate()
+            stdout, stderr = await self.communicate_until_stopped(process)
 
-            if process.returncode != 0 and not stdout:
+            if not self.stop_requested and process.returncode != 0 and not stdout:
                 raise ValueError(f"Traceroute failed: {stderr.decode()}")
 
             output = stdout.decode()
@@ -45,6 +50,7 @@ class TracerouteRunner(BaseToolRunner):
             await self.update_progress(80, "Parsing traceroute results")
 
             result = self._parse_traceroute_output(output, target, max_hops)
+            result['ip'] = addresses[0]
             
             await self.update_progress(100, "Traceroute complete")
 
@@ -0,0 +1,285 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+import asyncio
+import re
+import time
+
+from app.core.config import settings
+from .ratelimit import KeyedRateLimiter
+from .resolution import resolve_host
+
+
+IANA_SERVER = 'whois.iana.org'
+
+WHOIS_SERVERS: Dict[str, str] = {
+    'com': 'whois.verisign-grs.com',
+    'net': 'whois.verisign-grs.com',
+    'edu': 'whois.educause.edu',
+    'gov': 'whois.dotgov.gov',
+    'org': 'whois.pir.org',
+    'info': 'whois.nic.info',
+    'biz': 'whois.nic.biz',
+    'io': 'whois.nic.io',
+    'co': 'whois.nic.co',
+    'me': 'whois.nic.me',
+    'tv': 'whois.nic.tv',
+    'cc': 'ccwhois.verisign-grs.com',
+    'ai': 'whois.nic.ai',
+    'app': 'whois.nic.google',
+    'dev': 'whois.nic.google',
+    'xyz': 'whois.nic.xyz',
+    'online': 'whois.nic.online',
+    'site': 'whois.nic.site',
+    'uk': 'whois.nic.uk',
+    'co.uk': 'whois.nic.uk',
+    'org.uk': 'whois.nic.uk',
+    'de': 'whois.denic.de',
+    'fr': 'whois.nic.fr',
+    'nl': 'whois.domain-registry.nl',
+    'be': 'whois.dns.be',
+    'eu': 'whois.eu',
+    'it': 'whois.nic.it',
+    'es': 'whois.nic.es',
+    'ch': 'whois.nic.ch',
+    'at': 'whois.nic.at',
+    'se': 'whois.iis.se',
+    'nu': 'whois.iis.nu',
+    'no': 'whois.norid.no',
+    'dk': 'whois.punktum.dk',
+    'fi': 'whois.fi',
+    'pl': 'whois.dns.pl',
+    'cz': 'whois.nic.cz',
+    'ru': 'whois.tcinet.ru',
+    'us': 'whois.nic.us',
+    'ca': 'whois.cira.ca',
+    'au': 'whois.auda.org.au',
+    'com.au': 'whois.auda.org.au',
+    'nz': 'whois.irs.net.nz',
+    'jp': 'whois.jprs.jp',
+    'kr': 'whois.kr',
+    'cn': 'whois.cnnic.cn',
+    'in': 'whois.registry.in',
+    'br': 'whois.registro.br',
+    'com.br': 'whois.registro.br',
+}
+
+QUERY_FORMATS: Dict[str, str] = {
+    'whois.verisign-grs.com': 'domain {domain}',
+    'whois.denic.de': '-T dn,ace {domain}',
+    'whois.jprs.jp': '{domain}/e',
+}
+
+_FLAGS = re.IGNORECASE | re.MULTILINE
+
+REFERRAL_PATTERNS: Tuple[Pattern, ...] = (
+    re.compile(r'^\s*refer:\s*(\S+)', _FLAGS),
+    re.compile(r'^\s*Registrar WHOIS Server:\s*(\S+)', _FLAGS),
+    re.compile(r'^\s*ReferralServer:\s*(\S+)', _FLAGS),
+)
+
+NOT_FOUND_PATTERN = re.compile(
+    r'^\s*(?:No match for|NOT FOUND|No Data Found|No entries found|Domain not found'
+    r'|The queried object does not exist|Status:\s*free|%% NOT FOUND)',
+    _FLAGS
+)
+
+SINGLE_FIELDS: Dict[str, Tuple[Pattern, ...]] = {
+    'registrar': (
+        re.compile(r'^\s*Registrar(?: Name)?:[ \t]*(\S.*)$', _FLAGS),
+        re.compile(r'^\s*Sponsoring Registrar:[ \t]*(\S.*)$', _FLAGS),
+    ),
+    'creation_date': (
+        re.compile(r'^\s*Creation Date:[ \t]*(\S.*)$', _FLAGS),
+        re.compile(r'^\s*(?:Created|Created On|Registered on|Registration Time):[ \t]*(\S.*)$', _FLAGS),
+    ),
+    'expiration_date': (
+        re.compile(r'^\s*Registry Expiry Date:[ \t]*(\S.*)$', _FLAGS),
+        re.compile(r'^\s*Registrar Registration Expiration Date:[ \t]*(\S.*)$', _FLAGS),
+        re.compile(r'^\s*(?:Expiry Date|Expiration Date|Expires On|Expiration Time|paid-till):[ \t]*(\S.*)$', _FLAGS),
+    ),
+    'updated_date': (
+        re.compile(r'^\s*Updated Date:[ \t]*(\S.*)$', _FLAGS),
+        re.compile(r'^\s*(?:Last Modified|Last updated|changed):[ \t]*(\S.*)$', _FLAGS),
+    ),
+    'dnssec': (
+        re.compile(r'^\s*DNSSEC:[ \t]*(\S.*)$', _FLAGS),
+    ),
+    'org': (
+        re.compile(r'^\s*Registrant Organi[sz]ation:[ \t]*(\S.*)$', _FLAGS),
+        re.compile(r'^\s*org(?:-name)?:[ \t]*(\S.*)$', _FLAGS),
+    ),
+    'country': (
+        re.compile(r'^\s*Registrant Country:[ \t]*(\S.*)$', _FLAGS),
+        re.compile(r'^\s*country:[ \t]*(\S.*)$', _FLAGS),
+    ),
+}
+
+STATUS_PATTERN = re.compile(r'^\s*(?:Domain )?Status:[ \t]*(\S.*)$', _FLAGS)
+NAME_SERVER_PATTERN = re.compile(r'^\s*(?:Name Server|nserver|Nameservers?):[ \t]*([A-Za-z0-9.-]+)', _FLAGS)
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+STATUS_URL_PATTERN = re.compile(r'\s*\(?https?://\S+\)?')
+
+DATE_FORMATS = ('%d-%b-%Y', '%d-%b-%Y %H:%M:%S', '%Y.%m.%d', '%Y/%m/%d', '%d.%m.%Y', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S')
+
+DATE_FIELDS = ('creation_date', 'expiration_date', 'updated_date')
+
+
+class WhoisNotFoundError(LookupError):
+    pass
+
+
+def server_for(domain: str, servers: Optional[Dict[str, str]] = None) -> str:
+    table = WHOIS_SERVERS if servers is None else servers
+    labels = domain.lower().rstrip('.').split('.')
+    for index in range(1, len(labels)):
+        server = table.get('.'.join(labels[index:]))
+        if server:
+            return server
+    return IANA_SERVER
+
+
+def find_referral(text: str, current: str) -> Optional[str]:
+    for pattern in REFERRAL_PATTERNS:
+        match = pattern.search(text)
+        if not match:
+            continue
+        server = re.sub(r'^r?whois://', '', match.group(1), flags=re.IGNORECASE).split('/')[0].split(':')[0].lower()
+        if server and server != current.lower():
+            return server
+    return None
+
+
+def normalize_date(value: str) -> str:
+    value = value.strip()
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).isoformat()
+    except ValueError:
+        pass
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format).isoformat()
+        except ValueError:
+            continue
+    return value
+
+
+def parse_whois(text: str) -> Dict[str, Any]:
+    parsed: Dict[str, Any] = {}
+    for field, patterns in SINGLE_FIELDS.items():
+        parsed[field] = None
+        for pattern in patterns:
+            match = pattern.search(text)
+            if match:
+                value = match.group(1).strip()
+                parsed[field] = normalize_date(value) if field in DATE_FIELDS else value
+                break
+
+    statuses = (STATUS_URL_PATTERN.sub('', value).strip() for value in STATUS_PATTERN.findall(text))
+    parsed['status'] = list(dict.fromkeys(status for status in statuses if status)) or None
+    name_servers = (value.lower().rstrip('.') for value in NAME_SERVER_PATTERN.findall(text))
+    parsed['name_servers'] = list(dict.fromkeys(name_servers)) or None
+    parsed['emails'] = list(dict.fromkeys(email.lower() for email in EMAIL_PATTERN.findall(text))) or None
+    return parsed
+
+
+def merge_records(*records: Dict[str, Any]) -> Dict[str, Any]:
+    merged: Dict[str, Any] = {}
+    for record in records:
+        for field, value in record.items():
+            if value is not None or field not in merged:
+                merged[field] = value
+    return merged
+
+
+class WhoisClient:
+    MAX_RESPONSE_SIZE = 1024 * 1024
+
+    def __init__(
+        self,
+        timeout: float = 15.0,
+        rate: float = 1.0,
+        burst: Optional[float] = None,
+        max_referrals: int = 2,
+        servers: Optional[Dict[str, str]] = None,
+        ports: Optional[Dict[str, int]] = None
+    ):
+        self.timeout = timeout
+        self.max_referrals = max_referrals
+        self.servers = servers
+        self.ports = ports or {}
+        self.limiter = KeyedRateLimiter(rate, burst)
+
+    async def lookup(self, domain: str) -> Dict[str, Any]:
+        deadline = time.monotonic() + self.timeout
+        server = server_for(domain, self.servers)
+        text = await self._query_with_deadline(server, domain, deadline)
+        chain = [server]
+        if server == IANA_SERVER:
+            server = find_referral(text, server)
+            if server is None:
+                raise WhoisNotFoundError(f"No WHOIS server is known for {domain}")
+            text = await self._query_with_deadline(server, domain, deadline)
+            chain.append(server)
+        if NOT_FOUND_PATTERN.search(text):
+            raise WhoisNotFoundError(f"No WHOIS record found for {domain}")
+
+        records = [parse_whois(text)]
+        referral_error = None
+        while len(chain) - 1 < self.max_referrals:
+            referral = find_referral(text, server)
+            if referral is None or referral in chain:
+                break
+            try:
+                text = await self._query_with_deadline(referral, domain, deadline)
+            except (asyncio.TimeoutError, OSError) as e:
+                referral_error = f"{referral}: {str(e) or type(e).__name__}"
+                break
+            server = referral
+            chain.append(server)
+            if not NOT_FOUND_PATTERN.search(text):
+                records.append(parse_whois(text))
+
+        result = {**merge_records(*records), 'whois_servers': chain}
+        if referral_error:
+            result['referral_error'] = referral_error
+        return result
+
+    async def _query_with_deadline(self, server: str, domain: str, deadline: float) -> str:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise asyncio.TimeoutError()
+        return await asyncio.wait_for(self.query(server, domain), remaining)
+
+    async def query(self, server: str, domain: str) -> str:
+        await self.limiter.acquire(server)
+        addresses = await resolve_host(server)
+        if not addresses:
+            raise OSError(f"Could not resolve WHOIS server: {server}")
+
+        reader, writer = await asyncio.open_connection(addresses[0], self.ports.get(server, 43))
+        try:
+            query = QUERY_FORMATS.get(server, '{domain}').format(domain=domain.encode('idna').decode('ascii'))
+            writer.write(query.encode('ascii') + b'\r\n')
+            await writer.drain()
+            chunks: List[bytes] = []
+            size = 0
+            while size < self.MAX_RESPONSE_SIZE:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        return b''.join(chunks).decode('utf-8', 'replace')
+
+
+whois_client = WhoisClient(
+    timeout=settings.WHOIS_TIMEOUT,
+    rate=settings.WHOIS_RATE_LIMIT,
+    burst=settings.WHOIS_RATE_BURST
+)
@@ -1,54 +1,140 @@
 from typing import Dict, Any
+import asyncio
 import whois
 from datetime import datetime
+from app.core.config import settings
+from app.services.whois_cache import whois_cache
 from ..base import BaseToolRunner
+from .targets import IPV4_PATTERN, split_target_spec
+from .whois_client import whois_client
+
+
+def serialize_datetime(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    elif isinstance(obj, list):
+        return [serialize_datetime(item) for item in obj]
+    return obj
 
 
 class WhoisLookupRunner(BaseToolRunner):
+    priority_class = 'interactive'
+    DEFAULT_CONCURRENCY = 5
+    MAX_CONCURRENCY = 50
+    MAX_DOMAINS = 1000
+
     def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         domain = parameters.get('domain')
-        if not domain:
+        domains = parameters.get('domains')
+        if not domain and not domains:
             raise ValueError("Domain is required")
         
-        domain = self.sanitize_hostname(domain)
+        domain = self.sanitize_hostname(domain) if domain else None
+        if domains:
+            domains = list(dict.fromkeys(self.sanitize_hostname(entry) for entry in split_target_spec(domains)))
+            if len(domains) > self.MAX_DOMAINS:
+                raise ValueError(f"At most {self.MAX_DOMAINS} domains can be looked up per execution")
+
+        try:
+            concurrency = int(parameters.get('concurrency', self.DEFAULT_CONCURRENCY))
+        except (TypeError, ValueError):
+            raise ValueError("Concurrency must be a number")
+        if concurrency < 1 or concurrency > self.MAX_CONCURRENCY:
+            raise ValueError(f"Concurrency must be between 1 and {self.MAX_CONCURRENCY}")
         
-        return {'domain': domain}
+        return {
+            'domain': domain,
+            'domains': domains or None,
+            'concurrency': concurrency,
+            'use_cache': bool(parameters.get('use_cache', True))
+        }
 
     async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
         validated = self.validate_parameters(parameters)
-        domain = validated['domain']
+        if validated['domains']:
+            return await self._bulk_lookup(validated)
 
+        domain = validated['domain']
         await self.update_progress(10, f"Looking up WHOIS information for {domain}")
 
-        try:
-            w = whois.whois(domain)
-            
-            await self.update_progress(50, "Parsing WHOIS data")
-
-            def serialize_datetime(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                elif isinstance(obj, list):
-                    return [serialize_datetime(item) for item in obj]
-                return obj
-
-            result = {
-                'domain': domain,
-                'registrar': w.registrar if hasattr(w, 'registrar') else None,
-                'creation_date': serialize_datetime(w.creation_date) if hasattr(w, 'creation_date') else None,
-                'expiration_date': serialize_datetime(w.expiration_date) if hasattr(w, 'expiration_date') else None,
-                'updated_date': serialize_datetime(w.updated_date) if hasattr(w, 'updated_date') else None,
-                'status': w.status if hasattr(w, 'status') else None,
-                'name_servers': w.name_servers if hasattr(w, 'name_servers') else None,
-                'dnssec': w.dnssec if hasattr(w, 'dnssec') else None,
-                'emails': w.emails if hasattr(w, 'emails') else None,
-                'org': w.org if hasattr(w, 'org') else None,
-                'country': w.country if hasattr(w, 'country') else None,
-            }
-
-            await self.update_progress(100, "WHOIS lookup complete")
-
-            return self.redact_sensitive_data(result)
+        result = await self._lookup(domain, validated['use_cache'])
+
+        await self.update_progress(100, "WHOIS lookup complete")
+
+        return self.redact_sensitive_data(result)
+
+    async def _bulk_lookup(self, validated: Dict[str, Any]) -> Dict[str, Any]:
+        domains = validated['domains']
+        source = iter(domains)
+        results: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
 
+        await self.update_progress(5, f"Looking up WHOIS information for {len(domains)} domain(s)")
+
+        async def worker():
+            for domain in source:
+                if self.stop_requested:
+                    return
+                try:
+                    entry = await self._lookup(domain, validated['use_cache'])
+                except ValueError as e:
+                    errors[domain] = str(e)
+                    delta = {'errors': {domain: str(e)}}
+                else:
+                    results[domain] = entry
+                    delta = {'results': {domain: self.redact_sensitive_data(entry)}}
+                done = len(results) + len(errors)
+                self.report_progress(5 + int(done / len(domains) * 90), f"Looked up {done}/{len(domains)} domains", delta)
+
+        await asyncio.gather(*(worker() for _ in range(min(len(domains), validated['concurrency']))))
+
+        await self.update_progress(100, "WHOIS lookup stopped" if self.stop_requested else "WHOIS lookup complete")
+
+        result = {
+            'domains': domains,
+            'looked_up': len(results),
+            'cached': sum(1 for entry in results.values() if 'cached_at' in entry),
+            'failed': len(errors),
+            'results': results,
+            'errors': errors,
+        }
+        if self.stop_requested:
+            result['partial'] = True
+
+        return self.redact_sensitive_data(result)
+
+    async def _lookup(self, domain: str, use_cache: bool) -> Dict[str, Any]:
+        registrable = domain if IPV4_PATTERN.match(domain) else whois.extract_domain(domain)
+        try:
+            data, cached_at = await whois_cache.lookup(registrable, self._fetcher(), use_cache)
+        except asyncio.TimeoutError:
+            raise ValueError(f"WHOIS lookup timed out after {whois_cache.timeout:g} seconds")
         except Exception as e:
             raise ValueError(f"WHOIS lookup failed: {str(e)}")
+
+        result = {'domain': domain, 'registrable_domain': registrable, **data}
+        if cached_at is not None:
+            result['cached_at'] = cached_at.isoformat()
+        return result
+
+    def _fetcher(self):
+        return self._query if settings.WHOIS_BACKEND == 'python-whois' else self._query_native
+
+    async def _query_native(self, domain: str) -> Dict[str, Any]:
+        return await whois_client.lookup(domain)
+
+    @staticmethod
+    def _query(domain: str) -> Dict[str, Any]:
+        w = whois.whois(domain)
+        return {
+            'registrar': w.registrar if hasattr(w, 'registrar') else None,
+            'creation_date': serialize_datetime(w.creation_date) if hasattr(w, 'creation_date') else None,
+            'expiration_date': serialize_datetime(w.expiration_date) if hasattr(w, 'expiration_date') else None,
+            'updated_date': serialize_datetime(w.updated_date) if hasattr(w, 'updated_date') else None,
+            'status': w.status if hasattr(w, 'status') else None,
+            'name_servers': w.name_servers if hasattr(w, 'name_servers') else None,
+            'dnssec': w.dnssec if hasattr(w, 'dnssec') else None,
+            'emails': w.emails if hasattr(w, 'emails') else None,
+            'org': w.org if hasattr(w, 'org') else None,
+            'country': w.country if hasattr(w, 'country') else None,
+        }
@@ -0,0 +1,101 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import time
+
+
+def merge_delta(target: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    for key, value in delta.items():
+        current = target.get(key)
+        if isinstance(value, list) and isinstance(current, list):
+            current.extend(value)
+        elif isinstance(value, dict) and isinstance(current, dict):
+            merge_delta(current, value)
+        elif isinstance(value, list):
+            target[key] = list(value)
+        elif isinstance(value, dict):
+            target[key] = merge_delta({}, value)
+        else:
+            target[key] = value
+    return target
+
+
+class ProgressAggregator:
+    MIN_TIMER_DELAY = 0.01
+
+    def __init__(
+        self,
+        emit: Callable[[int, Optional[str], Optional[Dict[str, Any]]], Awaitable[None]],
+        interval: float,
+        min_step: int,
+        accumulate: bool = True
+    ):
+        self.emit = emit
+        self.interval = interval
+        self.min_step = min_step
+        self.accumulate = accumulate
+        self.progress = 0
+        self.message: Optional[str] = None
+        self.accumulated: Dict[str, Any] = {}
+        self._delta: Dict[str, Any] = {}
+        self._dirty = False
+        self._last_flush_at = 0.0
+        self._last_flushed_progress = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    def add(self, progress: int, message: Optional[str] = None, delta: Optional[Dict[str, Any]] = None) -> bool:
+        self.progress = progress
+        if message is not None:
+            self.message = message
+        if delta:
+            merge_delta(self._delta, delta)
+            if self.accumulate:
+                merge_delta(self.accumulated, delta)
+        self._dirty = True
+        return self.is_due()
+
+    def is_due(self) -> bool:
+        return self._dirty and (
+            self.progress >= 100
+            or time.monotonic() - self._last_flush_at >= self.interval
+            or abs(self.progress - self._last_flushed_progress) >= self.min_step
+        )
+
+    def schedule(self):
+        if not self._dirty:
+            return
+        if self.is_due() and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.ensure_future(self.flush())
+        else:
+            self._arm_timer()
+
+    def _arm_timer(self):
+        if self._timer is None:
+            delay = max(self.MIN_TIMER_DELAY, self.interval - (time.monotonic() - self._last_flush_at))
+            self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self.schedule()
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            if not self._dirty:
+                return
+            progress, message, delta = self.progress, self.message, self._delta or None
+            self._delta = {}
+            self._dirty = False
+            self._last_flush_at = time.monotonic()
+            self._last_flushed_progress = progress
+            await self.emit(progress, message, delta)
+        if self._dirty:
+            self._arm_timer()
+
+    def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,99 @@
+from importlib import import_module
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Type, Union
+import json
+
+from . import network
+from .base import BaseToolRunner
+
+
+ENTRY_POINT_GROUP = 'cybersec_toolkit.runners'
+
+TOOL_DEFINITIONS_PATH = Path(__file__).resolve().parents[2] / 'data' / 'tool_definitions.json'
+
+RUNNER_MODULES: Dict[str, str] = {
+    name: f"{network.__name__}{module}" for name, module in network.RUNNER_MODULES.items()
+}
+
+
+class RunnerRegistry:
+    def __init__(
+        self,
+        modules: Optional[Dict[str, str]] = None,
+        entry_point_group: Optional[str] = ENTRY_POINT_GROUP,
+        definitions_path: Optional[Path] = TOOL_DEFINITIONS_PATH
+    ):
+        self._targets: Dict[str, str] = {
+            name: f"{module}:{name}" for name, module in (RUNNER_MODULES if modules is None else modules).items()
+        }
+        self._classes: Dict[str, Type[BaseToolRunner]] = {}
+        self._entry_point_group = entry_point_group
+        self._entry_points_loaded = entry_point_group is None
+        self._definitions_path = definitions_path
+        self._tool_runners: Optional[Dict[str, str]] = None
+
+    def register(self, name: str, runner: Union[str, Type[BaseToolRunner]]):
+        if isinstance(runner, str):
+            self._targets[name] = runner
+            self._classes.pop(name, None)
+        else:
+            self._classes[name] = runner
+
+    def __setitem__(self, name: str, runner: Union[str, Type[BaseToolRunner]]):
+        self.register(name, runner)
+
+    def __getitem__(self, name: str) -> Type[BaseToolRunner]:
+        return self.resolve(name)
+
+    def __contains__(self, name: str) -> bool:
+        if name in self._classes or name in self._targets:
+            return True
+        self._load_entry_points()
+        return name in self._targets
+
+    def __iter__(self) -> Iterator[str]:
+        self._load_entry_points()
+        return iter(sorted(set(self._targets) | set(self._classes)))
+
+    def resolve(self, name: str) -> Type[BaseToolRunner]:
+        runner = self._classes.get(name)
+        if runner is not None:
+            return runner
+        if name not in self:
+            raise ValueError(f"Unknown runner class: {name}")
+
+        module_name, _, attribute = self._targets[name].partition(':')
+        runner = import_module(module_name)
+        for part in (attribute or name).split('.'):
+            runner = getattr(runner, part)
+        if not (isinstance(runner, type) and issubclass(runner, BaseToolRunner)):
+            raise ValueError(f"Runner {name} does not resolve to a BaseToolRunner subclass")
+        self._classes[name] = runner
+        return runner
+
+    def loaded(self) -> List[str]:
+        return sorted(self._classes)
+
+    def for_tool(self, tool_id: str) -> str:
+        if self._tool_runners is None:
+            self._tool_runners = self._read_tool_definitions()
+        return self._tool_runners.get(tool_id) or (tool_id if tool_id in self else '')
+
+    def _read_tool_definitions(self) -> Dict[str, str]:
+        if self._definitions_path is None or not self._definitions_path.exists():
+            return {}
+        with open(self._definitions_path, 'r') as f:
+            data = json.load(f)
+        return {
+            tool['id']: tool['runner_class']
+            for tool in data.get('tools', [])
+            if tool.get('runner_class')
+        }
+
+    def _load_entry_points(self):
+        if self._entry_points_loaded:
+            return
+        self._entry_points_loaded = True
+        for entry_point in entry_points(group=self._entry_point_group):
+            self._targets.setdefault(entry_point.name, entry_point.value)
@@ -0,0 +1,68 @@
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+import re
+import uuid
+
+import aiofiles
+
+from app.core.config import settings
+
+
+UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLargeError(Exception):
+    pass
+
+
+def upload_dir() -> Path:
+    path = Path(settings.UPLOAD_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def upload_path(upload_id: str) -> Path:
+    if not isinstance(upload_id, str) or not UPLOAD_ID_PATTERN.match(upload_id):
+        raise ValueError("Invalid upload id")
+    path = upload_dir() / upload_id
+    if not path.is_file():
+        raise ValueError(f"Upload not found: {upload_id}")
+    return path
+
+
+async def store_upload(file: Any, max_size: Optional[int] = None) -> Dict[str, Any]:
+    max_size = max_size or settings.MAX_UPLOAD_SIZE
+    upload_id = uuid.uuid4().hex
+    path = upload_dir() / upload_id
+    size = 0
+    lines = 0
+    last = b''
+
+    try:
+        async with aiofiles.open(path, 'wb') as out:
+            while True:
+                chunk = await file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(f"Upload exceeds the {max_size} byte limit")
+                lines += chunk.count(b'\n')
+                last = chunk[-1:]
+                await out.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+
+    if last and last != b'\n':
+        lines += 1
+    return {'upload_id': upload_id, 'size': size, 'lines': lines}
+
+
+def iter_upload_lines(upload_id: str) -> Iterator[str]:
+    with open(upload_path(upload_id), 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
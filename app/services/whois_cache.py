@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import WhoisRecord
+
+
+class WhoisCache:
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        ttl: int = 86400,
+        timeout: float = 15.0,
+        max_workers: int = 4,
+        enabled: bool = True
+    ):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.enabled = enabled
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._counters = dict.fromkeys(('hits', 'misses', 'coalesced', 'timeouts', 'errors'), 0)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='whois')
+        return self._executor
+
+    async def lookup(
+        self,
+        domain: str,
+        fetch: Callable[[str], Any],
+        use_cache: bool = True
+    ) -> Tuple[Dict[str, Any], Optional[datetime]]:
+        loop = asyncio.get_running_loop()
+        if self.enabled and use_cache:
+            cached = await loop.run_in_executor(None, self._load, domain)
+            if cached is not None:
+                self._counters['hits'] += 1
+                return cached
+
+        task = self._inflight.get(domain)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            self._counters['coalesced'] += 1
+        else:
+            self._counters['misses'] += 1
+            task = asyncio.ensure_future(self._fetch_and_store(domain, fetch))
+            self._inflight[domain] = task
+            task.add_done_callback(lambda done: self._inflight.pop(domain, None) if self._inflight.get(domain) is done else None)
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        with self.session_factory() as db:
+            now = datetime.utcnow()
+            size = db.query(WhoisRecord).filter(WhoisRecord.expires_at > now).count()
+        return {
+            'enabled': self.enabled,
+            'ttl': self.ttl,
+            'size': size,
+            'in_flight': len(self._inflight),
+            **self._counters,
+        }
+
+    def clear(self):
+        with self.session_factory() as db:
+            db.query(WhoisRecord).delete()
+            db.commit()
+        for key in self._counters:
+            self._counters[key] = 0
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _fetch_and_store(self, domain: str, fetch: Callable[[str], Any]) -> Tuple[Dict[str, Any], None]:
+        loop = asyncio.get_running_loop()
+        try:
+            if asyncio.iscoroutinefunction(fetch):
+                pending = fetch(domain)
+            else:
+                pending = loop.run_in_executor(self.executor, fetch, domain)
+            data = await asyncio.wait_for(pending, self.timeout)
+        except asyncio.TimeoutError:
+            self._counters['timeouts'] += 1
+            raise
+        except Exception:
+            self._counters['errors'] += 1
+            raise
+        if self.enabled and self.ttl > 0:
+            await loop.run_in_executor(None, self._store, domain, data)
+        return data, None
+
+    def _load(self, domain: str) -> Optional[Tuple[Dict[str, Any], datetime]]:
+        try:
+            with self.session_factory() as db:
+                record = db.query(WhoisRecord).filter(WhoisRecord.domain == domain).first()
+                if record is None or record.expires_at <= datetime.utcnow():
+                    return None
+                return record.data, record.fetched_at
+        except SQLAlchemyError:
+            return None
+
+    def _store(self, domain: str, data: Dict[str, Any]):
+        now = datetime.utcnow()
+        try:
+            with self.session_factory() as db:
+                db.merge(WhoisRecord(domain=domain, data=data, fetched_at=now, expires_at=now + timedelta(seconds=self.ttl)))
+                db.commit()
+        except SQLAlchemyError:
+            pass
+
+
+whois_cache = WhoisCache(
+    ttl=settings.WHOIS_CACHE_TTL,
+    timeout=settings.WHOIS_TIMEOUT,
+    max_workers=settings.WHOIS_MAX_WORKERS,
+    enabled=settings.WHOIS_CACHE_ENABLED
+)
@@ -0,0 +1,280 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+import asyncio
+import builtins
+import importlib
+import multiprocessing
+import signal
+import threading
+
+from app.services.tools.base import BaseToolRunner
+
+
+def load_runner_class(path: Tuple[str, str]) -> Type[BaseToolRunner]:
+    module_name, qualname = path
+    target: Any = importlib.import_module(module_name)
+    for name in qualname.split('.'):
+        target = getattr(target, name)
+    return target
+
+
+def _rebuild_exception(kind: str, message: str) -> Exception:
+    exception_type = getattr(builtins, kind, None)
+    if isinstance(exception_type, type) and issubclass(exception_type, Exception):
+        return exception_type(message)
+    return RuntimeError(message)
+
+
+def _worker_main(conn):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(_WorkerServer(conn).serve())
+
+
+class _WorkerServer:
+    def __init__(self, conn):
+        self.conn = conn
+        self.runners: Dict[str, BaseToolRunner] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                message = await loop.run_in_executor(None, self.conn.recv)
+            except (EOFError, OSError):
+                break
+
+            kind = message[0]
+            if kind == 'shutdown':
+                break
+            if kind == 'run':
+                self.tasks[message[1]] = asyncio.create_task(self._run(*message[1:]))
+            elif kind == 'stop' and message[1] in self.runners:
+                self.runners[message[1]].request_stop(message[2])
+            elif kind == 'cancel' and message[1] in self.tasks:
+                self.tasks[message[1]].cancel()
+
+        for task in list(self.tasks.values()):
+            task.cancel()
+        if self.tasks:
+            await asyncio.wait(list(self.tasks.values()))
+
+    async def _run(self, execution_id: str, runner_path: Tuple[str, str], parameters: Dict[str, Any], stop_reason: Optional[str]):
+        runner = None
+        try:
+            runner = load_runner_class(runner_path)(execution_id, self._send_progress)
+            self.runners[execution_id] = runner
+            if stop_reason:
+                runner.request_stop(stop_reason)
+            result = await runner.execute(parameters)
+            reply = ('result', execution_id, result, runner.stop_reason)
+        except asyncio.CancelledError:
+            reply = ('cancelled', execution_id)
+        except Exception as e:
+            reply = ('error', execution_id, type(e).__name__, str(e))
+        finally:
+            self.runners.pop(execution_id, None)
+            self.tasks.pop(execution_id, None)
+
+        if runner is not None:
+            await runner.flush_progress()
+        self._send(reply)
+
+    async def _send_progress(self, execution_id: str, progress: int, message: Optional[str], partial_result: Optional[Dict[str, Any]]):
+        self._send(('progress', execution_id, progress, message, partial_result))
+
+    def _send(self, message: tuple):
+        try:
+            self.conn.send(message)
+        except (OSError, ValueError):
+            pass
+
+
+class _WorkerProcess:
+    def __init__(self, context, loop: asyncio.AbstractEventLoop, name: str):
+        self.loop = loop
+        self.runners: Dict[str, 'RemoteRunner'] = {}
+        self.exited = False
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), name=name, daemon=True)
+        self.process.start()
+        child_conn.close()
+        self._send_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read, name=f"{name}-reader", daemon=True)
+        self._reader.start()
+
+    @property
+    def alive(self) -> bool:
+        return not self.exited and self.process.is_alive()
+
+    def send(self, message: tuple):
+        with self._send_lock:
+            self.conn.send(message)
+
+    def close(self, timeout: float = 5.0):
+        try:
+            self.send(('shutdown',))
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+    def _read(self):
+        while True:
+            try:
+                message = self.conn.recv()
+            except (EOFError, OSError):
+                break
+            if not self._call_soon(self._dispatch, message):
+                return
+        self._call_soon(self._on_exit)
+
+    def _call_soon(self, callback: Callable, *args) -> bool:
+        try:
+            self.loop.call_soon_threadsafe(callback, *args)
+            return True
+        except RuntimeError:
+            return False
+
+    def _dispatch(self, message: tuple):
+        runner = self.runners.get(message[1])
+        if runner is not None:
+            runner._handle(message)
+
+    def _on_exit(self):
+        self.exited = True
+        for runner in list(self.runners.values()):
+            runner._fail(RuntimeError("Worker process exited unexpectedly"))
+        self.runners.clear()
+
+
+class WorkerPool:
+    def __init__(self, processes: int):
+        self.processes = max(1, processes)
+        self._context = multiprocessing.get_context('spawn')
+        self._workers: List[_WorkerProcess] = []
+        self._started = 0
+
+    def runner(self, runner_class: Type[BaseToolRunner], execution_id: str, progress_callback: Optional[Callable] = None) -> 'RemoteRunner':
+        return RemoteRunner(self, runner_class, execution_id, progress_callback)
+
+    def assign(self, runner: 'RemoteRunner') -> _WorkerProcess:
+        loop = asyncio.get_running_loop()
+        for worker in [worker for worker in self._workers if worker.loop is not loop or not worker.alive]:
+            self._workers.remove(worker)
+            worker.close()
+        idle = [worker for worker in self._workers if not worker.runners]
+        if idle:
+            worker = idle[0]
+        elif len(self._workers) < self.processes:
+            self._started += 1
+            worker = _WorkerProcess(self._context, loop, f"tool-worker-{self._started}")
+            self._workers.append(worker)
+        else:
+            worker = min(self._workers, key=lambda candidate: len(candidate.runners))
+        worker.runners[runner.execution_id] = runner
+        return worker
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'processes': self.processes,
+            'workers': [
+                {'pid': worker.process.pid, 'running': len(worker.runners)}
+                for worker in self._workers if worker.alive
+            ],
+        }
+
+    def shutdown(self):
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.close()
+
+
+class RemoteRunner:
+    def __init__(self, pool: WorkerPool, runner_class: Type[BaseToolRunner], execution_id: str, progress_callback: Optional[Callable] = None):
+        self.pool = pool
+        self.runner_class = runner_class
+        self.execution_id = execution_id
+        self.progress_callback = progress_callback
+        self.priority_class = runner_class.priority_class
+        self.max_execution_time = runner_class.max_execution_time
+        self.stop_event = asyncio.Event()
+        self.stop_reason: Optional[str] = None
+        self._local = runner_class(execution_id)
+        self._worker: Optional[_WorkerProcess] = None
+        self._future: Optional[asyncio.Future] = None
+        self._last_emit: Optional[asyncio.Future] = None
+
+    @property
+    def stop_requested(self) -> bool:
+        return self.stop_event.is_set()
+
+    def request_stop(self, reason: str):
+        if self.stop_event.is_set():
+            return
+        self.stop_reason = reason
+        self.stop_event.set()
+        if self._worker is not None and not self._future.done():
+            self._send(('stop', self.execution_id, reason))
+
+    def validate_parameters(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        return self._local.validate_parameters(parameters)
+
+    async def execute(self, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        self._future = asyncio.get_running_loop().create_future()
+        self._worker = self.pool.assign(self)
+        runner_path = (self.runner_class.__module__, self.runner_class.__qualname__)
+        self._send(('run', self.execution_id, runner_path, parameters, self.stop_reason))
+        try:
+            return await self._future
+        except asyncio.CancelledError:
+            self._send(('cancel', self.execution_id))
+            raise
+        finally:
+            self._worker.runners.pop(self.execution_id, None)
+
+    def partial_result(self) -> Dict[str, Any]:
+        return self._local.partial_result()
+
+    async def flush_progress(self):
+        if self._last_emit is not None:
+            await asyncio.wait({self._last_emit})
+
+    def _send(self, message: tuple):
+        try:
+            self._worker.send(message)
+        except (OSError, ValueError) as e:
+            self._fail(RuntimeError(f"Worker process unavailable: {e}"))
+
+    def _handle(self, message: tuple):
+        kind = message[0]
+        if kind == 'progress':
+            _, _, progress, text, delta = message
+            self._local.receive_progress(progress, text, delta)
+            if self.progress_callback:
+                self._last_emit = asyncio.ensure_future(self._emit_after(self._last_emit, progress, text, delta))
+        elif self._future.done():
+            return
+        elif kind == 'result':
+            _, _, result, stop_reason = message
+            if stop_reason and self.stop_reason is None:
+                self.stop_reason = stop_reason
+            self._future.set_result(result)
+        elif kind == 'error':
+            self._future.set_exception(_rebuild_exception(message[2], message[3]))
+        elif kind == 'cancelled':
+            self._future.set_exception(RuntimeError("Execution was cancelled in the worker process"))
+
+    def _fail(self, error: Exception):
+        if self._future is not None and not self._future.done():
+            self._future.set_exception(error)
+
+    async def _emit_after(self, previous: Optional[asyncio.Future], progress: int, message: Optional[str], delta: Optional[Dict[str, Any]]):
+        if previous is not None:
+            await asyncio.wait({previous})
+        try:
+            await self.progress_callback(self.execution_id, progress, message, delta)
+        except Exception:
+            pass
@@ -8,6 +8,7 @@ from app.main import app
 from app.db.base import Base
 from app.db.session import get_db
 from app.models import Tool
+from app.services.execution_engine import execution_engine
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
@@ -26,6 +27,7 @@ def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+execution_engine.session_factory = TestingSessionLocal
 
 
 @pytest.fixture(scope="function")
@@ -152,3 +154,186 @@ def test_get_execution(test_db):
     assert response.status_code == 200
     data = response.json()
     assert data["id"] == execution_id
+
+
+def test_execute_tool_reports_admission(test_db):
+    response = client.post(
+        "/api/tools/dns_lookup/execute",
+        json={
+            "parameters": {
+                "domain": "example.com"
+            },
+            "user_id": "alice"
+        }
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["priority"] == "interactive"
+    assert "queue_position" in data
+    
+    execution = client.get(f"/api/executions/{data['id']}").json()
+    assert execution["wait_time_ms"] is not None
+
+
+def test_execute_tool_invalid_priority(test_db):
+    response = client.post(
+        "/api/tools/dns_lookup/execute",
+        json={
+            "parameters": {
+                "domain": "example.com"
+            },
+            "priority": "urgent"
+        }
+    )
+    assert response.status_code == 400
+
+
+def test_cancel_execution_not_found(test_db):
+    response = client.post("/api/executions/nonexistent/cancel")
+    assert response.status_code == 404
+
+
+def test_cancel_finished_execution(test_db):
+    response = client.post(
+        "/api/tools/dns_lookup/execute",
+        json={
+            "parameters": {
+                "domain": "example.com"
+            }
+        }
+    )
+    execution_id = response.json()["id"]
+
+    response = client.post(f"/api/executions/{execution_id}/cancel")
+    assert response.status_code == 409
+
+
+def test_upload_domain_list(test_db, tmp_path, monkeypatch):
+    from app.core.config import settings
+    monkeypatch.setattr(settings, 'UPLOAD_DIR', str(tmp_path))
+
+    response = client.post(
+        "/api/uploads",
+        files={"file": ("domains.txt", b"example.com\nexample.org\n", "text/plain")}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["filename"] == "domains.txt"
+    assert data["lines"] == 2
+    assert (tmp_path / data["upload_id"]).read_bytes() == b"example.com\nexample.org\n"
+
+
+def test_dns_cache_stats(test_db):
+    response = client.get("/api/cache/dns")
+    assert response.status_code == 200
+    data = response.json()
+    assert {"hits", "misses", "size", "max_entries", "hit_ratio"} <= set(data)
+
+    response = client.delete("/api/cache/dns")
+    assert response.status_code == 200
+    assert response.json()["size"] == 0
+
+
+def test_dns_upstreams(test_db):
+    response = client.get("/api/dns/upstreams")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["configured"] is False
+    assert data["upstreams"] == []
+
+
+def test_whois_cache_stats(test_db, monkeypatch):
+    from app.services.whois_cache import whois_cache
+    monkeypatch.setattr(whois_cache, "session_factory", TestingSessionLocal)
+
+    response = client.get("/api/cache/whois")
+    assert response.status_code == 200
+    assert {"hits", "misses", "coalesced", "timeouts", "size"} <= set(response.json())
+
+    response = client.delete("/api/cache/whois")
+    assert response.status_code == 200
+    assert response.json()["size"] == 0
+
+
+def test_monitor_windows(test_db):
+    from datetime import datetime
+    from app.models import LatencyWindow
+
+    db = TestingSessionLocal()
+    db.add(LatencyWindow(
+        execution_id="monitor-1", target="example.com", address="192.0.2.1",
+        window_start=datetime(2024, 1, 1, 0, 0), window_end=datetime(2024, 1, 1, 0, 1),
+        samples=60, lost=3, loss_percent=5.0, min_ms=1.0, avg_ms=2.0,
+        p50_ms=2.0, p95_ms=3.5, p99_ms=4.0, max_ms=4.5
+    ))
+    db.commit()
+    db.close()
+
+    response = client.get("/api/monitors/monitor-1/windows")
+    assert response.status_code == 200
+    windows = response.json()["windows"]
+    assert len(windows) == 1
+    assert windows[0]["p95_ms"] == 3.5
+    assert windows[0]["loss_percent"] == 5.0
+
+    response = client.get("/api/monitors/monitor-1/windows", params={"target": "other.example"})
+    assert response.json()["windows"] == []
+
+    response = client.get("/api/monitors")
+    assert response.status_code == 200
+    assert response.json()["monitors"] == []
+
+    response = client.get("/api/monitors/monitor-1")
+    assert response.status_code == 404
+
+
+def test_monitor_mirror_requires_active_execution(test_db, monkeypatch):
+    from app.services.tools.network.latency_monitor import LatencyMonitorRunner, active_monitors
+
+    mirror = LatencyMonitorRunner("monitor-2")
+    mirror.receive_progress(10, None, {'monitor': {
+        'method': 'icmp', 'interval': 1.0, 'windows': [60], 'capacity': 61,
+        'targets': {'example.com': '192.0.2.1'}, 'started_at': 1700000000.0
+    }})
+    mirror.receive_progress(50, None, {'samples': [[1700000001.0, {'example.com': 2.5}], [1700000002.0, {}]]})
+    try:
+        monkeypatch.setattr(execution_engine, "is_execution_active", lambda execution_id: execution_id == "monitor-2")
+        response = client.get("/api/monitors/monitor-2/samples", params={"seconds": 0})
+        assert response.status_code == 200
+        assert response.json()["samples"] == {"example.com": [[1700000001.0, 2.5], [1700000002.0, None]]}
+        assert [monitor["rounds"] for monitor in client.get("/api/monitors").json()["monitors"]] == [2]
+
+        monkeypatch.setattr(execution_engine, "is_execution_active", lambda execution_id: False)
+        assert client.get("/api/monitors/monitor-2").status_code == 404
+        assert client.get("/api/monitors").json()["monitors"] == []
+    finally:
+        active_monitors.pop("monitor-2", None)
+
+
+def test_certificates(test_db):
+    from datetime import datetime
+    from app.models import Certificate
+
+    db = TestingSessionLocal()
+    db.add(Certificate(
+        fingerprint_sha256="ab" * 32, subject="example.com", issuer="Example CA",
+        not_after=datetime(2030, 1, 1), details={"subject": {"commonName": "example.com"}, "san": [["DNS", "example.com"]]},
+        first_seen=datetime(2024, 1, 1), last_seen=datetime(2024, 2, 1)
+    ))
+    db.commit()
+    db.close()
+
+    response = client.get("/api/certificates", params={"subject": "example.com"})
+    assert response.status_code == 200
+    assert [item["fingerprint_sha256"] for item in response.json()["certificates"]] == ["ab" * 32]
+
+    response = client.get("/api/certificates", params={"expiring_within_days": 30})
+    assert response.json()["certificates"] == []
+
+    response = client.get("/api/certificates/" + ":".join(["AB"] * 32))
+    assert response.status_code == 200
+    assert response.json()["san"] == [["DNS", "example.com"]]
+    assert response.json()["last_seen"] == "2024-02-01T00:00:00"
+
+    response = client.get("/api/certificates/" + "00" * 32)
+    assert response.status_code == 404
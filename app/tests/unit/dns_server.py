@@ -0,0 +1,75 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+
+
+class StubDNSServer(asyncio.DatagramProtocol):
+    def __init__(
+        self,
+        records: Dict[Tuple[str, str], List[str]],
+        delays: Optional[Dict[str, float]] = None,
+        drop: Iterable[str] = (),
+        nxdomain: Iterable[str] = (),
+        ttl: int = 300,
+        soa_minimum: Optional[int] = None,
+        wildcard: Optional[Dict[str, List[str]]] = None,
+        nxdomain_by_default: bool = False
+    ):
+        self.records = records
+        self.delays = delays or {}
+        self.drop = set(drop)
+        self.nxdomain = set(nxdomain)
+        self.ttl = ttl
+        self.soa_minimum = soa_minimum
+        self.wildcard = wildcard or {}
+        self.nxdomain_by_default = nxdomain_by_default
+        self.queries: List[Tuple[str, str]] = []
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        query = dns.message.from_wire(data)
+        question = query.question[0]
+        name = question.name.to_text(omit_final_dot=True)
+        record_type = dns.rdatatype.to_text(question.rdtype)
+        self.queries.append((name, record_type))
+        if record_type in self.drop:
+            return
+
+        response = dns.message.make_response(query)
+        known = any(key[0] == name for key in self.records)
+        values = self.records.get((name, record_type))
+        if values is None and not known:
+            values = self.wildcard.get(record_type)
+        if name in self.nxdomain or (self.nxdomain_by_default and not known and not self.wildcard):
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        elif values:
+            response.answer.append(dns.rrset.from_text_list(question.name, self.ttl, 'IN', record_type, values))
+        if not response.answer and self.soa_minimum is not None:
+            response.authority.append(dns.rrset.from_text(
+                question.name.parent(), self.ttl, 'IN', 'SOA',
+                f"ns.example. hostmaster.example. 1 7200 3600 1209600 {self.soa_minimum}"
+            ))
+        wire = response.to_wire()
+        asyncio.get_running_loop().call_later(self.delays.get(record_type, 0), self.transport.sendto, wire, addr)
+
+    @property
+    def port(self) -> int:
+        return self.transport.get_extra_info('sockname')[1]
+
+    def close(self):
+        self.transport.close()
+
+
+async def start_stub_dns_server(*args, **kwargs) -> StubDNSServer:
+    loop = asyncio.get_running_loop()
+    _, server = await loop.create_datagram_endpoint(
+        lambda: StubDNSServer(*args, **kwargs), local_addr=('127.0.0.1', 0)
+    )
+    return server
@@ -0,0 +1,119 @@
+import pytest
+import asyncio
+from app.services.admission import AdmissionScheduler, QueueFullError
+
+
+def make_scheduler(max_running=1, max_queued=10, reserved=0, monitors=0):
+    return AdmissionScheduler(
+        max_running,
+        max_queued,
+        {"interactive": 4, "standard": 2, "bulk": 1},
+        reserved_interactive_slots=reserved,
+        monitor_slots=monitors
+    )
+
+
+@pytest.mark.asyncio
+async def test_enqueue_admits_up_to_max_running():
+    scheduler = make_scheduler(max_running=2)
+
+    assert scheduler.enqueue("a", "alice", "bulk") == 0
+    assert scheduler.enqueue("b", "alice", "bulk") == 0
+    assert scheduler.enqueue("c", "alice", "bulk") == 1
+    assert scheduler.running_count == 2
+    assert scheduler.queued_count == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_full():
+    scheduler = make_scheduler(max_running=1, max_queued=1)
+    scheduler.enqueue("a", None, "standard")
+    scheduler.enqueue("b", None, "standard")
+
+    with pytest.raises(QueueFullError):
+        scheduler.enqueue("c", None, "standard")
+
+
+@pytest.mark.asyncio
+async def test_users_share_fairly():
+    scheduler = make_scheduler()
+    scheduler.enqueue("running", "alice", "standard")
+    for index in range(3):
+        scheduler.enqueue(f"alice-{index}", "alice", "standard")
+    scheduler.enqueue("bob-0", "bob", "standard")
+
+    assert scheduler.position("bob-0") == 2
+    assert scheduler.position("alice-2") == 4
+
+
+@pytest.mark.asyncio
+async def test_interactive_class_overtakes_bulk():
+    scheduler = make_scheduler()
+    scheduler.enqueue("sweep", "alice", "bulk")
+    for index in range(3):
+        scheduler.enqueue(f"sweep-{index}", "alice", "bulk")
+    scheduler.enqueue("dns", "bob", "interactive")
+
+    assert scheduler.position("dns") == 1
+
+    scheduler.release("sweep")
+    assert scheduler.position("dns") is None
+    assert scheduler.running_count == 1
+    assert scheduler.position("sweep-0") == 1
+
+
+@pytest.mark.asyncio
+async def test_reserved_interactive_slots():
+    scheduler = make_scheduler(max_running=2, reserved=1)
+    scheduler.enqueue("sweep-0", "alice", "bulk")
+    scheduler.enqueue("sweep-1", "alice", "bulk")
+    scheduler.enqueue("dns", "bob", "interactive")
+
+    assert scheduler.running_count == 2
+    assert scheduler.position("sweep-1") == 1
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_release():
+    scheduler = make_scheduler()
+    scheduler.enqueue("a", None, "standard")
+    scheduler.enqueue("b", None, "standard")
+
+    assert await scheduler.acquire("a") >= 0
+    waiter = asyncio.ensure_future(scheduler.acquire("b"))
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    scheduler.release("a")
+    assert await asyncio.wait_for(waiter, 1) >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_remove_queued_execution():
+    scheduler = make_scheduler()
+    scheduler.enqueue("a", None, "standard")
+    scheduler.enqueue("b", None, "standard")
+
+    assert scheduler.remove("b") is True
+    assert scheduler.remove("a") is False
+    assert scheduler.queued_count == 0
+
+
+@pytest.mark.asyncio
+async def test_monitors_have_their_own_capped_slots():
+    scheduler = make_scheduler(max_running=1, monitors=2)
+    for index in range(3):
+        scheduler.enqueue(f"monitor-{index}", "alice", "monitor")
+    scheduler.enqueue("scan", "bob", "bulk")
+
+    assert scheduler.running_count == 3
+    assert scheduler.running_monitors == 2
+    assert scheduler.position("scan") is None
+    assert scheduler.position("monitor-2") == 1
+
+    scheduler.enqueue("dns", "bob", "interactive")
+    assert scheduler.position("dns") == 1
+
+    scheduler.release("monitor-0")
+    assert scheduler.position("monitor-2") is None
+    assert scheduler.stats()["running_monitors"] == 2
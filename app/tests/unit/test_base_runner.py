@@ -1,4 +1,5 @@
 import pytest
+import asyncio
 from app.services.tools.base import BaseToolRunner
 
 
@@ -72,3 +73,60 @@ async def test_redact_sensitive_data():
     assert "[REDACTED]" in redacted["password"]
     assert "[REDACTED]" in redacted["api_key"]
     assert redacted["safe_data"] == "This is safe"
+
+
+@pytest.mark.asyncio
+async def test_report_progress_coalesces_updates():
+    emitted = []
+
+    async def callback(execution_id, progress, message, partial_result):
+        emitted.append((progress, message, partial_result))
+
+    runner = MockRunner("test-id", callback)
+    runner._progress.interval = 60
+
+    for port in range(1, 4):
+        runner.report_progress(10 + port, f"Found open port: {port}", {"open_ports": [port], "open_ports_count": port})
+    await runner.update_progress(100, "Scan complete")
+
+    assert emitted == [
+        (100, "Scan complete", {"open_ports": [1, 2, 3], "open_ports_count": 3}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_report_progress_flushes_on_percentage_step():
+    emitted = []
+
+    async def callback(execution_id, progress, message, partial_result):
+        emitted.append((progress, partial_result))
+
+    runner = MockRunner("test-id", callback)
+    runner._progress.interval = 60
+    runner._progress.min_step = 20
+
+    runner.report_progress(5, None, {"records": {"A": ["1.1.1.1"]}})
+    runner.report_progress(25, None, {"records": {"MX": ["mail"]}})
+    await asyncio.sleep(0)
+
+    assert emitted == [(25, {"records": {"A": ["1.1.1.1"], "MX": ["mail"]}})]
+
+
+@pytest.mark.asyncio
+async def test_report_progress_flushes_after_interval():
+    emitted = []
+
+    async def callback(execution_id, progress, message, partial_result):
+        emitted.append(progress)
+
+    runner = MockRunner("test-id", callback)
+    runner._progress.interval = 0.05
+    runner._progress.min_step = 100
+
+    runner.report_progress(11)
+    runner.report_progress(12)
+    await asyncio.sleep(0)
+    runner.report_progress(13)
+    await asyncio.sleep(0.1)
+
+    assert emitted == [12, 13]
@@ -0,0 +1,148 @@
+import pytest
+import io
+
+import dns.asyncresolver
+
+from app.core.config import settings
+from app.services.tools.network.bulk_dns import BulkDNSLookupRunner
+from app.services.uploads import store_upload
+from app.tests.unit.dns_server import start_stub_dns_server
+
+
+class AsyncBytes:
+    def __init__(self, data):
+        self.buffer = io.BytesIO(data)
+
+    async def read(self, size):
+        return self.buffer.read(size)
+
+
+def _use_stub_server(runner, server):
+    def make_resolver():
+        resolver = dns.asyncresolver.Resolver(configure=False)
+        resolver.nameservers = ['127.0.0.1']
+        resolver.port = server.port
+        return resolver
+    runner._make_resolver = make_resolver
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'UPLOAD_DIR', str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters_requires_domains():
+    runner = BulkDNSLookupRunner("test-id")
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"domains": ["example.com", "bad domain"]})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"domains": "example.com", "concurrency": 0})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"upload_id": "../../etc/passwd"})
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters_inline_list():
+    runner = BulkDNSLookupRunner("test-id")
+    validated = runner.validate_parameters({"domains": "a.example, b.example\nc.example", "record_types": "a,mx"})
+
+    assert validated["domains"] == ["a.example", "b.example", "c.example"]
+    assert validated["record_types"] == ["A", "MX"]
+
+
+@pytest.mark.asyncio
+async def test_execute_returns_columnar_results():
+    server = await start_stub_dns_server(
+        {
+            ('a.example', 'A'): ['192.0.2.1', '192.0.2.2'],
+            ('a.example', 'MX'): ['10 mail.a.example.'],
+            ('b.example', 'A'): ['192.0.2.3'],
+        },
+        nxdomain=['missing.example']
+    )
+    runner = BulkDNSLookupRunner("test-id")
+    _use_stub_server(runner, server)
+    try:
+        result = await runner.execute({
+            "domains": ["a.example", "b.example", "missing.example", "A.example."],
+            "record_types": ["A", "MX"]
+        })
+    finally:
+        server.close()
+
+    assert result["total_domains"] == 3
+    assert result["resolved"] == 2
+    assert result["nxdomain"] == 1
+    assert result["queries"] == 6
+    assert result["queries_per_second"] > 0
+
+    rows = {
+        domain: (status, result["records"]["A"][index], result["records"]["MX"][index])
+        for index, (domain, status) in enumerate(zip(result["domains"], result["status"]))
+    }
+    assert rows["a.example"][0] == "ok"
+    assert sorted(rows["a.example"][1]) == ["192.0.2.1", "192.0.2.2"]
+    assert rows["a.example"][2] == ["10 mail.a.example."]
+    assert rows["b.example"] == ("ok", ["192.0.2.3"], [])
+    assert rows["missing.example"] == ("nxdomain", None, None)
+
+
+@pytest.mark.asyncio
+async def test_execute_streams_results_as_progress():
+    server = await start_stub_dns_server({(f"host{index}.example", 'A'): ['192.0.2.1'] for index in range(20)})
+    updates = []
+
+    async def callback(execution_id, progress, message, partial_result):
+        updates.append(partial_result or {})
+
+    runner = BulkDNSLookupRunner("test-id", callback)
+    _use_stub_server(runner, server)
+    try:
+        result = await runner.execute({
+            "domains": [f"host{index}.example" for index in range(20)],
+            "record_types": ["A"],
+            "concurrency": 4
+        })
+        await runner.flush_progress()
+    finally:
+        server.close()
+
+    streamed = [domain for update in updates for domain in update.get("domains", [])]
+    assert sorted(streamed) == sorted(result["domains"])
+    assert len(server.queries) == 20
+
+
+@pytest.mark.asyncio
+async def test_execute_reads_uploaded_domains(upload_dir):
+    stored = await store_upload(AsyncBytes(b"# domains\na.example\n\nb.example\nnot a domain\n"))
+    assert stored["lines"] == 5
+
+    server = await start_stub_dns_server({('a.example', 'A'): ['192.0.2.1'], ('b.example', 'A'): ['192.0.2.2']})
+    runner = BulkDNSLookupRunner("test-id")
+    _use_stub_server(runner, server)
+    try:
+        result = await runner.execute({"upload_id": stored["upload_id"], "record_types": ["A"]})
+    finally:
+        server.close()
+
+    assert sorted(result["domains"]) == ["a.example", "b.example", "not a domain"]
+    assert result["resolved"] == 2
+    assert result["failed"] == 1
+    assert result["status"][result["domains"].index("not a domain")] == "invalid"
+
+
+@pytest.mark.asyncio
+async def test_store_upload_enforces_size_limit(upload_dir):
+    from app.services.uploads import UploadTooLargeError
+
+    with pytest.raises(UploadTooLargeError):
+        await store_upload(AsyncBytes(b"x" * 100), max_size=10)
+    assert list(upload_dir.iterdir()) == []
@@ -0,0 +1,127 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models import Certificate
+from app.services.certificate_cache import CertificateCache
+from app.tests.unit.tls_server import make_certificate
+
+from cryptography.hazmat.primitives import serialization
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="module")
+def ders():
+    return [
+        make_certificate(f"host{index}.test", san=[f"host{index}.test"], key_type='ec', days=30 + index)[0]
+        .public_bytes(serialization.Encoding.DER)
+        for index in range(3)
+    ]
+
+
+def test_parse_is_cached_by_fingerprint(session_factory, ders):
+    cache = CertificateCache(session_factory, max_entries=2, persist=False)
+
+    first = cache.parse(ders[0])
+    assert cache.parse(ders[0]) is first
+    assert first['subject'] == {'commonName': 'host0.test'}
+
+    cache.parse(ders[1])
+    cache.parse(ders[0])
+    cache.parse(ders[2])
+
+    assert len(cache) == 2
+    assert cache.lookup(first['fingerprint_sha256']) is first
+    stats = cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 3
+    assert stats['evictions'] == 1
+    assert stats['pending'] == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_stores_each_certificate_once(session_factory, ders):
+    cache = CertificateCache(session_factory, max_entries=1)
+
+    details = [cache.parse(der) for der in ders]
+    cache.parse(ders[0])
+    assert cache.stats()['pending'] == 3
+
+    await cache.flush()
+    assert cache.stats()['stored'] == 3
+    assert cache.stats()['pending'] == 0
+
+    with session_factory() as db:
+        records = {record.fingerprint_sha256: record for record in db.query(Certificate)}
+    assert set(records) == {item['fingerprint_sha256'] for item in details}
+    record = records[details[2]['fingerprint_sha256']]
+    assert record.subject == 'host2.test'
+    assert record.not_after == datetime.fromisoformat(details[2]['not_after'])
+    assert record.details['san'] == [['DNS', 'host2.test']]
+    first_seen = record.first_seen
+
+    cache.parse(ders[2])
+    await cache.flush()
+    assert cache.stats()['stored'] == 3
+
+    with session_factory() as db:
+        record = db.get(Certificate, details[2]['fingerprint_sha256'])
+        assert db.query(Certificate).count() == 3
+        assert record.first_seen == first_seen
+        assert record.last_seen >= first_seen
+
+    cache.clear()
+    assert cache.lookup(details[0]['fingerprint_sha256'])['subject'] == {'commonName': 'host0.test'}
+    assert cache.lookup('0' * 64) is None
+
+
+@pytest.mark.asyncio
+async def test_flush_survives_a_concurrent_insert(tmp_path, ders):
+    engine = create_engine(f"sqlite:///{tmp_path / 'certificates.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    rival = sessionmaker(bind=engine)
+    cache = CertificateCache(session_factory)
+    details = [cache.parse(der) for der in ders]
+    raced = details[1]
+    inserted = datetime(2020, 1, 1)
+    raced_in = []
+
+    def insert_first(session, context, instances):
+        if raced_in:
+            return
+        raced_in.append(True)
+        with rival() as db:
+            db.add(Certificate(
+                fingerprint_sha256=raced['fingerprint_sha256'],
+                subject='host1.test',
+                issuer='host1.test',
+                not_after=datetime.fromisoformat(raced['not_after']),
+                details=raced,
+                first_seen=inserted,
+                last_seen=inserted
+            ))
+            db.commit()
+
+    event.listen(session_factory, "before_flush", insert_first)
+    await cache.flush()
+
+    assert cache.stats()['stored'] == 2
+    assert cache.stats()['errors'] == 0
+    with session_factory() as db:
+        assert db.query(Certificate).count() == 3
+        record = db.get(Certificate, raced['fingerprint_sha256'])
+        assert record.first_seen == inserted
+        assert record.last_seen > inserted
+    engine.dispose()
@@ -1,5 +1,10 @@
 import pytest
+import time
+
+import dns.asyncresolver
+
 from app.services.tools.network.dns_lookup import DNSLookupRunner
+from app.tests.unit.dns_server import start_stub_dns_server
 
 
 @pytest.mark.asyncio
@@ -57,3 +62,81 @@ async def test_validate_parameters_invalid_domain():
     
     with pytest.raises(ValueError):
         runner.validate_parameters(params)
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters_invalid_timeout():
+    runner = DNSLookupRunner("test-id")
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"domain": "example.com", "timeout": 0})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"domain": "example.com", "timeout": "soon"})
+
+
+def _use_stub_server(runner, server):
+    def make_resolver():
+        resolver = dns.asyncresolver.Resolver(configure=False)
+        resolver.nameservers = ['127.0.0.1']
+        resolver.port = server.port
+        return resolver
+    runner._make_resolver = make_resolver
+
+
+@pytest.mark.asyncio
+async def test_execute_queries_record_types_concurrently():
+    server = await start_stub_dns_server(
+        {
+            ('example.com', 'A'): ['93.184.216.34'],
+            ('example.com', 'MX'): ['10 mail.example.com.'],
+            ('example.com', 'TXT'): ['"v=spf1 -all"'],
+        },
+        delays={'A': 0.3, 'MX': 0.3, 'TXT': 0.3}
+    )
+    runner = DNSLookupRunner("test-id")
+    _use_stub_server(runner, server)
+    try:
+        start = time.monotonic()
+        result = await runner.execute({"domain": "example.com", "record_types": ["A", "MX", "TXT", "NS"]})
+        elapsed = time.monotonic() - start
+    finally:
+        server.close()
+
+    assert elapsed < 0.8
+    assert list(result["records"]) == ["A", "MX", "TXT", "NS"]
+    assert result["records"]["A"] == ["93.184.216.34"]
+    assert result["records"]["MX"] == [{"preference": 10, "exchange": "mail.example.com."}]
+    assert result["records"]["NS"] == []
+    assert "partial" not in result
+
+
+@pytest.mark.asyncio
+async def test_execute_returns_partial_results_on_timeout():
+    server = await start_stub_dns_server(
+        {('example.com', 'A'): ['93.184.216.34']},
+        drop=['TXT']
+    )
+    runner = DNSLookupRunner("test-id")
+    _use_stub_server(runner, server)
+    try:
+        result = await runner.execute({"domain": "example.com", "record_types": ["A", "TXT"], "timeout": 0.5})
+    finally:
+        server.close()
+
+    assert result["records"]["A"] == ["93.184.216.34"]
+    assert "timed out" in result["records"]["TXT"]["error"]
+    assert result["timed_out"] == ["TXT"]
+    assert result["partial"] is True
+
+
+@pytest.mark.asyncio
+async def test_execute_nxdomain():
+    server = await start_stub_dns_server({}, nxdomain=['missing.example'])
+    runner = DNSLookupRunner("test-id")
+    _use_stub_server(runner, server)
+    try:
+        with pytest.raises(ValueError, match="does not exist"):
+            await runner.execute({"domain": "missing.example", "record_types": ["A", "MX"]})
+    finally:
+        server.close()
@@ -0,0 +1,213 @@
+import pytest
+import asyncio
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.models import Execution
+from app.services.execution_engine import ExecutionEngine
+from app.services.tools.base import BaseToolRunner
+
+
+class SlowRunner(BaseToolRunner):
+    max_execution_time = 1
+
+    def validate_parameters(self, parameters):
+        return parameters
+
+    async def execute(self, parameters):
+        for step in range(100):
+            if self.stop_requested and parameters.get('cooperative'):
+                return {'steps': step, 'partial': True}
+            self.report_progress(step, None, {'steps': [step]})
+            await asyncio.sleep(0.05)
+        return {'steps': 100}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+class MonitorRunner(SlowRunner):
+    priority_class = 'monitor'
+
+
+@pytest.fixture
+def engine(db):
+    engine = ExecutionEngine(sessionmaker(autocommit=False, autoflush=False, bind=db.get_bind()))
+    engine.runners['SlowRunner'] = SlowRunner
+    engine.runners['MonitorRunner'] = MonitorRunner
+    return engine
+
+
+def _create_execution(db, execution_id):
+    db.add(Execution(id=execution_id, tool_id="slow", status="pending", parameters={}))
+    db.commit()
+
+
+@pytest.mark.asyncio
+async def test_execution_times_out_with_cooperative_partial_result(db, engine):
+    _create_execution(db, "exec-1")
+    await engine.start_execution("exec-1", "SlowRunner", {'cooperative': True})
+
+    execution = db.query(Execution).filter(Execution.id == "exec-1").first()
+    assert execution.status == "timed_out"
+    assert execution.result['partial'] is True
+    assert 0 < execution.result['steps'] < 100
+    assert "time limit" in execution.error
+
+
+@pytest.mark.asyncio
+async def test_execution_times_out_with_accumulated_partial_result(db, engine, monkeypatch):
+    monkeypatch.setattr(settings, 'EXECUTION_GRACE_PERIOD', 0.1)
+    _create_execution(db, "exec-1")
+    await engine.start_execution("exec-1", "SlowRunner", {})
+
+    execution = db.query(Execution).filter(Execution.id == "exec-1").first()
+    assert execution.status == "timed_out"
+    assert execution.result['partial'] is True
+    assert execution.result['steps'][:3] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_execution(db, engine):
+    _create_execution(db, "exec-1")
+    task = asyncio.create_task(engine.start_execution("exec-1", "SlowRunner", {'cooperative': True}))
+    await asyncio.sleep(0.2)
+
+    assert await engine.cancel_execution("exec-1") is True
+    await task
+
+    execution = db.query(Execution).filter(Execution.id == "exec-1").first()
+    assert execution.status == "cancelled"
+    assert execution.result['partial'] is True
+    assert not engine.is_execution_active("exec-1")
+
+
+@pytest.mark.asyncio
+async def test_cancel_queued_execution(db, engine):
+    engine.admission.max_running = 1
+    engine.admission.reserved_interactive_slots = 0
+    _create_execution(db, "exec-1")
+    _create_execution(db, "exec-2")
+    first = asyncio.create_task(engine.start_execution("exec-1", "SlowRunner", {'cooperative': True}))
+    second = asyncio.create_task(engine.start_execution("exec-2", "SlowRunner", {'cooperative': True}))
+    await asyncio.sleep(0.1)
+
+    assert engine.queue_position("exec-2") == 1
+    assert await engine.cancel_execution("exec-2") is True
+    await second
+
+    execution = db.query(Execution).filter(Execution.id == "exec-2").first()
+    assert execution.status == "cancelled"
+    assert execution.result is None
+
+    await engine.cancel_execution("exec-1")
+    await first
+    assert await engine.cancel_execution("exec-1") is False
+
+
+@pytest.mark.asyncio
+async def test_cancel_after_admission_before_runner_starts(db, engine):
+    _create_execution(db, "exec-1")
+    engine.submit("exec-1", "SlowRunner")
+    assert engine.queue_position("exec-1") is None
+
+    assert await engine.cancel_execution("exec-1") is True
+    await engine.start_execution("exec-1", "SlowRunner", {'cooperative': True})
+
+    execution = db.query(Execution).filter(Execution.id == "exec-1").first()
+    assert execution.status == "cancelled"
+    assert execution.result is None
+    assert not engine.is_execution_active("exec-1")
+    assert engine.admission.running_count == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_before_runner_is_registered(db, engine):
+    _create_execution(db, "exec-1")
+    task = asyncio.create_task(engine.start_execution("exec-1", "SlowRunner", {'cooperative': True}))
+    await asyncio.sleep(0)
+    assert "exec-1" in engine.active_executions
+    assert "exec-1" not in engine.active_runners
+
+    assert await engine.cancel_execution("exec-1") is True
+    await task
+
+    execution = db.query(Execution).filter(Execution.id == "exec-1").first()
+    assert execution.status == "cancelled"
+    assert execution.result == {'steps': 0, 'partial': True}
+
+
+@pytest.mark.asyncio
+async def test_task_cancellation_while_queued_propagates(db, engine):
+    engine.admission.max_running = 1
+    engine.admission.reserved_interactive_slots = 0
+    _create_execution(db, "exec-1")
+    _create_execution(db, "exec-2")
+    first = asyncio.create_task(engine.start_execution("exec-1", "SlowRunner", {'cooperative': True}))
+    second = asyncio.create_task(engine.start_execution("exec-2", "SlowRunner", {'cooperative': True}))
+    await asyncio.sleep(0.1)
+
+    second.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await second
+
+    execution = db.query(Execution).filter(Execution.id == "exec-2").first()
+    assert execution.status == "pending"
+    assert not engine.admission.is_tracked("exec-2")
+
+    await engine.cancel_execution("exec-1")
+    await first
+
+
+def test_monitor_priority_is_reserved_for_monitors(engine):
+    assert engine.submit("monitor-1", "MonitorRunner", priority="interactive")['priority'] == 'monitor'
+    assert engine.submit("slow-1", "SlowRunner")['priority'] == 'standard'
+
+    with pytest.raises(ValueError):
+        engine.submit("slow-2", "SlowRunner", priority="monitor")
+
+
+@pytest.mark.asyncio
+async def test_queued_executions_do_not_hold_connections(tmp_path):
+    bind = create_engine(f"sqlite:///{tmp_path / 'queue.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=bind)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=bind)
+    engine = ExecutionEngine(session_factory)
+    engine.runners['SlowRunner'] = SlowRunner
+    engine.admission.max_running = 1
+    engine.admission.reserved_interactive_slots = 0
+
+    execution_ids = [f"exec-{index}" for index in range(20)]
+    with session_factory() as db:
+        for execution_id in execution_ids:
+            _create_execution(db, execution_id)
+    tasks = [
+        asyncio.create_task(engine.start_execution(execution_id, "SlowRunner", {'cooperative': True}))
+        for execution_id in execution_ids
+    ]
+    await asyncio.sleep(0.2)
+
+    assert engine.admission.queued_count == 19
+    assert bind.pool.checkedout() <= 1
+    with session_factory() as db:
+        assert db.query(Execution).filter(Execution.status == "pending").count() == 19
+
+    for execution_id in reversed(execution_ids):
+        await engine.cancel_execution(execution_id)
+    await asyncio.gather(*tasks)
+
+    assert bind.pool.checkedout() == 0
+    with session_factory() as db:
+        assert {execution.status for execution in db.query(Execution)} == {"cancelled"}
+    bind.dispose()
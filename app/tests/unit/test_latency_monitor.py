@@ -0,0 +1,196 @@
+import asyncio
+import math
+import socket
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models import LatencyWindow
+from app.services.tools.network.latency_monitor import (
+    LatencyMonitorRunner,
+    SampleRing,
+    active_monitors,
+    percentile,
+    summarize,
+)
+from app.tests.unit import test_ping_sweep
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def listener():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    sock.listen(64)
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+def test_sample_ring_wraps():
+    ring = SampleRing(4)
+    for second in range(1, 7):
+        ring.append(float(second), None if second == 5 else second * 10.0)
+
+    assert len(ring) == 4
+    assert ring.count == 6
+    assert ring.last() == 60.0
+    assert ring.samples(0) == [[3.0, 30.0], [4.0, 40.0], [5.0, None], [6.0, 60.0]]
+
+    values, lost = ring.window(3.0)
+    assert sorted(values) == [40.0, 60.0]
+    assert lost == 1
+
+    values, lost = ring.window(2.0, 4.0)
+    assert sorted(values) == [30.0, 40.0]
+    assert lost == 0
+
+
+def test_summarize():
+    values = [float(value) for value in range(1, 101)]
+    summary = summarize(values, 25)
+
+    assert summary['samples'] == 125
+    assert summary['loss_percent'] == 20.0
+    assert summary['p50_ms'] == 50.0
+    assert summary['p95_ms'] == 95.0
+    assert summary['p99_ms'] == 99.0
+    assert summary['min_ms'] == 1.0
+    assert summary['max_ms'] == 100.0
+    assert percentile([], 0.5) is None
+    assert summarize([], 3)['loss_percent'] == 100.0
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters():
+    runner = LatencyMonitorRunner("test-id")
+    validated = runner.validate_parameters({"targets": "127.0.0.1"})
+
+    assert validated['windows'] == [60, 300, 900]
+    assert validated['capacity'] == 901
+    assert validated['duration'] == 0
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "127.0.0.1", "interval": 0.01})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "127.0.0.1", "interval": 1, "timeout": 2})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "127.0.0.1", "interval": 0.2, "windows": [86400]})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "127.0.0.1", "windows": "0.1"})
+
+
+@pytest.mark.asyncio
+async def test_monitor_runs_for_duration(session_factory, listener):
+    updates = []
+
+    async def callback(execution_id, progress, message, partial_result):
+        updates.append(partial_result)
+
+    runner = LatencyMonitorRunner("monitor-1", callback)
+    runner.session_factory = session_factory
+    task = asyncio.ensure_future(runner.execute({
+        "targets": "127.0.0.1",
+        "method": "tcp",
+        "ports": [listener],
+        "interval": 0.2,
+        "timeout": 0.2,
+        "windows": [1, 60],
+        "duration": 1.0
+    }))
+    await asyncio.sleep(0.5)
+    assert "monitor-1" in active_monitors
+    assert active_monitors["monitor-1"].rounds >= 1
+    result = await task
+
+    assert "monitor-1" not in active_monitors
+    assert result['method'] == 'tcp'
+    assert 4 <= result['rounds'] <= 6
+    target = result['targets']['127.0.0.1']
+    assert target['total_samples'] == result['rounds']
+    assert target['windows']['60s']['samples'] == result['rounds']
+    assert target['windows']['60s']['loss_percent'] == 0.0
+    assert target['windows']['60s']['p99_ms'] is not None
+    assert 'partial' not in result
+
+    assert result['windows_flushed'] == 1
+    with session_factory() as db:
+        windows = db.query(LatencyWindow).all()
+    assert len(windows) == 1
+    assert windows[0].execution_id == "monitor-1"
+    assert windows[0].samples == result['rounds']
+
+    assert any(update and 'targets' in update for update in updates)
+
+
+@pytest.mark.asyncio
+async def test_monitor_icmp_loss_and_stop(session_factory):
+    runner = LatencyMonitorRunner("monitor-2")
+    runner.session_factory = session_factory
+    sock = test_ping_sweep.FakeIcmpSocket(alive={'192.0.2.1'})
+    runner._open_icmp_socket = lambda: sock
+
+    task = asyncio.ensure_future(runner.execute({
+        "targets": "192.0.2.1, 192.0.2.2",
+        "interval": 0.2,
+        "timeout": 0.1,
+        "windows": [60]
+    }))
+    await asyncio.sleep(0.7)
+    runner.request_stop("cancelled")
+    result = await asyncio.wait_for(task, 5)
+
+    assert result['method'] == 'icmp'
+    assert result['partial'] is True
+    assert result['rounds'] >= 2
+    assert result['targets']['192.0.2.1']['windows']['60s']['loss_percent'] == 0.0
+    assert result['targets']['192.0.2.2']['windows']['60s']['loss_percent'] == 100.0
+    assert result['targets']['192.0.2.2']['last_rtt_ms'] is None
+    assert result['windows_flushed'] == 2
+    assert not math.isnan(result['targets']['192.0.2.1']['last_rtt_ms'])
+
+
+@pytest.mark.asyncio
+async def test_monitor_state_is_mirrored_from_progress(session_factory, listener):
+    mirror = LatencyMonitorRunner("mirror-1")
+
+    async def callback(execution_id, progress, message, partial_result):
+        mirror.receive_progress(progress, message, partial_result)
+
+    runner = LatencyMonitorRunner("monitor-3", callback)
+    runner.session_factory = session_factory
+    task = asyncio.ensure_future(runner.execute({
+        "targets": "127.0.0.1",
+        "method": "tcp",
+        "ports": [listener],
+        "interval": 0.2,
+        "timeout": 0.2,
+        "windows": [1, 60],
+        "duration": 1.0
+    }))
+    await asyncio.sleep(0.7)
+    state = active_monitors["mirror-1"]
+    assert state.info()['targets'] == {"127.0.0.1": "127.0.0.1"}
+    assert state.method == 'tcp'
+    assert 1 <= state.rounds <= active_monitors["monitor-3"].rounds
+    samples = state.targets["127.0.0.1"][1].samples(0)
+    assert samples == active_monitors["monitor-3"].targets["127.0.0.1"][1].samples(0)[:len(samples)]
+
+    result = await task
+    await runner.flush_progress()
+
+    assert "mirror-1" not in active_monitors
+    assert state.rounds == result['rounds']
+    assert state.summary()["127.0.0.1"]['windows']['60s'] == result['targets']['127.0.0.1']['windows']['60s']
@@ -0,0 +1,198 @@
+from collections import deque
+import socket
+import struct
+
+import pytest
+
+from app.services.tools.network.echo import (
+    IcmpEchoSweeper,
+    build_echo_request,
+    icmp_checksum,
+    parse_echo_reply,
+)
+from app.services.tools.network.ping_sweep import PingSweepRunner
+
+
+class FakeIcmpSocket:
+    IDENT = 4242
+
+    def __init__(self, alive, drop_first=()):
+        self.alive = set(alive)
+        self.drop_first = set(drop_first)
+        self.sent = []
+        self.sources = deque()
+        self._reader, self._writer = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+    def fileno(self):
+        return self._reader.fileno()
+
+    def setblocking(self, flag):
+        self._reader.setblocking(flag)
+
+    def getsockname(self):
+        return ('0.0.0.0', self.IDENT)
+
+    def sendto(self, packet, address):
+        self.sent.append((address[0], packet))
+        if address[0] in self.drop_first:
+            self.drop_first.discard(address[0])
+            return
+        if address[0] not in self.alive:
+            return
+        _, _, _, _, sequence = struct.unpack('!BBHHH', packet[:8])
+        self._reply(address[0], self.IDENT + 1, sequence)
+        self._reply(address[0], self.IDENT, sequence)
+
+    def recvfrom(self, size):
+        data = self._reader.recv(size)
+        return data, (self.sources.popleft(), 0)
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+
+    def _reply(self, address, ident, sequence):
+        self.sources.append(address)
+        self._writer.send(struct.pack('!BBHHH', 0, 0, 0, ident, sequence) + b'payload')
+
+
+def test_echo_packets():
+    packet = build_echo_request(0x1234, 7)
+    assert packet[0] == 8
+    assert icmp_checksum(packet) == 0
+
+    reply = b'\x00' + packet[1:]
+    assert parse_echo_reply(reply) == (0x1234, 7)
+    assert parse_echo_reply(packet) is None
+    assert parse_echo_reply(b'\x00\x00') is None
+
+
+@pytest.mark.asyncio
+async def test_icmp_sweeper_matches_replies():
+    sock = FakeIcmpSocket(alive={'192.0.2.1', '192.0.2.3'}, drop_first={'192.0.2.3'})
+    sweeper = IcmpEchoSweeper(sock, timeout=0.2, retries=1)
+    results = {}
+
+    await sweeper.sweep(['192.0.2.1', '192.0.2.2', '192.0.2.3'], results.__setitem__)
+    sweeper.close()
+
+    assert results['192.0.2.1'] is not None
+    assert results['192.0.2.2'] is None
+    assert results['192.0.2.3'] is not None
+    assert sweeper.sent == 5
+    assert sweeper.received == 2
+
+
+@pytest.mark.asyncio
+async def test_icmp_sweeper_limits_requests_in_flight():
+    sock = FakeIcmpSocket(alive={'192.0.2.4'})
+    sweeper = IcmpEchoSweeper(sock, timeout=0.05, retries=0, max_in_flight=2)
+    results = {}
+    in_flight = []
+    send = sock.sendto
+
+    def sendto(packet, address):
+        in_flight.append(len(sock.sent) - len(results) + 1)
+        send(packet, address)
+
+    sock.sendto = sendto
+    await sweeper.sweep([f'192.0.2.{i}' for i in range(1, 7)], results.__setitem__)
+    sweeper.close()
+
+    assert len(results) == 6
+    assert results['192.0.2.4'] is not None
+    assert sweeper.sent == 6
+    assert max(in_flight) == 2
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters():
+    runner = PingSweepRunner("test-id")
+    validated = runner.validate_parameters({"targets": "192.0.2.0/24"})
+
+    assert len(validated["targets"]) == 254
+    assert validated["method"] == "auto"
+    assert validated["ports"] == [22, 80, 443]
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "example.com"})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "192.0.2.1", "method": "arp"})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "192.0.2.1", "ports": "1-100"})
+
+
+@pytest.mark.asyncio
+async def test_icmp_sweep():
+    runner = PingSweepRunner("test-id")
+    sock = FakeIcmpSocket(alive={'192.0.2.2', '192.0.2.5'})
+    runner._open_icmp_socket = lambda: sock
+
+    result = await runner.execute({"targets": "192.0.2.1-6", "timeout": 0.2, "retries": 0})
+
+    assert result['method'] == 'icmp'
+    assert result['addresses_scanned'] == 6
+    assert result['hosts_alive'] == 2
+    assert list(result['alive']) == ['192.0.2.2', '192.0.2.5']
+    assert result['probes_sent'] == 6
+    assert 'ports' not in result
+
+
+@pytest.mark.asyncio
+async def test_icmp_method_requires_socket():
+    runner = PingSweepRunner("test-id")
+
+    def unavailable():
+        raise PermissionError("Operation not permitted")
+    runner._open_icmp_socket = unavailable
+
+    with pytest.raises(ValueError, match="ICMP echo sockets are unavailable"):
+        await runner.execute({"targets": "127.0.0.1", "method": "icmp"})
+
+
+@pytest.mark.asyncio
+async def test_auto_falls_back_to_tcp():
+    runner = PingSweepRunner("test-id")
+
+    def unavailable():
+        raise PermissionError("Operation not permitted")
+    runner._open_icmp_socket = unavailable
+
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    listener.listen()
+    port = listener.getsockname()[1]
+    try:
+        result = await runner.execute({
+            "targets": "127.0.0.1",
+            "ports": [port],
+            "timeout": 0.3,
+            "retries": 0
+        })
+    finally:
+        listener.close()
+
+    assert result['method'] == 'tcp'
+    assert result['ports'] == [port]
+    assert result['addresses_scanned'] == 1
+    assert list(result['alive']) == ['127.0.0.1']
+    assert result['probes_sent'] == 1
+
+
+@pytest.mark.asyncio
+async def test_tcp_refused_counts_as_alive():
+    runner = PingSweepRunner("test-id")
+
+    listener = socket.socket()
+    listener.bind(('127.0.0.1', 0))
+    port = listener.getsockname()[1]
+    listener.close()
+
+    result = await runner.execute({"targets": "127.0.0.1", "method": "tcp", "ports": [port], "timeout": 0.3})
+
+    assert result['hosts_alive'] == 1
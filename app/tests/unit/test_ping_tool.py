@@ -0,0 +1,156 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from app.services.tools.network.ping_tool import PingRunner, PingStats
+
+
+FAKE_PING = r'''
+import sys, time
+replies = {replies!r}
+sent = received = 0
+try:
+    for sequence in range(1, {count} + 1):
+        sent = sequence
+        rtt = replies.get(sequence)
+        if rtt is None:
+            time.sleep({interval})
+            print(f"no answer yet for icmp_seq={{sequence}}", flush=True)
+            continue
+        received += 1
+        print(f"64 bytes from 192.0.2.1: icmp_seq={{sequence}} ttl=57 time={{rtt}} ms", flush=True)
+        time.sleep({interval})
+except KeyboardInterrupt:
+    pass
+print("")
+print(f"{{sent}} packets transmitted, {{received}} received, {{round((sent - received) / sent * 100)}}% packet loss, time 0ms", flush=True)
+sys.exit(0 if received else 1)
+'''
+
+
+def _fake_ping(runner, replies, interval=0.02):
+    def command(address, count):
+        return [sys.executable, '-c', FAKE_PING.format(replies=replies, count=count, interval=interval)]
+    runner._ping_command = command
+
+
+def test_ping_stats():
+    stats = PingStats()
+    for sequence, rtt in enumerate([10.0, 20.0, 30.0], start=1):
+        stats.add_reply(sequence, rtt)
+    stats.sent(4)
+
+    summary = stats.summary()
+    assert summary['packets_sent'] == 4
+    assert summary['packets_received'] == 3
+    assert summary['packet_loss_percent'] == 25.0
+    assert summary['min_rtt_ms'] == 10.0
+    assert summary['avg_rtt_ms'] == 20.0
+    assert summary['max_rtt_ms'] == 30.0
+    assert summary['mdev_rtt_ms'] == pytest.approx(8.165, abs=0.001)
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters():
+    runner = PingRunner("test-id")
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"target": "127.0.0.1", "count": 4, "stop_after_replies": 5})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"target": "127.0.0.1", "max_loss_percent": 150})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"target": "127.0.0.1", "max_rtt_ms": 0})
+
+
+@pytest.mark.asyncio
+async def test_ping_streams_replies():
+    updates = []
+
+    async def callback(execution_id, progress, message, partial_result):
+        updates.append(partial_result)
+
+    runner = PingRunner("test-id", callback)
+    _fake_ping(runner, {1: 1.5, 2: 2.5, 4: 3.5})
+    result = await runner.execute({"target": "127.0.0.1", "count": 4})
+
+    assert result['ip'] == "127.0.0.1"
+    assert result['packets_sent'] == 4
+    assert result['packets_received'] == 3
+    assert result['packet_loss_percent'] == 25.0
+    assert result['min_rtt_ms'] == 1.5
+    assert result['avg_rtt_ms'] == 2.5
+    assert result['max_rtt_ms'] == 3.5
+    assert [packet['sequence'] for packet in result['packets']] == [1, 2, 4]
+    assert result['packets'][0] == {'sequence': 1, 'ttl': 57, 'time': 1.5}
+    assert 'terminated_early' not in result
+
+    await runner.flush_progress()
+    streamed = [packet for update in updates if update for packet in update.get('packets', [])]
+    assert [packet['sequence'] for packet in streamed] == [1, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_ping_stops_after_replies():
+    runner = PingRunner("test-id")
+    _fake_ping(runner, {sequence: 1.0 for sequence in range(1, 101)}, interval=0.2)
+
+    start = time.monotonic()
+    result = await runner.execute({"target": "127.0.0.1", "count": 100, "stop_after_replies": 2})
+
+    assert time.monotonic() - start < 5
+    assert result['terminated_early'] == 'replies'
+    assert result['packets_received'] == 2
+    assert result['packets_sent'] == 2
+    assert 'partial' not in result
+
+
+@pytest.mark.asyncio
+async def test_ping_stops_on_loss():
+    runner = PingRunner("test-id")
+    _fake_ping(runner, {}, interval=0.05)
+
+    result = await runner.execute({"target": "127.0.0.1", "count": 100, "max_loss_percent": 50})
+
+    assert result['terminated_early'] == 'loss'
+    assert result['packets_received'] == 0
+    assert result['packet_loss_percent'] == 100.0
+    assert result['packets_sent'] < 100
+
+
+@pytest.mark.asyncio
+async def test_ping_stops_on_latency():
+    runner = PingRunner("test-id")
+    _fake_ping(runner, {sequence: 250.0 for sequence in range(1, 101)})
+
+    result = await runner.execute({"target": "127.0.0.1", "count": 100, "max_rtt_ms": 100})
+
+    assert result['terminated_early'] == 'latency'
+    assert result['packets_received'] == PingRunner.MIN_PROBES_FOR_TERMINATION
+
+
+@pytest.mark.asyncio
+async def test_ping_failure_without_replies():
+    runner = PingRunner("test-id")
+    _fake_ping(runner, {})
+
+    with pytest.raises(ValueError, match="Ping failed"):
+        await runner.execute({"target": "127.0.0.1", "count": 2})
+
+
+@pytest.mark.asyncio
+async def test_ping_stop_returns_partial():
+    runner = PingRunner("test-id")
+    _fake_ping(runner, {sequence: 1.0 for sequence in range(1, 101)}, interval=0.1)
+
+    task = asyncio.ensure_future(runner.execute({"target": "127.0.0.1", "count": 100}))
+    await asyncio.sleep(0.5)
+    runner.request_stop("cancelled")
+    result = await asyncio.wait_for(task, 5)
+
+    assert result['partial'] is True
+    assert 0 < result['packets_received'] < 100
+    assert result['packets_sent'] == result['packets_received']
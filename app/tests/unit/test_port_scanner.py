@@ -1,4 +1,6 @@
 import pytest
+import asyncio
+import gc
 from app.services.tools.network.port_scanner import PortScannerRunner
 
 
@@ -68,3 +70,205 @@ async def test_get_service_name():
     assert runner._get_service_name(443) == "https"
     assert runner._get_service_name(22) == "ssh"
     assert runner._get_service_name(12345) == "unknown"
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters_invalid_concurrency():
+    runner = PortScannerRunner("test-id")
+    
+    params = {
+        "target": "example.com",
+        "concurrency": 0
+    }
+    
+    with pytest.raises(ValueError):
+        runner.validate_parameters(params)
+
+
+@pytest.mark.asyncio
+async def test_execute_finds_open_ports_sorted():
+    server = await asyncio.start_server(lambda reader, writer: writer.close(), "127.0.0.1", 0)
+    open_port = server.sockets[0].getsockname()[1]
+    start_port, end_port = max(1, open_port - 50), min(65535, open_port + 50)
+    progress = []
+
+    async def callback(execution_id, value, message, partial_result):
+        progress.append(value)
+
+    runner = PortScannerRunner("test-id", callback)
+    try:
+        result = await runner.execute({
+            "target": "127.0.0.1",
+            "ports": f"{start_port}-{end_port}",
+            "timeout": 0.5,
+            "concurrency": 20
+        })
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    ports = [entry["port"] for entry in result["open_ports"]]
+    assert open_port in ports
+    assert ports == sorted(ports)
+    assert result["ports_scanned"] == end_port - start_port + 1
+    assert progress == sorted(progress)
+    assert progress[-1] == 100
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters_multiple_targets():
+    runner = PortScannerRunner("test-id")
+    
+    params = {
+        "target": "10.0.0.0/22,10.1.0.5-10.1.0.40",
+        "ports": "80"
+    }
+    
+    validated = runner.validate_parameters(params)
+    
+    assert len(validated["targets"]) == 1022 + 36
+
+
+@pytest.mark.asyncio
+async def test_execute_multiple_hosts():
+    server = await asyncio.start_server(lambda reader, writer: writer.close(), "127.0.0.1", 0)
+    open_port = server.sockets[0].getsockname()[1]
+
+    runner = PortScannerRunner("test-id")
+    try:
+        result = await runner.execute({
+            "target": "127.0.0.1-3",
+            "ports": f"{open_port - 2}-{open_port + 2}",
+            "timeout": 0.5,
+            "per_host_concurrency": 2
+        })
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert result["hosts_scanned"] == 3
+    assert result["ports_scanned"] == 15
+    assert [host["ip"] for host in result["hosts"]] == ["127.0.0.1"]
+    assert open_port in [entry["port"] for entry in result["hosts"][0]["open_ports"]]
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters_invalid_timing():
+    runner = PortScannerRunner("test-id")
+    
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"target": "example.com", "timing": "insane"})
+    
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"target": "example.com", "timing": "adaptive", "max_retries": 10})
+
+
+@pytest.mark.asyncio
+async def test_execute_adaptive_timing():
+    server = await asyncio.start_server(lambda reader, writer: writer.close(), "127.0.0.1", 0)
+    open_port = server.sockets[0].getsockname()[1]
+
+    runner = PortScannerRunner("test-id")
+    gc.collect()
+    try:
+        result = await runner.execute({
+            "target": "127.0.0.1",
+            "ports": f"{open_port - 20}-{open_port + 20}",
+            "timing": "adaptive"
+        })
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert open_port in [entry["port"] for entry in result["open_ports"]]
+    assert result["timing"]["mode"] == "adaptive"
+    assert result["timing"]["retransmissions"] == 0
+    assert result["timing"]["smoothed_rtt_ms"]["127.0.0.1"] < 100
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters_full_port_range():
+    runner = PortScannerRunner("test-id")
+    
+    validated = runner.validate_parameters({"target": "example.com", "ports": "1-65535"})
+    
+    assert len(validated["ports"]) == 65535
+    assert validated["start_port"] == 1
+    assert validated["end_port"] == 65535
+
+
+@pytest.mark.asyncio
+async def test_execute_with_service_detection():
+    async def handler(reader, writer):
+        writer.write(b"SSH-2.0-OpenSSH_9.3\r\n")
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    open_port = server.sockets[0].getsockname()[1]
+
+    runner = PortScannerRunner("test-id")
+    try:
+        result = await runner.execute({
+            "target": "127.0.0.1",
+            "ports": str(open_port),
+            "service_detection": True,
+            "detection_timeout": 0.5
+        })
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert result["open_ports"] == [{
+        "port": open_port,
+        "state": "open",
+        "service": "ssh",
+        "version": "OpenSSH_9.3",
+        "banner": "SSH-2.0-OpenSSH_9.3"
+    }]
+
+
+@pytest.mark.asyncio
+async def test_execute_stops_when_requested():
+    runner = PortScannerRunner("test-id")
+    runner.request_stop("cancelled")
+    result = await runner.execute({
+        "target": "127.0.0.1",
+        "ports": "1-65535",
+        "timeout": 0.5
+    })
+
+    assert result["partial"] is True
+    assert result["probes_completed"] < 65535
+
+
+@pytest.mark.asyncio
+async def test_stop_during_service_detection_leaves_no_pending_tasks():
+    async def silent(reader, writer):
+        await reader.read()
+        writer.close()
+
+    server = await asyncio.start_server(silent, "127.0.0.1", 0)
+    open_port = server.sockets[0].getsockname()[1]
+    runner = PortScannerRunner("test-id")
+    existing = asyncio.all_tasks()
+
+    async def stop_soon():
+        await asyncio.sleep(0.3)
+        runner.request_stop("cancelled")
+
+    stopper = asyncio.ensure_future(stop_soon())
+    try:
+        result = await asyncio.wait_for(runner.execute({
+            "target": "127.0.0.1",
+            "ports": str(open_port),
+            "service_detection": True,
+            "detection_timeout": 10
+        }), 5)
+    finally:
+        server.close()
+        await stopper
+
+    assert result["partial"] is True
+    assert [entry["port"] for entry in result["open_ports"]] == [open_port]
+    assert {task for task in asyncio.all_tasks() if not task.done()} - existing - {asyncio.current_task()} == set()
@@ -0,0 +1,64 @@
+import pytest
+from app.services.tools.base import BaseToolRunner
+from app.services.tools.network.port_spec import PortSet, TOP_PORTS, parse_port_spec
+
+
+class MockRunner(BaseToolRunner):
+    async def execute(self, parameters):
+        return {}
+
+    def validate_parameters(self, parameters):
+        return parameters
+
+
+@pytest.mark.asyncio
+async def test_port_set_ranges():
+    ports = PortSet()
+    ports.add_range(5, 30)
+    ports.discard_range(8, 23)
+
+    assert list(ports) == [5, 6, 7, 24, 25, 26, 27, 28, 29, 30]
+    assert len(ports) == 10
+    assert 24 in ports
+    assert 8 not in ports
+    assert ports.min() == 5
+    assert ports.max() == 30
+
+
+@pytest.mark.asyncio
+async def test_parse_mixed_spec():
+    runner = MockRunner("test-id")
+
+    ports = parse_port_spec("22,80,443,8000-8005,top-10,-25", runner.sanitize_port)
+
+    assert list(ports) == [21, 22, 23, 80, 110, 139, 443, 445, 3389, 8000, 8001, 8002, 8003, 8004, 8005]
+
+
+@pytest.mark.asyncio
+async def test_parse_full_range():
+    runner = MockRunner("test-id")
+
+    ports = parse_port_spec("1-65535", runner.sanitize_port)
+
+    assert len(ports) == 65535
+    assert ports.min() == 1
+    assert ports.max() == 65535
+
+
+@pytest.mark.asyncio
+async def test_parse_top_ports():
+    runner = MockRunner("test-id")
+
+    ports = parse_port_spec("top-100", runner.sanitize_port)
+
+    assert len(ports) == 100
+    assert set(ports) == set(TOP_PORTS)
+
+
+@pytest.mark.asyncio
+async def test_parse_invalid_specs():
+    runner = MockRunner("test-id")
+
+    for spec in ("0", "1-100000", "90-80", "1-2-3", "top-1000", "-80", "abc"):
+        with pytest.raises(ValueError):
+            parse_port_spec(spec, runner.sanitize_port)
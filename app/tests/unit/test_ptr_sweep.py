@@ -0,0 +1,114 @@
+import time
+
+import pytest
+
+import dns.asyncresolver
+
+from app.services.tools.network.ptr_sweep import PTRSweepRunner, reverse_name
+from app.tests.unit.dns_server import start_stub_dns_server
+
+
+def _use_stub_server(runner, server):
+    def make_resolver():
+        resolver = dns.asyncresolver.Resolver(configure=False)
+        resolver.nameservers = ['127.0.0.1']
+        resolver.port = server.port
+        return resolver
+    runner._make_resolver = make_resolver
+
+
+def test_reverse_name():
+    assert reverse_name("192.0.2.10") == "10.2.0.192.in-addr.arpa"
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters():
+    runner = PTRSweepRunner("test-id")
+    validated = runner.validate_parameters({"targets": "192.0.2.0/24, 198.51.100.1-10"})
+
+    assert len(validated["targets"]) == 254 + 10
+    assert validated["nameservers"] == []
+    assert validated["rate_limit"] == PTRSweepRunner.DEFAULT_RATE_LIMIT
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "example.com"})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "10.0.0.0/8"})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "192.0.2.1", "nameservers": ["ns.example.com"]})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "192.0.2.1", "rate_limit": 0})
+
+
+@pytest.mark.asyncio
+async def test_sweep_maps_addresses_to_names():
+    server = await start_stub_dns_server(
+        {
+            ("1.2.0.192.in-addr.arpa", "PTR"): ["gw.example.com."],
+            ("5.2.0.192.in-addr.arpa", "PTR"): ["web1.example.com.", "www.example.com."],
+        },
+        nxdomain_by_default=True
+    )
+    updates = []
+
+    async def progress(execution_id, progress, message, partial):
+        if partial:
+            updates.append(partial)
+
+    runner = PTRSweepRunner("test-id", progress)
+    _use_stub_server(runner, server)
+    try:
+        result = await runner.execute({"targets": "192.0.2.1-8", "timeout": 1})
+        await runner.flush_progress()
+    finally:
+        server.close()
+
+    assert result["addresses_scanned"] == 8
+    assert result["names_found"] == 2
+    assert result["ptr"] == {
+        "192.0.2.1": "gw.example.com",
+        "192.0.2.5": ["web1.example.com", "www.example.com"],
+    }
+    assert result["nxdomain"] == 6
+    assert result["queries"] == 8
+    assert result["nameservers"]["127.0.0.1"]["found"] == 2
+    assert "partial" not in result
+    assert {("8.2.0.192.in-addr.arpa", "PTR")} <= set(server.queries)
+    assert set().union(*(update["ptr"] for update in updates)) == {"192.0.2.1", "192.0.2.5"}
+
+
+@pytest.mark.asyncio
+async def test_sweep_respects_rate_limit():
+    server = await start_stub_dns_server({}, nxdomain_by_default=True)
+    runner = PTRSweepRunner("test-id")
+    _use_stub_server(runner, server)
+    start = time.monotonic()
+    try:
+        result = await runner.execute({"targets": "192.0.2.0/26", "rate_limit": 100, "timeout": 1})
+    finally:
+        server.close()
+
+    assert result["addresses_scanned"] == 62
+    assert time.monotonic() - start >= 0.45
+    assert result["nameservers"]["127.0.0.1"]["throttled_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_sweep_stops_with_partial_result():
+    server = await start_stub_dns_server({}, nxdomain_by_default=True)
+    runner = PTRSweepRunner("test-id")
+    _use_stub_server(runner, server)
+    runner.request_stop("cancelled")
+    try:
+        result = await runner.execute({"targets": "192.0.2.0/24"})
+    finally:
+        server.close()
+
+    assert result["partial"] is True
+    assert result["addresses_scanned"] == 0
@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.tools.network.ratelimit import KeyedRateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(10, burst=2, clock=clock)
+
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    clock.now = 0.1
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    clock.now = 10
+    assert bucket.tokens <= 2
+    assert bucket.try_acquire() and bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_bucket_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(0)
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_tokens():
+    bucket = TokenBucket(100, burst=5)
+    start = time.monotonic()
+
+    await asyncio.gather(*(bucket.acquire() for _ in range(25)))
+
+    assert time.monotonic() - start >= 0.18
+    assert bucket.waited > 0
+
+
+@pytest.mark.asyncio
+async def test_acquire_more_than_capacity_fails():
+    bucket = TokenBucket(10, burst=2)
+
+    with pytest.raises(ValueError):
+        await bucket.acquire(3)
+
+
+@pytest.mark.asyncio
+async def test_keyed_limiter_uses_one_bucket_per_key():
+    limiter = KeyedRateLimiter(1000, burst=1)
+
+    await limiter.acquire("a")
+    await limiter.acquire("b")
+
+    assert limiter.bucket("a") is limiter.bucket("a")
+    assert limiter.bucket("a") is not limiter.bucket("b")
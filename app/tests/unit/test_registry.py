@@ -0,0 +1,66 @@
+import pytest
+import subprocess
+import sys
+
+from app.services.tools.base import BaseToolRunner
+from app.services.tools.registry import RunnerRegistry
+
+
+class PluginRunner(BaseToolRunner):
+    def validate_parameters(self, parameters):
+        return parameters
+
+    async def execute(self, parameters):
+        return {}
+
+
+def test_resolves_builtin_runner_on_first_use():
+    registry = RunnerRegistry(entry_point_group=None)
+    assert registry.loaded() == []
+
+    runner_class = registry.resolve('PingRunner')
+
+    assert runner_class.__name__ == 'PingRunner'
+    assert registry.loaded() == ['PingRunner']
+    assert registry['PingRunner'] is runner_class
+
+
+def test_unknown_runner():
+    registry = RunnerRegistry(entry_point_group=None)
+    assert 'MissingRunner' not in registry
+    with pytest.raises(ValueError, match="Unknown runner class"):
+        registry.resolve('MissingRunner')
+
+
+def test_register_by_class_and_by_path():
+    registry = RunnerRegistry(modules={}, entry_point_group=None)
+    registry['DirectRunner'] = PluginRunner
+    registry.register('PathRunner', f'{__name__}:PluginRunner')
+
+    assert registry.resolve('DirectRunner') is PluginRunner
+    assert registry.resolve('PathRunner') is PluginRunner
+    assert list(registry) == ['DirectRunner', 'PathRunner']
+
+
+def test_rejects_non_runner_targets():
+    registry = RunnerRegistry(modules={}, entry_point_group=None)
+    registry.register('NotARunner', 'json:dumps')
+    with pytest.raises(ValueError, match="BaseToolRunner"):
+        registry.resolve('NotARunner')
+
+
+def test_for_tool_reads_tool_definitions():
+    registry = RunnerRegistry(entry_point_group=None)
+    assert registry.for_tool('port_scanner') == 'PortScannerRunner'
+    assert registry.for_tool('traceroute') == 'TracerouteRunner'
+    assert registry.for_tool('PingRunner') == 'PingRunner'
+    assert registry.for_tool('unknown_tool') == ''
+
+
+def test_importing_app_does_not_load_tool_dependencies():
+    probe = (
+        "import sys, app.main; "
+        "print(','.join(name for name in ('dns.resolver', 'whois', 'OpenSSL', 'cryptography') if name in sys.modules))"
+    )
+    output = subprocess.run([sys.executable, '-c', probe], check=True, capture_output=True, text=True).stdout
+    assert output.strip() == ''
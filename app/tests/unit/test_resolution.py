@@ -0,0 +1,140 @@
+import pytest
+import asyncio
+
+import dns.asyncresolver
+
+from app.services.tools.network.resolution import ResolutionCache
+from app.tests.unit.dns_server import start_stub_dns_server
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _resolver(server):
+    resolver = dns.asyncresolver.Resolver(configure=False)
+    resolver.nameservers = ['127.0.0.1']
+    resolver.port = server.port
+    return resolver
+
+
+@pytest.mark.asyncio
+async def test_positive_answers_are_cached_for_their_ttl():
+    server = await start_stub_dns_server({('a.example', 'A'): ['192.0.2.1']}, ttl=30)
+    clock = FakeClock()
+    cache = ResolutionCache(100, clock=clock)
+    resolver = _resolver(server)
+    try:
+        first = await cache.query('a.example', 'A', 2.0, resolver)
+        second = await cache.query('A.Example.', 'A', 2.0, resolver)
+        clock.now += 31
+        third = await cache.query('a.example', 'A', 2.0, resolver)
+    finally:
+        server.close()
+
+    assert first[0] == second[0] == third[0] == 'ok'
+    assert [rdata.address for rdata in second[1]] == ['192.0.2.1']
+    assert len(server.queries) == 2
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 2
+    assert stats['expirations'] == 1
+
+
+@pytest.mark.asyncio
+async def test_negative_answers_follow_soa_minimum():
+    server = await start_stub_dns_server({}, nxdomain=['missing.example'], ttl=3600, soa_minimum=10)
+    clock = FakeClock()
+    cache = ResolutionCache(100, clock=clock)
+    resolver = _resolver(server)
+    try:
+        assert (await cache.query('missing.example', 'A', 2.0, resolver))[0] == 'nxdomain'
+        clock.now += 9
+        assert (await cache.query('missing.example', 'A', 2.0, resolver))[0] == 'nxdomain'
+        assert len(server.queries) == 1
+        clock.now += 2
+        await cache.query('missing.example', 'A', 2.0, resolver)
+        assert len(server.queries) == 2
+    finally:
+        server.close()
+
+    assert cache.stats()['negative_hits'] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_are_coalesced():
+    server = await start_stub_dns_server({('a.example', 'A'): ['192.0.2.1']}, delays={'A': 0.2})
+    cache = ResolutionCache(100)
+    resolver = _resolver(server)
+    try:
+        results = await asyncio.gather(*(cache.query('a.example', 'A', 2.0, resolver) for _ in range(20)))
+    finally:
+        server.close()
+
+    assert all(status == 'ok' for status, _ in results)
+    assert len(server.queries) == 1
+    assert cache.stats()['coalesced'] == 19
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_not_cached():
+    server = await start_stub_dns_server({}, drop=['A'])
+    cache = ResolutionCache(100)
+    resolver = _resolver(server)
+    try:
+        assert (await cache.query('a.example', 'A', 0.2, resolver))[0] == 'timeout'
+        assert (await cache.query('a.example', 'A', 0.2, resolver))[0] == 'timeout'
+    finally:
+        server.close()
+
+    assert len(cache) == 0
+    assert cache.stats()['misses'] == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction():
+    records = {(f'{name}.example', 'A'): ['192.0.2.1'] for name in 'abc'}
+    server = await start_stub_dns_server(records)
+    cache = ResolutionCache(2)
+    resolver = _resolver(server)
+    try:
+        await cache.query('a.example', 'A', 2.0, resolver)
+        await cache.query('b.example', 'A', 2.0, resolver)
+        await cache.query('a.example', 'A', 2.0, resolver)
+        await cache.query('c.example', 'A', 2.0, resolver)
+        await cache.query('a.example', 'A', 2.0, resolver)
+        await cache.query('b.example', 'A', 2.0, resolver)
+    finally:
+        server.close()
+
+    assert [name for name, _ in server.queries] == ['a.example', 'b.example', 'c.example', 'b.example']
+    assert cache.stats()['evictions'] == 2
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_always_queries():
+    server = await start_stub_dns_server({('a.example', 'A'): ['192.0.2.1']})
+    cache = ResolutionCache(100, enabled=False)
+    resolver = _resolver(server)
+    try:
+        await cache.query('a.example', 'A', 2.0, resolver)
+        await cache.query('a.example', 'A', 2.0, resolver)
+    finally:
+        server.close()
+
+    assert len(server.queries) == 2
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_resolve_host_literals_and_local_names():
+    cache = ResolutionCache(100)
+
+    assert await cache.resolve_host('192.0.2.7') == ['192.0.2.7']
+    assert await cache.resolve_host('localhost') == ['127.0.0.1']
+    assert await cache.resolve_host('localhost') == ['127.0.0.1']
+    assert cache.stats()['hits'] == 1
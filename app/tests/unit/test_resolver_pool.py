@@ -0,0 +1,154 @@
+import asyncio
+import time
+
+import pytest
+
+import dns.resolver
+
+from app.services.tools.network.resolver_pool import ResolverPool, parse_upstream
+from app.tests.unit.dns_server import start_stub_dns_server
+
+
+RECORDS = {("host.example.com", "A"): ["192.0.2.10"]}
+
+
+def _addresses(answer):
+    return [rdata.address for rdata in answer]
+
+
+def test_parse_upstream():
+    assert parse_upstream("192.0.2.53") == ("192.0.2.53", 53)
+    assert parse_upstream("127.0.0.1:5353") == ("127.0.0.1", 5353)
+    assert parse_upstream("[2001:db8::53]:5353") == ("2001:db8::53", 5353)
+    assert parse_upstream("2001:db8::53") == ("2001:db8::53", 53)
+
+    with pytest.raises(ValueError):
+        parse_upstream("ns.example.com")
+
+    with pytest.raises(ValueError):
+        parse_upstream("192.0.2.53:0")
+
+    with pytest.raises(ValueError):
+        ResolverPool([])
+
+
+@pytest.mark.asyncio
+async def test_hedges_slow_upstream_and_learns_the_fast_one():
+    slow = await start_stub_dns_server(RECORDS, delays={"A": 0.5})
+    fast = await start_stub_dns_server(RECORDS)
+    pool = ResolverPool([f"127.0.0.1:{slow.port}", f"127.0.0.1:{fast.port}"], hedge_initial_delay=0.05)
+    try:
+        start = time.monotonic()
+        answer = await pool.resolve("host.example.com", "A", lifetime=2)
+        assert time.monotonic() - start < 0.4
+        assert _addresses(answer) == ["192.0.2.10"]
+
+        await asyncio.sleep(0.6)
+        for _ in range(5):
+            await pool.resolve("host.example.com", "A", lifetime=2)
+    finally:
+        slow.close()
+        fast.close()
+
+    slow_stats, fast_stats = pool.stats()
+    assert pool.ranked()[0].port == fast.port
+    assert fast_stats["hedged"] == 1
+    assert fast_stats["hedge_wins"] == 1
+    assert slow_stats["queries"] == 1
+    assert slow_stats["latency_ms"] > fast_stats["latency_ms"]
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_follows_latency_percentile():
+    pool = ResolverPool(["127.0.0.1"], hedge_percentile=0.9, hedge_min_delay=0.01, hedge_initial_delay=0.5)
+    upstream = pool.upstreams[0]
+
+    assert pool.hedge_delay(upstream) == 0.5
+
+    upstream.samples.extend([0.02] * 9 + [0.2])
+    assert pool.hedge_delay(upstream) == 0.2
+
+    upstream.samples.clear()
+    upstream.samples.extend([0.001] * 10)
+    assert pool.hedge_delay(upstream) == 0.01
+
+
+@pytest.mark.asyncio
+async def test_timed_out_query_counts_as_failure():
+    dead = await start_stub_dns_server(RECORDS, drop=["A"])
+    pool = ResolverPool([f"127.0.0.1:{dead.port}"])
+    try:
+        start = time.monotonic()
+        with pytest.raises(dns.exception.Timeout):
+            await pool.resolve("host.example.com", "A", lifetime=0.2)
+        assert time.monotonic() - start < 0.5
+    finally:
+        dead.close()
+
+    assert pool.stats()[0]["failures"] == 1
+    assert pool.stats()[0]["error_rate"] > 0
+
+
+def test_failing_upstream_is_ejected_and_readmitted():
+    now = [0.0]
+    pool = ResolverPool(["192.0.2.1", "192.0.2.2"], eject_after=2, eject_seconds=30, clock=lambda: now[0])
+    failing, healthy = pool.upstreams
+    healthy.latency = 0.5
+
+    pool._record(failing, None)
+    assert pool.ranked()[0] is healthy
+    assert not pool.stats()[0]["ejected"]
+
+    pool._record(failing, None)
+    assert pool.stats()[0]["ejected"] is True
+    assert pool.stats()[0]["ejections"] == 1
+
+    failing.error_rate = 0.0
+    assert pool.ranked() == [healthy, failing]
+
+    now[0] = 31
+    assert pool.ranked() == [failing, healthy]
+
+    pool._record(failing, None)
+    assert pool.stats()[0]["ejections"] == 2
+
+    now[0] = 62
+    pool._record(failing, 0.01)
+    pool._record(failing, None)
+    assert pool.stats()[0]["ejections"] == 2
+
+
+@pytest.mark.asyncio
+async def test_nxdomain_is_a_definitive_answer():
+    server = await start_stub_dns_server(RECORDS, nxdomain=["missing.example.com"])
+    other = await start_stub_dns_server(RECORDS)
+    pool = ResolverPool([f"127.0.0.1:{server.port}", f"127.0.0.1:{other.port}"])
+    try:
+        with pytest.raises(dns.resolver.NXDOMAIN):
+            await pool.resolve("missing.example.com", "A", lifetime=1)
+    finally:
+        server.close()
+        other.close()
+
+    assert pool.stats()[0]["failures"] == 0
+    assert pool.stats()[1]["queries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_runners_use_the_configured_pool(monkeypatch):
+    from app.core.config import settings
+    from app.services.tools.network import resolver_pool
+    from app.services.tools.network.dns_lookup import DNSLookupRunner
+
+    server = await start_stub_dns_server(RECORDS)
+    monkeypatch.setattr(settings, "DNS_UPSTREAMS", [f"127.0.0.1:{server.port}"])
+    monkeypatch.setattr(resolver_pool, "_pool", None)
+    try:
+        result = await DNSLookupRunner("test-id").execute({
+            "domain": "host.example.com", "record_types": ["A"], "use_cache": False
+        })
+    finally:
+        server.close()
+
+    assert result["records"]["A"] == ["192.0.2.10"]
+    assert resolver_pool.get_resolver_pool().stats()[0]["queries"] == 1
@@ -0,0 +1,42 @@
+import pytest
+from app.services.tools.network.rtt import RttEstimator
+
+
+@pytest.mark.asyncio
+async def test_initial_timeout_is_clamped():
+    estimator = RttEstimator(1.0, 0.05, 10.0)
+    assert estimator.timeout == 1.0
+
+    estimator = RttEstimator(20.0, 0.05, 10.0)
+    assert estimator.timeout == 10.0
+
+
+@pytest.mark.asyncio
+async def test_timeout_shrinks_on_fast_samples():
+    estimator = RttEstimator(1.0, 0.05, 10.0)
+
+    for _ in range(20):
+        estimator.observe(0.001)
+
+    assert estimator.srtt == pytest.approx(0.001)
+    assert estimator.timeout == 0.05
+
+
+@pytest.mark.asyncio
+async def test_timeout_grows_with_slow_jittery_samples():
+    estimator = RttEstimator(0.1, 0.05, 10.0)
+
+    for rtt in (0.4, 0.9, 0.5, 1.2, 0.6):
+        estimator.observe(rtt)
+
+    assert estimator.timeout > 1.2
+    assert estimator.timeout == pytest.approx(estimator.srtt + 4 * estimator.rttvar)
+
+
+@pytest.mark.asyncio
+async def test_retry_timeouts_back_off_up_to_max():
+    estimator = RttEstimator(1.0, 0.05, 3.0)
+
+    assert estimator.timeout_for(0) == 1.0
+    assert estimator.timeout_for(1) == 2.0
+    assert estimator.timeout_for(2) == 3.0
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.schema import upgrade_schema
+from app.models import Execution
+
+
+def test_upgrade_adds_missing_columns(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE executions (id VARCHAR PRIMARY KEY, tool_id VARCHAR NOT NULL, user_id VARCHAR, "
+            "status VARCHAR, parameters JSON, result JSON, error TEXT, stdout TEXT, stderr TEXT, "
+            "progress INTEGER, started_at DATETIME, completed_at DATETIME, execution_time INTEGER)"
+        ))
+        connection.execute(text(
+            "INSERT INTO executions (id, tool_id, status, progress, started_at) "
+            "VALUES ('old', 'dns_lookup', 'completed', 100, '2024-01-01 00:00:00')"
+        ))
+
+    upgrade_schema(engine)
+    upgrade_schema(engine)
+
+    columns = {column['name'] for column in inspect(engine).get_columns('executions')}
+    assert {'priority', 'queued_at', 'wait_time_ms'} <= columns
+    assert 'certificates' in inspect(engine).get_table_names()
+    with sessionmaker(bind=engine)() as db:
+        execution = db.get(Execution, 'old')
+        assert execution.started_at == datetime(2024, 1, 1)
+        assert execution.priority is None
+        assert execution.wait_time_ms is None
+    engine.dispose()
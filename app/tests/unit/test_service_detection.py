@@ -0,0 +1,56 @@
+import pytest
+import asyncio
+from app.services.tools.network.service_detection import ServiceDetector, match_banner
+
+
+@pytest.mark.asyncio
+async def test_match_banner_signatures():
+    assert match_banner(b"SSH-2.0-OpenSSH_8.9p1 Ubuntu-3\r\n") == {"service": "ssh", "version": "OpenSSH_8.9p1 Ubuntu-3"}
+    assert match_banner(b"HTTP/1.1 200 OK\r\nDate: now\r\nServer: nginx/1.18.0\r\n\r\n") == {"service": "http", "version": "nginx/1.18.0"}
+    assert match_banner(b"HTTP/1.0 404 Not Found\r\n\r\n") == {"service": "http", "version": None}
+    assert match_banner(b"220 mail.example.com ESMTP Postfix\r\n") == {"service": "smtp", "version": "Postfix"}
+    assert match_banner(b"220 (vsFTPd 3.0.3)\r\n") == {"service": "ftp", "version": "vsFTPd 3.0.3"}
+    assert match_banner(b"J\x00\x00\x00\n8.0.33\x00salt") == {"service": "mysql", "version": "8.0.33"}
+    assert match_banner(b"no known protocol") is None
+
+
+async def _serve(handler):
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_detect_banner_service():
+    async def handler(reader, writer):
+        writer.write(b"SSH-2.0-OpenSSH_9.3\r\n")
+        await writer.drain()
+        writer.close()
+
+    server, port = await _serve(handler)
+    try:
+        detected = await ServiceDetector(0.5).detect("127.0.0.1", port)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert detected == {"service": "ssh", "version": "OpenSSH_9.3", "banner": "SSH-2.0-OpenSSH_9.3"}
+
+
+@pytest.mark.asyncio
+async def test_detect_with_http_probe():
+    async def handler(reader, writer):
+        request = await reader.read(1024)
+        if request.startswith(b"HEAD "):
+            writer.write(b"HTTP/1.1 200 OK\r\nServer: Apache/2.4.57\r\n\r\n")
+            await writer.drain()
+        writer.close()
+
+    server, port = await _serve(handler)
+    try:
+        detected = await ServiceDetector(0.2).detect("127.0.0.1", port)
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    assert detected["service"] == "http"
+    assert detected["version"] == "Apache/2.4.57"
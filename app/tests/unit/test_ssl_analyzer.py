@@ -0,0 +1,239 @@
+import asyncio
+import ssl
+import time
+import warnings
+
+import pytest
+
+from app.services.certificate_cache import CertificateCache
+from app.services.tools.network import ssl_analyzer, tls
+from app.services.tools.network.ssl_analyzer import SSLAnalyzerRunner
+from app.services.tools.network.tls import (
+    certificate_status,
+    cipher_groups,
+    parse_certificate,
+    pinned_context,
+    presented_chain,
+)
+from app.tests.unit.tls_server import make_certificate, server_context, start_tls_server, write_chain
+
+from cryptography.hazmat.primitives import hashes, serialization
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    cache = CertificateCache(persist=False)
+    monkeypatch.setattr(ssl_analyzer, "certificate_cache", cache)
+    return cache
+
+
+@pytest.fixture(scope="module")
+def chain(tmp_path_factory):
+    root = make_certificate("Test Root CA", ca=True, days=365)
+    leaf = make_certificate("localhost", san=["localhost", "127.0.0.1"], issuer=root, key_type='ec', days=10)
+    certfile, keyfile = write_chain(tmp_path_factory.mktemp("tls"), "leaf", [leaf[0], root[0]], leaf[1])
+    return root[0], leaf[0], certfile, keyfile
+
+
+def test_parse_certificate(chain):
+    root, leaf, _, _ = chain
+    details = parse_certificate(leaf.public_bytes(serialization.Encoding.DER))
+
+    assert details['subject'] == {'commonName': 'localhost'}
+    assert details['issuer'] == {'commonName': 'Test Root CA'}
+    assert details['version'] == 3
+    assert details['san'] == [['DNS', 'localhost'], ['IP Address', '127.0.0.1']]
+    assert details['key_type'] == 'EC secp256r1'
+    assert details['key_bits'] == 256
+    assert details['signature_algorithm'] == 'sha256WithRSAEncryption'
+    assert details['self_signed'] is False
+    assert len(details['fingerprint_sha256']) == 64
+
+    status = certificate_status(details)
+    assert status['expired'] is False
+    assert status['days_until_expiry'] in (9, 10)
+
+    root_details = parse_certificate(root.public_bytes(serialization.Encoding.DER))
+    assert root_details['self_signed'] is True
+    assert root_details['key_type'] == 'RSA'
+    assert root_details['key_bits'] == 2048
+
+
+@pytest.mark.asyncio
+async def test_analyze_untrusted_chain(chain, cache):
+    root, leaf, certfile, keyfile = chain
+    server, port = await start_tls_server(server_context(certfile, keyfile))
+    try:
+        runner = SSLAnalyzerRunner("test-id")
+        result = await runner.execute({"hostname": "localhost", "port": port, "include_certificates": True})
+        again = await runner.execute({"hostname": "localhost", "port": port})
+        summary = await runner.execute({"hostname": "localhost", "port": port, "include_certificates": False})
+    finally:
+        server.close()
+
+    assert result['ip'] == '127.0.0.1'
+    assert result['version'] == 'TLSv1.3'
+    assert result['cipher'][1] == 'TLSv1.3'
+    assert result['verified'] is False
+    assert 'self-signed' in result['verification_error'] or 'issuer' in result['verification_error']
+    leaf_fingerprint = leaf.fingerprint(hashes.SHA256()).hex()
+    root_fingerprint = root.fingerprint(hashes.SHA256()).hex()
+    assert result['certificate'] == {
+        'fingerprint_sha256': leaf_fingerprint,
+        'subject': 'localhost',
+        'issuer': 'Test Root CA',
+        'san': ['localhost', '127.0.0.1'],
+        'expired': False,
+        'not_yet_valid': False,
+        'days_until_expiry': result['certificate']['days_until_expiry'],
+    }
+    assert result['certificate_details'][leaf_fingerprint]['subject'] == {'commonName': 'localhost'}
+    assert [entry['fingerprint_sha256'] for entry in result['chain']] == [root_fingerprint]
+    assert list(result['certificate_details']) == [leaf_fingerprint, root_fingerprint]
+    assert result['certificate_details'][root_fingerprint]['self_signed'] is True
+
+    assert again['certificate'] == result['certificate']
+    assert again['certificate_details'] == result['certificate_details']
+    assert summary['chain'] == result['chain']
+    assert 'certificate_details' not in summary
+    assert cache.stats()['hits'] == 4
+    assert cache.stats()['misses'] == 2
+
+
+class FakeCertificate:
+    def __init__(self, certificate):
+        self.certificate = certificate
+
+    def public_bytes(self):
+        return self.certificate.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class FakeSSLObject:
+    def __init__(self, leaf, chain=None, native_chain=None):
+        self.leaf = leaf
+        if chain is not None:
+            self.get_unverified_chain = lambda: chain
+        if native_chain is not None:
+            self._sslobj = type('SSLObj', (), {'get_unverified_chain': lambda _: native_chain})()
+
+    def getpeercert(self, binary_form=False):
+        return self.leaf
+
+
+def test_presented_chain(chain, monkeypatch):
+    root, leaf = (certificate.public_bytes(serialization.Encoding.DER) for certificate in chain[:2])
+
+    monkeypatch.setattr(tls, "PUBLIC_UNVERIFIED_CHAIN", True)
+    assert presented_chain(FakeSSLObject(leaf, [leaf, root])) == [leaf, root]
+    assert presented_chain(FakeSSLObject(leaf, [])) == [leaf]
+
+    monkeypatch.setattr(tls, "PUBLIC_UNVERIFIED_CHAIN", False)
+    assert presented_chain(FakeSSLObject(leaf, native_chain=[FakeCertificate(chain[1]), FakeCertificate(chain[0])])) == [leaf, root]
+    assert presented_chain(FakeSSLObject(leaf, native_chain=[])) == [leaf]
+    assert presented_chain(FakeSSLObject(leaf)) == [leaf]
+    assert presented_chain(FakeSSLObject(None)) == []
+
+
+@pytest.mark.asyncio
+async def test_handshake_timeout_does_not_block_loop():
+    async def silent(reader, writer):
+        await reader.read()
+        writer.close()
+
+    server = await asyncio.start_server(silent, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.ensure_future(ticker())
+    start = time.monotonic()
+    try:
+        runner = SSLAnalyzerRunner("test-id")
+        with pytest.raises(ValueError, match="handshake"):
+            await runner.execute({"hostname": "127.0.0.1", "port": port, "handshake_timeout": 0.5})
+    finally:
+        ticking.cancel()
+        server.close()
+
+    assert 0.4 < time.monotonic() - start < 3
+    assert ticks >= 20
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters():
+    runner = SSLAnalyzerRunner("test-id")
+    validated = runner.validate_parameters({"hostname": "example.com"})
+    assert validated['port'] == 443
+    assert validated['connect_timeout'] == SSLAnalyzerRunner.DEFAULT_CONNECT_TIMEOUT
+
+    assert validated['enumerate_ciphers'] is False
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"hostname": "example.com", "handshake_timeout": 0})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"hostname": "example.com", "max_connections": 0})
+
+
+def test_pinned_contexts_are_reused():
+    context = pinned_context('TLSv1.2')
+    assert pinned_context('TLSv1.2') is context
+    assert context.minimum_version == context.maximum_version == ssl.TLSVersion.TLSv1_2
+    assert pinned_context('TLSv1.2', ('AES128-SHA',)) is not context
+
+    groups = dict(cipher_groups('TLSv1.2'))
+    assert 'ECDHE-ECDSA-AES128-GCM-SHA256' in groups['ecdhe-ecdsa']
+    assert 'AES128-SHA' in groups['rsa-rsa']
+    assert all('GCM' not in name for _, names in cipher_groups('TLSv1') for name in names)
+    assert cipher_groups('TLSv1.3') == []
+
+
+@pytest.mark.asyncio
+async def test_enumerate_server_preference(chain):
+    _, _, certfile, keyfile = chain
+    preferred = ['ECDHE-ECDSA-AES256-GCM-SHA384', 'ECDHE-ECDSA-AES128-SHA', 'ECDHE-ECDSA-CHACHA20-POLY1305']
+    context = server_context(certfile, keyfile, maximum_version=ssl.TLSVersion.TLSv1_2, ciphers=':'.join(preferred))
+    server, port = await start_tls_server(context)
+    try:
+        runner = SSLAnalyzerRunner("test-id")
+        result = await runner.execute({"hostname": "localhost", "port": port, "enumerate_ciphers": True, "max_connections": 4})
+    finally:
+        server.close()
+
+    assert result['version'] == 'TLSv1.2'
+    protocols = result['protocols']
+    assert list(protocols) == ['TLSv1', 'TLSv1.1', 'TLSv1.2', 'TLSv1.3']
+    assert protocols['TLSv1.2'] == {'supported': True, 'ciphers': preferred, 'server_preference': True}
+    assert protocols['TLSv1.3'] == {'supported': False}
+    assert protocols['TLSv1'] == {'supported': False}
+    assert result['enumeration']['handshakes'] < 40
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not (ssl.HAS_TLSv1 and ssl.HAS_TLSv1_1), reason="OpenSSL built without TLS 1.0/1.1")
+async def test_enumerate_client_preference_and_tls13(chain):
+    _, _, certfile, keyfile = chain
+    accepted = ['ECDHE-ECDSA-AES128-SHA', 'ECDHE-ECDSA-AES256-SHA']
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', DeprecationWarning)
+        context = server_context(certfile, keyfile, minimum_version=ssl.TLSVersion.TLSv1, ciphers=':'.join(accepted) + ':@SECLEVEL=0')
+    context.options &= ~ssl.OP_CIPHER_SERVER_PREFERENCE
+    server, port = await start_tls_server(context)
+    try:
+        runner = SSLAnalyzerRunner("test-id")
+        result = await runner.execute({"hostname": "localhost", "port": port, "enumerate_ciphers": True})
+    finally:
+        server.close()
+
+    protocols = result['protocols']
+    assert protocols['TLSv1.3']['supported'] is True
+    assert protocols['TLSv1.3']['ciphers'][0].startswith('TLS_')
+    for version in ('TLSv1', 'TLSv1.1', 'TLSv1.2'):
+        assert protocols[version]['supported'] is True
+        assert sorted(protocols[version]['ciphers']) == sorted(accepted)
+        assert protocols[version]['server_preference'] is False
@@ -0,0 +1,126 @@
+import pytest
+
+import dns.asyncresolver
+
+from app.services.tools.network.subdomain_enum import COMMON_SUBDOMAINS, SubdomainEnumRunner
+from app.tests.unit.dns_server import start_stub_dns_server
+
+
+def _use_stub_server(runner, server):
+    def make_resolver():
+        resolver = dns.asyncresolver.Resolver(configure=False)
+        resolver.nameservers = ['127.0.0.1']
+        resolver.port = server.port
+        return resolver
+    runner._make_resolver = make_resolver
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters():
+    runner = SubdomainEnumRunner("test-id")
+    validated = runner.validate_parameters({"domain": "Example.com", "words": "www, api\nmail"})
+
+    assert validated["domain"] == "example.com"
+    assert validated["words"] == ["www", "api", "mail"]
+    assert validated["record_types"] == ["A"]
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"domain": "example.com", "record_types": ["MX"]})
+
+
+@pytest.mark.asyncio
+async def test_candidates_are_deduplicated_and_validated():
+    runner = SubdomainEnumRunner("test-id")
+    validated = runner.validate_parameters({
+        "domain": "example.com",
+        "words": ["www", "WWW", "api.example.com", "dev.api", "bad label", "-bad", "x" * 64]
+    })
+
+    assert list(runner._candidates(validated)) == ["www.example.com", "api.example.com", "dev.api.example.com"]
+
+
+@pytest.mark.asyncio
+async def test_default_wordlist():
+    runner = SubdomainEnumRunner("test-id")
+    validated = runner.validate_parameters({"domain": "example.com"})
+
+    assert len(list(runner._candidates(validated))) == len(COMMON_SUBDOMAINS)
+
+
+@pytest.mark.asyncio
+async def test_execute_finds_subdomains():
+    server = await start_stub_dns_server(
+        {
+            ('www.example.com', 'A'): ['192.0.2.1'],
+            ('api.example.com', 'A'): ['192.0.2.2'],
+        },
+        nxdomain_by_default=True
+    )
+    updates = []
+
+    async def callback(execution_id, progress, message, partial_result):
+        updates.append(partial_result or {})
+
+    runner = SubdomainEnumRunner("test-id", callback)
+    _use_stub_server(runner, server)
+    try:
+        result = await runner.execute({"domain": "example.com", "words": ["www", "api", "nope", "missing"]})
+        await runner.flush_progress()
+    finally:
+        server.close()
+
+    assert result["wildcard"]["detected"] is False
+    assert result["candidates_tested"] == 4
+    assert result["subdomains"] == [
+        {"subdomain": "api.example.com", "records": {"A": ["192.0.2.2"]}},
+        {"subdomain": "www.example.com", "records": {"A": ["192.0.2.1"]}},
+    ]
+    streamed = [entry["subdomain"] for update in updates for entry in update.get("subdomains", [])]
+    assert sorted(streamed) == ["api.example.com", "www.example.com"]
+
+
+@pytest.mark.asyncio
+async def test_execute_filters_wildcard_answers():
+    server = await start_stub_dns_server(
+        {('www.example.com', 'A'): ['192.0.2.1']},
+        wildcard={'A': ['203.0.113.9']}
+    )
+    runner = SubdomainEnumRunner("test-id")
+    _use_stub_server(runner, server)
+    try:
+        result = await runner.execute({"domain": "example.com", "words": ["www", "anything", "else"]})
+    finally:
+        server.close()
+
+    assert result["wildcard"]["detected"] is True
+    assert result["wildcard"]["answers"] == {"A": ["203.0.113.9"]}
+    assert result["wildcard"]["filtered"] == 2
+    assert [entry["subdomain"] for entry in result["subdomains"]] == ["www.example.com"]
+
+
+@pytest.mark.asyncio
+async def test_execute_skips_other_types_after_nxdomain():
+    server = await start_stub_dns_server(
+        {('www.example.com', 'A'): ['192.0.2.1'], ('www.example.com', 'AAAA'): ['2001:db8::1']},
+        nxdomain_by_default=True
+    )
+    runner = SubdomainEnumRunner("test-id")
+    _use_stub_server(runner, server)
+    try:
+        result = await runner.execute({
+            "domain": "example.com",
+            "words": ["www", "nope"],
+            "record_types": ["A", "AAAA"],
+            "detect_wildcard": False
+        })
+    finally:
+        server.close()
+
+    assert result["subdomains"] == [
+        {"subdomain": "www.example.com", "records": {"A": ["192.0.2.1"], "AAAA": ["2001:db8::1"]}}
+    ]
+    assert ("nope.example.com", "AAAA") not in server.queries
+    assert result["queries"] == 3
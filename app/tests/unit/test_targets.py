@@ -0,0 +1,58 @@
+import pytest
+from app.services.tools.base import BaseToolRunner
+from app.services.tools.network.targets import parse_targets, split_target_spec
+
+
+class MockRunner(BaseToolRunner):
+    async def execute(self, parameters):
+        return {}
+
+    def validate_parameters(self, parameters):
+        return parameters
+
+
+@pytest.mark.asyncio
+async def test_split_target_spec():
+    assert split_target_spec("10.0.0.0/30, example.com") == ["10.0.0.0/30", "example.com"]
+    assert split_target_spec(["a.com", "b.com,c.com"]) == ["a.com", "b.com", "c.com"]
+
+
+@pytest.mark.asyncio
+async def test_parse_targets_cidr_and_ranges():
+    runner = MockRunner("test-id")
+
+    targets = parse_targets("10.0.0.0/30,10.1.0.5-10.1.0.7,10.2.0.1-3", runner.sanitize_hostname, 1024)
+
+    assert len(targets) == 8
+    assert list(targets) == [
+        "10.0.0.1", "10.0.0.2",
+        "10.1.0.5", "10.1.0.6", "10.1.0.7",
+        "10.2.0.1", "10.2.0.2", "10.2.0.3",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_parse_targets_large_block_is_lazy():
+    runner = MockRunner("test-id")
+
+    targets = parse_targets("10.0.0.0/16", runner.sanitize_hostname, 65536)
+
+    assert len(targets) == 65534
+    assert targets.ranges == [(0x0A000001, 0x0A00FFFE)]
+
+
+@pytest.mark.asyncio
+async def test_parse_targets_rejects_invalid_entries():
+    runner = MockRunner("test-id")
+
+    with pytest.raises(ValueError):
+        parse_targets("10.0.0.0/8", runner.sanitize_hostname, 65536)
+
+    with pytest.raises(ValueError):
+        parse_targets("10.0.0.9-10.0.0.1", runner.sanitize_hostname, 65536)
+
+    with pytest.raises(ValueError):
+        parse_targets("192.168.1.256", runner.sanitize_hostname, 65536)
+
+    with pytest.raises(ValueError):
+        parse_targets("example.com; whoami", runner.sanitize_hostname, 65536)
@@ -0,0 +1,191 @@
+import socket
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models import Certificate
+from app.services.certificate_cache import CertificateCache
+from app.services.tools.network import tls_inventory
+from app.services.tools.network.tls_inventory import TLSInventoryRunner
+from app.tests.unit.tls_server import make_certificate, server_context, start_tls_server, write_chain
+
+from cryptography.hazmat.primitives import hashes
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    cache = CertificateCache(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    monkeypatch.setattr(tls_inventory, "certificate_cache", cache)
+    yield cache
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="module")
+def certificates(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("inventory")
+    root = make_certificate("Inventory Root CA", ca=True, days=365)
+    soon = make_certificate("soon.test", san=["soon.test"], issuer=root, key_type='ec', days=5)
+    later = make_certificate("later.test", san=["later.test", "www.later.test"], days=200)
+    return {
+        'soon': (soon[0], write_chain(directory, "soon", [soon[0], root[0]], soon[1])),
+        'later': (later[0], write_chain(directory, "later", [later[0]], later[1])),
+    }
+
+
+def _closed_port() -> int:
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+@pytest.mark.asyncio
+async def test_validate_parameters():
+    runner = TLSInventoryRunner("test-id")
+
+    validated = runner.validate_parameters({"targets": "example.com:8443, example.com, 192.0.2.0/30", "ports": "443,993"})
+    assert validated['endpoints'] == [('example.com', 8443)]
+    assert validated['ports'] == [443, 993]
+    assert validated['total'] == 1 + 3 * 2
+    assert list(runner._iter_endpoints(validated))[:3] == [('example.com', 8443), ('example.com', 443), ('example.com', 993)]
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": []})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "example.com:70000"})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "10.0.0.0/8"})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "example.com", "sort": "subject"})
+
+    with pytest.raises(ValueError):
+        runner.validate_parameters({"targets": "example.com", "concurrency": 0})
+
+
+@pytest.mark.asyncio
+async def test_inventory_sorted_by_expiry(certificates):
+    soon_certificate, soon_files = certificates['soon']
+    later_certificate, later_files = certificates['later']
+    soon_server, soon_port = await start_tls_server(server_context(*soon_files))
+    later_server, later_port = await start_tls_server(server_context(*later_files))
+    plain_server, plain_port = await start_tls_server(None)
+    closed_port = _closed_port()
+    updates = []
+
+    async def callback(execution_id, progress, message, partial_result):
+        updates.append(partial_result)
+
+    runner = TLSInventoryRunner("test-id", callback)
+    try:
+        result = await runner.execute({
+            "targets": [
+                f"127.0.0.1:{later_port}",
+                f"localhost:{soon_port}",
+                f"127.0.0.1:{closed_port}",
+                f"127.0.0.1:{plain_port}",
+            ],
+            "connect_timeout": 1,
+            "handshake_timeout": 1,
+            "include_certificates": True
+        })
+    finally:
+        for server in (soon_server, later_server, plain_server):
+            server.close()
+
+    assert result['endpoints_scanned'] == 4
+    assert result['certificates_found'] == 2
+    assert result['expired'] == 0
+    assert [row['endpoint'] for row in result['certificates']] == [f"localhost:{soon_port}", f"127.0.0.1:{later_port}"]
+
+    soon, later = result['certificates']
+    assert soon['subject'] == 'soon.test'
+    assert soon['san'] == ['soon.test']
+    assert soon['issuer'] == 'Inventory Root CA'
+    assert soon['key_type'] == 'EC secp256r1'
+    assert soon['days_until_expiry'] in (4, 5)
+    assert soon['ip'] == '127.0.0.1'
+    assert soon['fingerprint_sha256'] == soon_certificate.fingerprint(hashes.SHA256()).hex()
+    assert later['issuer'] == 'later.test'
+    assert later['san'] == ['later.test', 'www.later.test']
+    assert later['key_type'] == 'RSA'
+    details = result['certificate_details']
+    assert list(details) == [soon['fingerprint_sha256'], later['fingerprint_sha256']]
+    assert details[soon['fingerprint_sha256']]['san'] == [['DNS', 'soon.test']]
+    assert details[later['fingerprint_sha256']]['san'] == [['DNS', 'later.test'], ['DNS', 'www.later.test']]
+    assert details[later['fingerprint_sha256']]['key_bits'] == 2048
+    assert later['fingerprint_sha256'] == later_certificate.fingerprint(hashes.SHA256()).hex()
+
+    assert result['error_counts'] == {'refused': 1, 'tls_error': 1}
+    assert list(result['errors']) == [f"127.0.0.1:{plain_port}"]
+    assert result['handshakes_per_second'] > 0
+
+    await runner.flush_progress()
+    streamed = [row['endpoint'] for update in updates if update for row in update.get('certificates', [])]
+    assert sorted(streamed) == sorted(row['endpoint'] for row in result['certificates'])
+
+
+@pytest.mark.asyncio
+async def test_inventory_address_block_and_expiry_filter(certificates):
+    soon_server, soon_port = await start_tls_server(server_context(*certificates['soon'][1]))
+    later_server, later_port = await start_tls_server(server_context(*certificates['later'][1]))
+    runner = TLSInventoryRunner("test-id")
+    try:
+        result = await runner.execute({
+            "targets": "127.0.0.1/32",
+            "ports": [soon_port, later_port],
+            "expiring_within_days": 30,
+            "sort": "endpoint"
+        })
+    finally:
+        soon_server.close()
+        later_server.close()
+
+    assert result['ports'] == sorted([soon_port, later_port])
+    assert result['endpoints_scanned'] == 2
+    assert result['certificates_found'] == 2
+    assert [row['endpoint'] for row in result['certificates']] == [f"127.0.0.1:{soon_port}"]
+    assert result['certificates'][0]['subject'] == 'soon.test'
+
+
+@pytest.mark.asyncio
+async def test_inventory_deduplicates_certificates(certificates, cache):
+    soon_server, soon_port = await start_tls_server(server_context(*certificates['soon'][1]))
+    other_server, other_port = await start_tls_server(server_context(*certificates['soon'][1]))
+    runner = TLSInventoryRunner("test-id")
+    try:
+        result = await runner.execute({
+            "targets": [f"127.0.0.1:{soon_port}", f"localhost:{soon_port}", f"127.0.0.1:{other_port}"],
+            "include_certificates": True
+        })
+        summary = await runner.execute({"targets": f"127.0.0.1:{soon_port}"})
+        cache.persist = False
+        unpersisted = await runner.execute({"targets": f"127.0.0.1:{soon_port}"})
+        cache.persist = True
+    finally:
+        soon_server.close()
+        other_server.close()
+
+    fingerprint = certificates['soon'][0].fingerprint(hashes.SHA256()).hex()
+    assert result['certificates_found'] == 3
+    assert result['unique_certificates'] == 1
+    assert {row['fingerprint_sha256'] for row in result['certificates']} == {fingerprint}
+    assert list(result['certificate_details']) == [fingerprint]
+    assert 'certificate_details' not in summary
+    assert summary['certificates'][0]['san'] == ['soon.test']
+    assert list(unpersisted['certificate_details']) == [fingerprint]
+
+    stats = cache.stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 4
+    assert stats['stored'] == 1
+    with cache.session_factory() as db:
+        assert [record.subject for record in db.query(Certificate)] == ['soon.test']
@@ -0,0 +1,240 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.tools.network import whois_client, whois_lookup
+from app.services.tools.network.whois_lookup import WhoisLookupRunner
+from app.services.tools.network.whois_client import (
+    IANA_SERVER,
+    WhoisClient,
+    WhoisNotFoundError,
+    find_referral,
+    parse_whois,
+    server_for,
+)
+
+
+REGISTRY_RESPONSE = """\
+   Domain Name: EXAMPLE.TEST
+   Registry Domain ID: 2336799_DOMAIN_TEST-VRSN
+   Registrar WHOIS Server: registrar.whois.test
+   Updated Date: 2024-08-14T07:01:34Z
+   Creation Date: 1995-08-14T04:00:00Z
+   Registry Expiry Date: 2025-08-13T04:00:00Z
+   Registrar: RESERVED-Internet Assigned Numbers Authority
+   Domain Status: clientDeleteProhibited https://icann.org/epp#clientDeleteProhibited
+   Domain Status: clientTransferProhibited https://icann.org/epp#clientTransferProhibited
+   Name Server: A.IANA-SERVERS.NET
+   Name Server: B.IANA-SERVERS.NET
+   DNSSEC: signedDelegation
+"""
+
+REGISTRAR_RESPONSE = """\
+Domain Name: example.test
+Registrar: Example Registrar, Inc.
+Registrar Registration Expiration Date: 2025-08-13T04:00:00Z
+Registrant Organization: Example Org
+Registrant Country: US
+Registrar Abuse Contact Email: abuse@registrar.test
+"""
+
+
+async def start_fake_whois_server(responses, delay=0.0):
+    queries = []
+
+    async def handle(reader, writer):
+        query = (await reader.readline()).decode().strip()
+        queries.append(query)
+        await asyncio.sleep(delay)
+        writer.write(responses.get(query, "No match for \"%s\".\r\n" % query).encode())
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    server.queries = queries
+    server.port = server.sockets[0].getsockname()[1]
+    return server
+
+
+def test_server_for_uses_longest_suffix():
+    assert server_for("example.com") == "whois.verisign-grs.com"
+    assert server_for("www.example.co.uk") == "whois.nic.uk"
+    assert server_for("example.unknown-tld") == IANA_SERVER
+    assert server_for("example.test", {"test": "127.0.0.1"}) == "127.0.0.1"
+
+
+def test_find_referral():
+    assert find_referral("refer:        whois.nic.xyz\n", IANA_SERVER) == "whois.nic.xyz"
+    assert find_referral(REGISTRY_RESPONSE, "whois.verisign-grs.com") == "registrar.whois.test"
+    assert find_referral("ReferralServer:  rwhois://rwhois.example.net:4321\n", "whois.arin.net") == "rwhois.example.net"
+    assert find_referral(REGISTRY_RESPONSE, "registrar.whois.test") is None
+
+
+def test_parse_whois():
+    parsed = parse_whois(REGISTRY_RESPONSE)
+
+    assert parsed["registrar"] == "RESERVED-Internet Assigned Numbers Authority"
+    assert parsed["creation_date"] == "1995-08-14T04:00:00+00:00"
+    assert parsed["expiration_date"] == "2025-08-13T04:00:00+00:00"
+    assert parsed["status"] == ["clientDeleteProhibited", "clientTransferProhibited"]
+    assert parsed["name_servers"] == ["a.iana-servers.net", "b.iana-servers.net"]
+    assert parsed["dnssec"] == "signedDelegation"
+    assert parsed["emails"] is None
+
+
+@pytest.mark.asyncio
+async def test_lookup_follows_registrar_referral(monkeypatch):
+    registry = await start_fake_whois_server({"example.test": REGISTRY_RESPONSE})
+    registrar = await start_fake_whois_server({"example.test": REGISTRAR_RESPONSE})
+    client = WhoisClient(
+        timeout=2,
+        rate=100,
+        servers={"test": "127.0.0.1"},
+        ports={"127.0.0.1": registry.port, "registrar.whois.test": registrar.port}
+    )
+
+    async def resolve(hostname):
+        return ["127.0.0.1"]
+
+    monkeypatch.setattr(whois_client, "resolve_host", resolve)
+    try:
+        result = await client.lookup("example.test")
+    finally:
+        registry.close()
+        registrar.close()
+
+    assert result["whois_servers"] == ["127.0.0.1", "registrar.whois.test"]
+    assert result["registrar"] == "Example Registrar, Inc."
+    assert result["org"] == "Example Org"
+    assert result["country"] == "US"
+    assert result["name_servers"] == ["a.iana-servers.net", "b.iana-servers.net"]
+    assert result["emails"] == ["abuse@registrar.test"]
+    assert "referral_error" not in result
+    assert registry.queries == registrar.queries == ["example.test"]
+
+
+IANA_RESPONSE = """\
+domain:       TEST
+
+organisation: Test Registry Services
+address:      1 Registry Way
+country:      GB
+
+refer:        whois.registry.test
+
+created:      1985-01-01
+changed:      2023-12-01
+source:       IANA
+"""
+
+
+@pytest.mark.asyncio
+async def test_iana_hop_only_supplies_the_referral(monkeypatch):
+    iana = await start_fake_whois_server({"example.test": IANA_RESPONSE})
+    registry = await start_fake_whois_server({"example.test": REGISTRY_RESPONSE.replace("registrar.whois.test", "whois.registry.test")})
+    client = WhoisClient(timeout=2, rate=100, servers={}, ports={IANA_SERVER: iana.port, "whois.registry.test": registry.port})
+
+    async def resolve(hostname):
+        return ["127.0.0.1"]
+
+    monkeypatch.setattr(whois_client, "resolve_host", resolve)
+    try:
+        result = await client.lookup("example.test")
+        with pytest.raises(WhoisNotFoundError):
+            await WhoisClient(timeout=2, rate=100, servers={}, ports={IANA_SERVER: registry.port}).lookup("missing.test")
+    finally:
+        iana.close()
+        registry.close()
+
+    assert result["whois_servers"] == [IANA_SERVER, "whois.registry.test"]
+    assert result["registrar"] == "RESERVED-Internet Assigned Numbers Authority"
+    assert result["creation_date"] == "1995-08-14T04:00:00+00:00"
+    assert result["updated_date"] == "2024-08-14T07:01:34+00:00"
+    assert result["org"] is None
+    assert result["country"] is None
+
+
+@pytest.mark.asyncio
+async def test_failed_referral_keeps_registry_data():
+    registry = await start_fake_whois_server({"example.test": REGISTRY_RESPONSE})
+    client = WhoisClient(timeout=2, rate=100, servers={"test": "127.0.0.1"}, ports={"127.0.0.1": registry.port})
+    try:
+        result = await client.lookup("example.test")
+    finally:
+        registry.close()
+
+    assert result["registrar"] == "RESERVED-Internet Assigned Numbers Authority"
+    assert result["whois_servers"] == ["127.0.0.1"]
+    assert result["referral_error"].startswith("registrar.whois.test")
+
+
+@pytest.mark.asyncio
+async def test_unregistered_domain_raises():
+    registry = await start_fake_whois_server({})
+    client = WhoisClient(timeout=2, rate=100, servers={"test": "127.0.0.1"}, ports={"127.0.0.1": registry.port})
+    try:
+        with pytest.raises(WhoisNotFoundError):
+            await client.lookup("missing.test")
+    finally:
+        registry.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_server_times_out():
+    registry = await start_fake_whois_server({"example.test": REGISTRY_RESPONSE}, delay=1.0)
+    client = WhoisClient(timeout=0.2, rate=100, servers={"test": "127.0.0.1"}, ports={"127.0.0.1": registry.port})
+    try:
+        with pytest.raises(asyncio.TimeoutError):
+            await client.lookup("example.test")
+    finally:
+        registry.close()
+
+
+@pytest.mark.asyncio
+async def test_queries_are_rate_limited_per_server():
+    responses = {f"d{i}.test": REGISTRY_RESPONSE.replace("registrar.whois.test", "127.0.0.1") for i in range(6)}
+    registry = await start_fake_whois_server(responses)
+    client = WhoisClient(timeout=5, rate=10, burst=1, servers={"test": "127.0.0.1"}, ports={"127.0.0.1": registry.port})
+    start = time.monotonic()
+    try:
+        await asyncio.gather(*(client.lookup(domain) for domain in responses))
+    finally:
+        registry.close()
+
+    assert time.monotonic() - start >= 0.45
+    assert len(registry.queries) == 6
+
+
+@pytest.mark.asyncio
+async def test_runner_bulk_mode(monkeypatch, tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.db.base import Base
+    from app.services.whois_cache import WhoisCache
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'whois.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    registry = await start_fake_whois_server({
+        f"{name}.test": REGISTRY_RESPONSE.replace("registrar.whois.test", "127.0.0.1")
+        for name in ("alpha", "beta", "gamma")
+    })
+    client = WhoisClient(timeout=2, rate=100, servers={"test": "127.0.0.1"}, ports={"127.0.0.1": registry.port})
+    monkeypatch.setattr(whois_lookup, "whois_client", client)
+    monkeypatch.setattr(whois_lookup, "whois_cache", WhoisCache(sessionmaker(bind=engine), ttl=3600))
+    monkeypatch.setattr(whois_lookup.whois, "extract_domain", lambda domain: domain)
+
+    runner = WhoisLookupRunner("test-id")
+    try:
+        result = await runner.execute({"domains": "alpha.test, beta.test\ngamma.test, missing.test", "concurrency": 2})
+        again = await runner.execute({"domains": ["alpha.test"]})
+    finally:
+        registry.close()
+        engine.dispose()
+
+    assert result["looked_up"] == 3
+    assert result["failed"] == 1
+    assert "No WHOIS record" in result["errors"]["missing.test"]
+    assert result["results"]["beta.test"]["dnssec"] == "signedDelegation"
+    assert again["cached"] == 1
+    assert len(registry.queries) == 4
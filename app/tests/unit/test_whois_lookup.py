@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.base import Base
+from app.services.tools.network import whois_lookup
+from app.services.tools.network.whois_lookup import WhoisLookupRunner
+from app.services.whois_cache import WhoisCache
+
+
+WHOIS_DATA = {"registrar": "Example Registrar", "creation_date": "1995-08-14T04:00:00", "emails": None}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'whois.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    cache = WhoisCache(sessionmaker(bind=engine), ttl=3600, timeout=1.0, max_workers=2)
+    monkeypatch.setattr(whois_lookup, "whois_cache", cache)
+    monkeypatch.setattr(settings, "WHOIS_BACKEND", "python-whois")
+    yield cache
+    cache.shutdown()
+    engine.dispose()
+
+
+def _fake_query(calls, delay=0.0):
+    def query(domain):
+        calls.append((domain, threading.current_thread().name))
+        time.sleep(delay)
+        return dict(WHOIS_DATA)
+    return query
+
+
+@pytest.mark.asyncio
+async def test_lookup_runs_off_the_event_loop(cache):
+    calls = []
+    runner = WhoisLookupRunner("test-id")
+    runner._query = _fake_query(calls, delay=0.2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.ensure_future(ticker())
+    try:
+        result = await runner.execute({"domain": "example.com"})
+    finally:
+        ticking.cancel()
+
+    assert result["registrar"] == "Example Registrar"
+    assert "cached_at" not in result
+    assert calls[0][1].startswith("whois")
+    assert ticks >= 10
+
+
+@pytest.mark.asyncio
+async def test_cached_result_is_keyed_by_registrable_domain(cache):
+    calls = []
+    runner = WhoisLookupRunner("test-id")
+    runner._query = _fake_query(calls)
+
+    first = await runner.execute({"domain": "example.co.uk"})
+    start = time.monotonic()
+    second = await runner.execute({"domain": "www.example.co.uk"})
+
+    assert time.monotonic() - start < 0.1
+    assert [domain for domain, _ in calls] == ["example.co.uk"]
+    assert "cached_at" not in first
+    assert second["cached_at"]
+    assert second["domain"] == "www.example.co.uk"
+    assert second["registrable_domain"] == "example.co.uk"
+    assert second["registrar"] == first["registrar"]
+    assert cache.stats()["hits"] == 1
+
+    await runner.execute({"domain": "example.co.uk", "use_cache": False})
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_are_coalesced(cache):
+    calls = []
+    runners = [WhoisLookupRunner(f"test-{i}") for i in range(5)]
+    for runner in runners:
+        runner._query = _fake_query(calls, delay=0.1)
+
+    results = await asyncio.gather(*(runner.execute({"domain": "example.org"}) for runner in runners))
+
+    assert len(calls) == 1
+    assert all(result["registrar"] == "Example Registrar" for result in results)
+    assert cache.stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_lookup_times_out(cache):
+    cache.timeout = 0.1
+    calls = []
+    runner = WhoisLookupRunner("test-id")
+    runner._query = _fake_query(calls, delay=0.5)
+
+    start = time.monotonic()
+    with pytest.raises(ValueError, match="timed out"):
+        await runner.execute({"domain": "slow.example"})
+
+    assert time.monotonic() - start < 0.4
+    assert cache.stats()["timeouts"] == 1
+    assert cache.stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_coroutine_fetch_times_out_for_coalesced_callers(cache):
+    cache.timeout = 0.1
+    calls = []
+
+    async def hang(domain):
+        calls.append(domain)
+        await asyncio.sleep(10)
+
+    start = time.monotonic()
+    results = await asyncio.gather(
+        *(cache.lookup("hung.example", hang) for _ in range(3)),
+        return_exceptions=True
+    )
+
+    assert time.monotonic() - start < 1
+    assert calls == ["hung.example"]
+    assert all(isinstance(result, asyncio.TimeoutError) for result in results)
+    assert cache.stats()["timeouts"] == 1
+    assert cache.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_refetched(cache):
+    cache.ttl = 0.05
+    calls = []
+    runner = WhoisLookupRunner("test-id")
+    runner._query = _fake_query(calls)
+
+    await runner.execute({"domain": "example.net"})
+    await asyncio.sleep(0.1)
+    result = await runner.execute({"domain": "example.net"})
+
+    assert len(calls) == 2
+    assert "cached_at" not in result
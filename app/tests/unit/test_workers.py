@@ -0,0 +1,102 @@
+import pytest
+import asyncio
+import os
+
+from app.services.execution_engine import ExecutionEngine
+from app.services.tools.base import BaseToolRunner
+from app.services.workers import WorkerPool
+
+
+class WorkerRunner(BaseToolRunner):
+    def validate_parameters(self, parameters):
+        if parameters.get('steps', 0) < 0:
+            raise ValueError("Steps must not be negative")
+        return parameters
+
+    async def execute(self, parameters):
+        validated = self.validate_parameters(parameters)
+        if validated.get('crash'):
+            os._exit(1)
+        completed = []
+        for step in range(validated.get('steps', 0)):
+            if self.stop_requested:
+                return {'pid': os.getpid(), 'steps': completed, 'partial': True}
+            completed.append(step)
+            await self.update_progress(step, f"Step {step}", {'steps': [step]})
+            await asyncio.sleep(validated.get('delay', 0))
+        return {'pid': os.getpid(), 'steps': completed}
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(2)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_remote_runner_returns_result_and_progress(pool):
+    updates = []
+
+    async def callback(execution_id, progress, message, partial_result):
+        updates.append((execution_id, partial_result))
+
+    runner = pool.runner(WorkerRunner, "test-id", callback)
+    result = await runner.execute({'steps': 3})
+    await runner.flush_progress()
+
+    assert result['steps'] == [0, 1, 2]
+    assert result['pid'] != os.getpid()
+    assert updates and all(execution_id == "test-id" for execution_id, _ in updates)
+    assert [step for _, delta in updates for step in (delta or {}).get('steps', [])] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_remote_runner_propagates_errors(pool):
+    runner = pool.runner(WorkerRunner, "test-id")
+    with pytest.raises(ValueError, match="negative"):
+        await runner.execute({'steps': -1})
+
+
+@pytest.mark.asyncio
+async def test_remote_runner_stop(pool):
+    runner = pool.runner(WorkerRunner, "test-id")
+    task = asyncio.create_task(runner.execute({'steps': 1000, 'delay': 0.01}))
+    await asyncio.sleep(0.5)
+    runner.request_stop("cancelled")
+    result = await asyncio.wait_for(task, timeout=5)
+
+    assert result['partial'] is True
+    assert 0 < len(result['steps']) < 1000
+    assert runner.stop_reason == "cancelled"
+    assert runner.partial_result()['steps'] == result['steps'][:len(runner.partial_result()['steps'])]
+
+
+@pytest.mark.asyncio
+async def test_remote_runner_worker_crash(pool):
+    runner = pool.runner(WorkerRunner, "test-id")
+    with pytest.raises(RuntimeError, match="exited"):
+        await asyncio.wait_for(runner.execute({'crash': True}), timeout=10)
+
+    runner = pool.runner(WorkerRunner, "test-id-2")
+    result = await runner.execute({'steps': 1})
+    assert result['steps'] == [0]
+
+
+@pytest.mark.asyncio
+async def test_runs_are_spread_across_workers(pool):
+    runners = [pool.runner(WorkerRunner, f"test-{index}") for index in range(2)]
+    results = await asyncio.gather(*(runner.execute({'steps': 20, 'delay': 0.02}) for runner in runners))
+
+    assert len({result['pid'] for result in results}) == 2
+
+
+def test_engine_uses_worker_pool_for_process_backend():
+    engine = ExecutionEngine()
+    engine.backend = "process"
+    engine.runners['WorkerRunner'] = WorkerRunner
+
+    runner = engine.create_runner('WorkerRunner', "test-id")
+    assert runner.runner_class is WorkerRunner
+    assert runner.priority_class == WorkerRunner.priority_class
+    engine.shutdown()
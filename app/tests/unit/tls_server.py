@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+import asyncio
+import ipaddress
+import ssl
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from cryptography.x509.oid import NameOID
+
+
+def make_certificate(
+    common_name: str,
+    san: Iterable[str] = (),
+    issuer: Optional[Tuple[x509.Certificate, object]] = None,
+    key_type: str = 'rsa',
+    days: int = 30,
+    ca: bool = False
+) -> Tuple[x509.Certificate, object]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048) if key_type == 'rsa' else ec.generate_private_key(ec.SECP256R1())
+    subject = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    issuer_certificate, issuer_key = issuer if issuer else (None, key)
+    now = datetime.utcnow()
+    builder = (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(issuer_certificate.subject if issuer_certificate else subject)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=days))
+        .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+    )
+    names: List[x509.GeneralName] = []
+    for name in san:
+        try:
+            names.append(x509.IPAddress(ipaddress.ip_address(name)))
+        except ValueError:
+            names.append(x509.DNSName(name))
+    if names:
+        builder = builder.add_extension(x509.SubjectAlternativeName(names), critical=False)
+    return builder.sign(issuer_key, hashes.SHA256()), key
+
+
+def write_chain(directory: Path, name: str, certificates: List[x509.Certificate], key) -> Tuple[str, str]:
+    certfile = directory / f"{name}.crt"
+    keyfile = directory / f"{name}.key"
+    certfile.write_bytes(b''.join(certificate.public_bytes(serialization.Encoding.PEM) for certificate in certificates))
+    keyfile.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ))
+    return str(certfile), str(keyfile)
+
+
+def server_context(
+    certfile: str,
+    keyfile: str,
+    minimum_version: Optional[ssl.TLSVersion] = None,
+    maximum_version: Optional[ssl.TLSVersion] = None,
+    ciphers: Optional[str] = None
+) -> ssl.SSLContext:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certfile, keyfile)
+    if ciphers:
+        context.set_ciphers(ciphers)
+    if minimum_version:
+        context.minimum_version = minimum_version
+    if maximum_version:
+        context.maximum_version = maximum_version
+    return context
+
+
+async def start_tls_server(context: Optional[ssl.SSLContext]) -> Tuple[asyncio.AbstractServer, int]:
+    async def handle(reader, writer):
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0, ssl=context)
+    return server, server.sockets[0].getsockname()[1]
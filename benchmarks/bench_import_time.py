@@ -0,0 +1,86 @@
+"""Measure the cold-start import cost of the API application.
+
+Each run imports the target module in a fresh interpreter, so nothing is
+shared between samples. Run from the repository root:
+
+    python benchmarks/bench_import_time.py --runs 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ('dns.resolver', 'whois', 'OpenSSL', 'cryptography')
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'modules': len(sys.modules),
+    'heavy': [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def sample(module: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def top_imports(module: str, limit: int) -> list:
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        check=True, capture_output=True, text=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--module', default='app.main')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='show the N slowest imports (0 to skip)')
+    parser.add_argument('--json', action='store_true', help='print a machine-readable summary')
+    args = parser.parse_args()
+
+    samples = [sample(args.module) for _ in range(args.runs)]
+    times = [entry['seconds'] * 1000 for entry in samples]
+    summary = {
+        'module': args.module,
+        'runs': args.runs,
+        'median_ms': round(statistics.median(times), 1),
+        'min_ms': round(min(times), 1),
+        'max_ms': round(max(times), 1),
+        'modules_loaded': samples[-1]['modules'],
+        'heavy_modules_loaded': samples[-1]['heavy'],
+    }
+
+    if args.json:
+        print(json.dumps(summary))
+        return
+
+    print(f"import {summary['module']}: median {summary['median_ms']} ms "
+          f"(min {summary['min_ms']}, max {summary['max_ms']}) over {args.runs} runs")
+    print(f"modules loaded: {summary['modules_loaded']}")
+    print(f"heavy modules loaded: {', '.join(summary['heavy_modules_loaded']) or 'none'}")
+    if args.top:
+        print("\nslowest imports (cumulative):")
+        for cumulative_us, name in top_imports(args.module, args.top):
+            print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+    main()